@@ -0,0 +1,27 @@
+"""Pet animation asset caching and playback."""
+from .frame_cache import AnimationFrames, FrameCache, decode_animation, decode_first_frame, get_frame_cache
+from .frame_store import FrameStore
+from .governor import FrameRateGovernor, get_frame_governor
+from .loader import BackgroundFrameLoader, get_frame_loader
+from .lod import LOD_LEVELS, select_lod, set_lod_enabled
+from .player import AnimationPlayer
+from .prefetch import AnimationPrefetcher, get_prefetcher
+
+__all__ = [
+    "AnimationFrames",
+    "FrameCache",
+    "decode_animation",
+    "decode_first_frame",
+    "get_frame_cache",
+    "FrameStore",
+    "FrameRateGovernor",
+    "get_frame_governor",
+    "BackgroundFrameLoader",
+    "get_frame_loader",
+    "LOD_LEVELS",
+    "select_lod",
+    "set_lod_enabled",
+    "AnimationPlayer",
+    "AnimationPrefetcher",
+    "get_prefetcher",
+]
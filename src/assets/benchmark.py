@@ -0,0 +1,281 @@
+"""Headless benchmark of the pet asset pipeline.
+
+Usage (from the repository root):
+
+    python -m src.assets.benchmark [--output bench.json] [--ratios 0.1,0.3,0.5]
+
+Runs under Qt's offscreen platform and, for every GIF referenced by
+`pets_info.json`, reports as JSON:
+
+- `qmovie`: time to first frame, full decode time and peak memory when the
+  GIF is played through QMovie at native size, as the app used to;
+- `sizes`: per common pet size, the same numbers for the frame-cache paths
+  (scaled GIF decode, compiled atlas when one fits, cache hit) plus the cost
+  of scaling a native frame down with QImage.scaled.
+
+Pet sizes follow PetWidget.resize_for_window for `--screen` and `--ratios`.
+Compare two runs with any JSON diff; timings are medians of `--repeat` runs.
+
+`peak_bytes` is the resident-memory growth during the first of those runs
+only: later runs reuse the pages the first one freed, so their growth is
+close to zero. All assets share one process, so even the first run can
+reuse memory an earlier measurement freed. Treat it as a lower bound for
+comparing runs of this tool, not as an absolute figure.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QT_VERSION_STR, QSize, Qt
+from PyQt5.QtGui import QGuiApplication, QImageReader, QMovie
+
+from src.assets.frame_cache import FrameCache, decode_atlas, decode_gif
+from src.pet_data_loader import PETS_INFO_PATH, get_registry
+
+BENCHMARK_VERSION = 2  # 2: peak_bytes from the first run only
+DEFAULT_SCREEN = 1080
+DEFAULT_RATIOS = (0.1, 0.3, 0.5)
+DEFAULT_REPEAT = 3
+
+
+def pet_size(screen, ratio):
+    """Label size PetWidget.resize_for_window picks for a square `screen`."""
+    width = max(40, int(screen * ratio))
+    return width, int(width * 2 / 3)
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class PeakMemory:
+    """Samples resident memory on a thread and records the peak above baseline.
+
+    Qt allocates decoded frames outside the Python heap, so tracemalloc would
+    miss them. Only Linux exposes RSS cheaply; elsewhere `peak_bytes` is None.
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak_bytes = None
+        self._baseline = None
+        self._peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._baseline = _rss_bytes()
+        if self._baseline is not None:
+            self._peak = self._baseline
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss = _rss_bytes()
+            if rss is not None and rss > self._peak:
+                self._peak = rss
+            self._stop.wait(self.interval)
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            rss = _rss_bytes()
+            self._peak = max(self._peak, rss or 0)
+            self.peak_bytes = self._peak - self._baseline
+        return False
+
+
+def _median_ms(samples):
+    return round(statistics.median(samples) * 1000.0, 3)
+
+
+def _measure(func, repeat):
+    """Run `func` `repeat` times; return (median ms, first run's peak bytes, last result)."""
+    timings = []
+    peak = None
+    result = None
+    for run in range(repeat):
+        result = None
+        if run == 0:
+            with PeakMemory() as memory:
+                start = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - start)
+            peak = memory.peak_bytes
+            continue
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return _median_ms(timings), peak, result
+
+
+def bench_qmovie(path, repeat):
+    """Time QMovie's first frame and a full pass over every frame."""
+    def first_frame():
+        movie = QMovie(path)
+        movie.jumpToFrame(0)
+        return movie.currentImage()
+
+    def all_frames():
+        movie = QMovie(path)
+        movie.setCacheMode(QMovie.CacheAll)
+        count = 0
+        while movie.jumpToFrame(count):
+            movie.currentImage()
+            count += 1
+        return count
+
+    first_ms, _, _ = _measure(first_frame, repeat)
+    decode_ms, peak, frames = _measure(all_frames, repeat)
+    return {
+        "first_frame_ms": first_ms,
+        "decode_ms": decode_ms,
+        "frames": frames,
+        "peak_bytes": peak,
+    }
+
+
+def bench_size(path, size, entry, repeat):
+    """Time the frame-cache paths for one asset at one pet size."""
+    result = {}
+
+    def first_frame():
+        reader = QImageReader(path)
+        reader.setScaledSize(QSize(*size))
+        return reader.read()
+
+    first_ms, _, _ = _measure(first_frame, repeat)
+    decode_ms, peak, frames = _measure(lambda: decode_gif(path, size), repeat)
+    result["gif"] = {
+        "first_frame_ms": first_ms,
+        "decode_ms": decode_ms,
+        "frames": len(frames) if frames else 0,
+        "decoded_bytes": frames.nbytes if frames else 0,
+        "peak_bytes": peak,
+    }
+
+    if entry is not None and size[0] <= entry["frame_size"][0] and size[1] <= entry["frame_size"][1]:
+        decode_ms, peak, frames = _measure(lambda: decode_atlas(entry, size), repeat)
+        result["atlas"] = {
+            "decode_ms": decode_ms,
+            "frames": len(frames) if frames else 0,
+            "decoded_bytes": frames.nbytes if frames else 0,
+            "peak_bytes": peak,
+        }
+
+    cache = FrameCache()
+    cache.get(path, size)
+    hit_ms, _, _ = _measure(lambda: cache.get(path, size), repeat)
+    result["cache_hit_ms"] = hit_ms
+
+    native = QImageReader(path).read()
+    if not native.isNull():
+        scale_ms, _, _ = _measure(
+            lambda: native.scaled(QSize(*size), Qt.IgnoreAspectRatio, Qt.SmoothTransformation),
+            repeat,
+        )
+        result["scale_native_frame_ms"] = scale_ms
+    return result
+
+
+def _git_commit(directory):
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=directory,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_benchmark(pets_info_path=PETS_INFO_PATH, sizes=None, repeat=DEFAULT_REPEAT):
+    """Benchmark every asset in pets_info.json and return the report dict."""
+    base_dir = os.path.dirname(os.path.abspath(pets_info_path))
+    sizes = sizes or [pet_size(DEFAULT_SCREEN, ratio) for ratio in DEFAULT_RATIOS]
+    with open(pets_info_path, "r") as file:
+        pets_info = json.load(file)
+
+    sources = []
+    for colors in pets_info.values():
+        for actions in colors.values():
+            for source in actions.values():
+                if isinstance(source, str) and source not in sources:
+                    sources.append(source)
+
+    registry = get_registry()
+    assets = {}
+    for source in sources:
+        path = os.path.join(base_dir, source)
+        if not os.path.exists(path):
+            print(f"[Benchmark] Missing source {source}, skipped", file=sys.stderr)
+            continue
+        native = QImageReader(path).size()
+        entry = registry.compiled_animation(path)
+        report = {
+            "file_bytes": os.path.getsize(path),
+            "native_size": [native.width(), native.height()],
+            "atlas": entry is not None,
+            "qmovie": bench_qmovie(path, repeat),
+            "sizes": {},
+        }
+        for size in sizes:
+            report["sizes"][f"{size[0]}x{size[1]}"] = bench_size(path, size, entry, repeat)
+        assets[source] = report
+        print(f"[Benchmark] {source}: QMovie {report['qmovie']['decode_ms']} ms", file=sys.stderr)
+
+    return {
+        "version": BENCHMARK_VERSION,
+        "commit": _git_commit(base_dir),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "sizes": [list(size) for size in sizes],
+        "assets": assets,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pet asset pipeline")
+    parser.add_argument("--pets-info", default=PETS_INFO_PATH, help="Path to pets_info.json")
+    parser.add_argument("--screen", type=int, default=DEFAULT_SCREEN,
+                        help="Screen height used to derive pet sizes")
+    parser.add_argument("--ratios", default=",".join(str(r) for r in DEFAULT_RATIOS),
+                        help="Comma-separated pet size ratios")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Runs per measurement (median is reported)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+    sizes = [pet_size(args.screen, float(ratio)) for ratio in args.ratios.split(",") if ratio]
+    report = run_benchmark(args.pets_info, sizes, max(1, args.repeat))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"[Benchmark] Wrote {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    del app
+
+
+if __name__ == "__main__":
+    main()
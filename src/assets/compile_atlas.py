@@ -0,0 +1,167 @@
+"""Build-time compiler that packs the pet GIFs into sprite atlases.
+
+Usage (from the repository root):
+
+    python -m src.assets.compile_atlas [--max-width 800] [--force]
+
+Every GIF referenced by `pets_info.json` is decoded once, downscaled so a
+frame is at most `--max-width` pixels wide, de-duplicated frame by frame
+and packed into a single PNG grid under `src/atlas/`. Frame timings and the
+grid layout go into `src/pets_atlas.json`, which PetAssetRegistry indexes so
+the frame cache cuts frames from the atlas instead of decoding the GIF.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QImage, QImageReader, QPainter
+
+from src.assets.frame_cache import decode_gif
+from src.pet_data_loader import PETS_INFO_PATH
+
+ATLAS_VERSION = 1
+DEFAULT_MAX_WIDTH = 800
+
+
+def _image_digest(image):
+    bits = image.constBits()
+    bits.setsize(image.bytesPerLine() * image.height())
+    return hashlib.sha1(bytes(bits)).hexdigest()
+
+
+def _atlas_name(source):
+    """Map "gifs/DEV_CAT/Black/x.gif" to "atlas/DEV_CAT/Black/x.png"."""
+    parts = source.replace("\\", "/").split("/")
+    if parts and parts[0] == "gifs":
+        parts = parts[1:]
+    return "/".join(["atlas"] + parts)[:-len(os.path.splitext(source)[1])] + ".png"
+
+
+def compile_gif(source_path, atlas_path, max_width=DEFAULT_MAX_WIDTH):
+    """Pack one GIF into a PNG atlas and return its manifest entry (paths excluded)."""
+    native = QImageReader(source_path).size()
+    width, height = native.width(), native.height()
+    if width > max_width:
+        height = max(1, round(height * max_width / width))
+        width = max_width
+    frames = decode_gif(source_path, (width, height))
+    if frames is None:
+        return None
+
+    cells = []
+    cell_index = {}
+    order = []
+    for image in frames.images:
+        digest = _image_digest(image)
+        if digest not in cell_index:
+            cell_index[digest] = len(cells)
+            cells.append(image)
+        order.append(cell_index[digest])
+
+    columns = max(1, math.ceil(math.sqrt(len(cells))))
+    rows = math.ceil(len(cells) / columns)
+    atlas = QImage(columns * width, rows * height, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(0)
+    painter = QPainter(atlas)
+    for index, cell in enumerate(cells):
+        painter.drawImage(QPoint((index % columns) * width, (index // columns) * height), cell)
+    painter.end()
+
+    os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+    # Quality 0 asks the PNG writer for maximum compression.
+    if not atlas.save(atlas_path, "PNG", 0):
+        print(f"[Atlas] Failed to write {atlas_path}")
+        return None
+
+    return {
+        "frame_size": [width, height],
+        "native_size": [native.width(), native.height()],
+        "columns": columns,
+        "cells": len(cells),
+        "frames": order,
+        "delays": list(frames.delays),
+        "loop_count": frames.loop_count,
+    }
+
+
+def compile_all(pets_info_path=PETS_INFO_PATH, max_width=DEFAULT_MAX_WIDTH, force=False):
+    """Compile every GIF in pets_info.json and write pets_atlas.json next to it."""
+    base_dir = os.path.dirname(os.path.abspath(pets_info_path))
+    manifest_path = os.path.join(base_dir, "pets_atlas.json")
+    with open(pets_info_path, "r") as file:
+        pets_info = json.load(file)
+
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "r") as file:
+                old = json.load(file)
+            if old.get("version") == ATLAS_VERSION and old.get("max_width") == max_width:
+                previous = old.get("animations", {})
+        except (OSError, json.JSONDecodeError):
+            previous = {}
+
+    animations = {}
+    pets = {}
+    for pet_kind, colors in pets_info.items():
+        for color, actions in colors.items():
+            for action, source in actions.items():
+                if not isinstance(source, str):
+                    continue
+                pets.setdefault(pet_kind, {}).setdefault(color, {})[action] = source
+                if source in animations:
+                    continue
+
+                source_path = os.path.join(base_dir, source)
+                if not os.path.exists(source_path):
+                    print(f"[Atlas] Missing source {source}, skipped")
+                    continue
+                source_mtime = os.path.getmtime(source_path)
+                atlas = _atlas_name(source)
+
+                old = previous.get(source)
+                if (old and old.get("source_mtime") == source_mtime
+                        and os.path.exists(os.path.join(base_dir, atlas))):
+                    animations[source] = old
+                    continue
+
+                entry = compile_gif(source_path, os.path.join(base_dir, atlas), max_width)
+                if entry is None:
+                    continue
+                entry["atlas"] = atlas
+                entry["source_mtime"] = source_mtime
+                animations[source] = entry
+
+                source_bytes = os.path.getsize(source_path)
+                atlas_bytes = os.path.getsize(os.path.join(base_dir, atlas))
+                print(f"[Atlas] {source}: {len(entry['frames'])} frames -> {entry['cells']} cells, "
+                      f"{source_bytes // 1024} KB -> {atlas_bytes // 1024} KB")
+
+    manifest = {
+        "version": ATLAS_VERSION,
+        "max_width": max_width,
+        "animations": animations,
+        "pets": pets,
+    }
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    print(f"[Atlas] Wrote {manifest_path} ({len(animations)} animations)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile pet GIFs into sprite atlases")
+    parser.add_argument("--pets-info", default=PETS_INFO_PATH, help="Path to pets_info.json")
+    parser.add_argument("--max-width", type=int, default=DEFAULT_MAX_WIDTH,
+                        help="Maximum frame width stored in the atlas")
+    parser.add_argument("--force", action="store_true", help="Recompile up-to-date atlases")
+    args = parser.parse_args()
+
+    compile_all(args.pets_info, args.max_width, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Shared decoded-frame cache for pet animations.
+
+Each (asset path, target size) pair is decoded once into a list of frames
+plus per-frame delays and shared by every pet that plays it. Entries are
+evicted least-recently-used once the cache exceeds its byte budget.
+
+When a compiled sprite atlas exists for a GIF (see `compile_atlas`) and is
+large enough for the requested size, frames are cut from the atlas instead
+of decoding the GIF. Keys also carry a level of detail (see `lod`), picked
+from the size unless the caller asks for one.
+"""
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QRect, QSize, Qt
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+from src.pet_data_loader import get_registry
+
+from .lod import apply_lod, select_lod
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_FRAME_DELAY = 100  # ms, used when a GIF frame has no delay
+
+
+class AnimationFrames:
+    """Decoded frames of one animation at one size.
+
+    `images` are QImages and may be built on any thread; `pixmap(index)`
+    returns a frame for painting and must only be called from the GUI thread.
+    `mapped` frames point into a FrameStore mapping rather than the heap and
+    are converted one frame at a time when painted, so the pixels stay in
+    the shared page cache instead of being copied into cached pixmaps.
+    `cost()` is what the frames hold on the heap, pixmaps included once they
+    exist; `on_pixmaps` is called after the conversion so a cache can
+    re-count the entry.
+    """
+
+    def __init__(self, images, delays, loop_count=-1, mapped=False):
+        self.images = images
+        self.delays = delays
+        self.loop_count = loop_count  # -1 loops forever, N replays N times
+        self.mapped = mapped
+        self.backing = None  # the FrameStore mapping `images` point into; must outlive them
+        # Repeated frames may share one QImage; count each buffer once.
+        unique = {image.cacheKey(): image for image in images}
+        self.nbytes = sum(image.bytesPerLine() * image.height() for image in unique.values())
+        self.pixmap_nbytes = 0
+        self.on_pixmaps = None
+        self._pixmaps = None
+
+    def __len__(self):
+        return len(self.images)
+
+    @property
+    def size(self):
+        if not self.images:
+            return QSize()
+        return self.images[0].size()
+
+    def pixmap(self, index):
+        """QPixmap of frame `index`; cached for heap frames, converted on demand if mapped."""
+        if self.mapped:
+            return QPixmap.fromImage(self.images[index])
+        return self.pixmaps()[index]
+
+    def pixmaps(self):
+        if self._pixmaps is None:
+            converted = {}
+            for image in self.images:
+                if image.cacheKey() not in converted:
+                    converted[image.cacheKey()] = QPixmap.fromImage(image)
+            self._pixmaps = [converted[image.cacheKey()] for image in self.images]
+            self.pixmap_nbytes = sum(pixmap.width() * pixmap.height() * pixmap.depth() // 8
+                                     for pixmap in converted.values())
+            if self.on_pixmaps is not None:
+                self.on_pixmaps(self)
+        return self._pixmaps
+
+    def cost(self):
+        # Mapped pages are clean and shared, so they do not count against a budget.
+        return (0 if self.mapped else self.nbytes) + self.pixmap_nbytes
+
+
+def decode_gif(path, size=None):
+    """Decode every frame of the GIF at `path`, scaled to `size` (w, h) if given."""
+    reader = QImageReader(path)
+    if size:
+        reader.setScaledSize(QSize(int(size[0]), int(size[1])))
+
+    images = []
+    delays = []
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        images.append(image.convertToFormat(QImage.Format_ARGB32_Premultiplied))
+        delay = reader.nextImageDelay()
+        delays.append(delay if delay > 0 else DEFAULT_FRAME_DELAY)
+
+    if not images:
+        print(f"[FrameCache] Failed to decode {path}: {reader.errorString()}")
+        return None
+    return AnimationFrames(images, delays, reader.loopCount())
+
+
+def decode_first_frame(path, size=None):
+    """Decode only the first frame of `path` at `size`, or None (a cheap placeholder)."""
+    reader = QImageReader(path)
+    if size:
+        reader.setScaledSize(QSize(int(size[0]), int(size[1])))
+    image = reader.read()
+    if image.isNull():
+        return None
+    return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+
+def decode_atlas(entry, size=None):
+    """Cut the frames of a compiled atlas entry, scaled to `size` if given."""
+    atlas = QImage(entry["atlas_path"])
+    if atlas.isNull():
+        print(f"[FrameCache] Failed to load atlas {entry['atlas_path']}")
+        return None
+
+    width, height = entry["frame_size"]
+    columns = entry["columns"]
+    cells = []
+    for index in range(entry["cells"]):
+        cell = atlas.copy(QRect((index % columns) * width, (index // columns) * height, width, height))
+        if size and (width, height) != tuple(size):
+            cell = cell.scaled(QSize(*size), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        cells.append(cell.convertToFormat(QImage.Format_ARGB32_Premultiplied))
+
+    images = [cells[cell] for cell in entry["frames"]]
+    return AnimationFrames(images, list(entry["delays"]), entry.get("loop_count", -1))
+
+
+def decode_animation(path, size=None, lod=0, palette=True):
+    """Decode `path` at `size` and LOD level, preferring a compiled atlas that fits.
+
+    `palette=False` skips the LOD's 8-bit palette (see `apply_lod`).
+    """
+    entry = get_registry().compiled_animation(path)
+    if entry is not None:
+        width, height = entry["frame_size"]
+        # Never upscale from a reduced atlas; fall back to the full-size GIF.
+        if size and size[0] <= width and size[1] <= height:
+            frames = decode_atlas(entry, size)
+            if frames is not None:
+                return apply_lod(frames, lod, palette)
+    return apply_lod(decode_gif(path, size), lod, palette)
+
+
+class FrameCache:
+    """LRU cache of AnimationFrames keyed by (path, size, lod) with a byte budget.
+
+    Entries decoded with `prefetch=True` stay marked as prefetched until a
+    regular `get` (or `claim`) uses them, so the prefetcher can bound and
+    trim what it speculatively added without touching frames pets play.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, store=None):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> threading.Event for decodes in progress
+        self._store = store
+        self._costs = {}  # key -> cost the entry was last counted at
+        self._prefetched = OrderedDict()  # key -> cost of entries nobody has used yet
+        self._prefetched_bytes = 0
+
+    def set_frame_store(self, store):
+        """Back cache misses with a FrameStore (None disables it)."""
+        self._store = store
+
+    @staticmethod
+    def make_key(path, size=None, lod=None):
+        """Return the cache key; `lod=None` picks the level for `size`."""
+        size = (int(size[0]), int(size[1])) if size else None
+        return (path, size, select_lod(size) if lod is None else lod)
+
+    def get(self, path, size=None, lod=None, prefetch=False):
+        """Return cached frames for (path, size, lod), decoding them on a miss.
+
+        `prefetch=True` marks a newly decoded entry as prefetched; any other
+        call claims the entry for regular use.
+        """
+        if not path:
+            return None
+        key = self.make_key(path, size, lod)
+        while True:
+            with self._lock:
+                frames = self._entries.get(key)
+                if frames is not None:
+                    self._entries.move_to_end(key)
+                    if not prefetch:
+                        self._unmark(key)
+                    return frames
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._pending[key] = pending
+                    break
+            # Another thread is decoding this key; wait and re-check.
+            pending.wait()
+
+        frames = None
+        store = self._store
+        try:
+            if store is not None:
+                frames = store.load(path, key[1], key[2])
+            if frames is None:
+                # The store maps ARGB32 pixels, shared and off the budget, so
+                # a palette would only cost quality there.
+                frames = decode_animation(path, key[1], key[2], palette=store is None)
+                if frames is not None and store is not None:
+                    frames = store.save(path, key[1], frames, key[2]) or frames
+        finally:
+            with self._lock:
+                if frames is not None:
+                    self._insert(key, frames)
+                    if prefetch:
+                        self._prefetched[key] = self._costs[key]
+                        self._prefetched_bytes += self._costs[key]
+                del self._pending[key]
+            pending.set()
+        return frames
+
+    def peek(self, path, size=None, lod=None):
+        """Return cached frames without decoding or touching LRU order."""
+        with self._lock:
+            return self._entries.get(self.make_key(path, size, lod))
+
+    def contains(self, path, size=None, lod=None):
+        with self._lock:
+            return self.make_key(path, size, lod) in self._entries
+
+    def claim(self, path, size=None, lod=None):
+        """Mark a prefetched entry as in regular use."""
+        with self._lock:
+            self._unmark(self.make_key(path, size, lod))
+
+    def touch_prefetched(self, path, size=None, lod=None):
+        """Move an unused prefetched entry to the back of the trim order."""
+        with self._lock:
+            key = self.make_key(path, size, lod)
+            if key in self._prefetched:
+                self._prefetched.move_to_end(key)
+
+    def prefetched_bytes(self):
+        """Bytes held by prefetched entries nobody has used yet."""
+        with self._lock:
+            return self._prefetched_bytes
+
+    def trim_prefetched(self, max_bytes):
+        """Evict the oldest unused prefetched entries until they fit `max_bytes`."""
+        with self._lock:
+            while self._prefetched_bytes > max_bytes and self._prefetched:
+                key, cost = self._prefetched.popitem(last=False)
+                self._prefetched_bytes -= cost
+                self._remove(key)
+
+    def _unmark(self, key):
+        cost = self._prefetched.pop(key, None)
+        if cost is not None:
+            self._prefetched_bytes -= cost
+
+    def _insert(self, key, frames):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = frames
+        self._costs[key] = frames.cost()
+        self._bytes += self._costs[key]
+        frames.on_pixmaps = lambda grown, key=key: self._recount(key, grown)
+        self._evict(keep=key)
+
+    def _recount(self, key, frames):
+        """Count the pixmaps `frames` built for painting (GUI thread)."""
+        with self._lock:
+            if self._entries.get(key) is not frames:
+                return
+            delta = frames.cost() - self._costs[key]
+            self._costs[key] += delta
+            self._bytes += delta
+            if key in self._prefetched:
+                self._prefetched[key] += delta
+                self._prefetched_bytes += delta
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        """Drop least recently used entries until the budget holds.
+
+        `keep` stays even if it alone exceeds the budget.
+        """
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def _remove(self, key):
+        self._entries.pop(key).on_pixmaps = None
+        self._bytes -= self._costs.pop(key)
+        self._unmark(key)
+
+    def clear(self):
+        with self._lock:
+            for frames in self._entries.values():
+                frames.on_pixmaps = None
+            self._entries.clear()
+            self._costs.clear()
+            self._bytes = 0
+            self._prefetched.clear()
+            self._prefetched_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "prefetched_bytes": self._prefetched_bytes,
+            }
+
+
+_frame_cache = None
+_frame_cache_lock = threading.Lock()
+
+
+def get_frame_cache():
+    """Return the process-wide FrameCache."""
+    global _frame_cache
+    if _frame_cache is None:
+        with _frame_cache_lock:
+            if _frame_cache is None:
+                _frame_cache = FrameCache()
+    return _frame_cache
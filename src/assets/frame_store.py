@@ -0,0 +1,155 @@
+"""Memory-mapped on-disk store of pre-decoded animation frames.
+
+Each (asset path, size) is written once as raw premultiplied ARGB32 pixels
+and afterwards mapped copy-on-write. The QImages handed to the frame cache
+point straight into the mapping, so every pet of the same skin - and every
+VCat process on the machine - reads the same pages from the OS page cache
+instead of holding its own decoded copy.
+
+PyQt5 only reaches QImage's read-only data constructor with a bytes object,
+which would copy the pixels, so the images wrap a writable pointer instead.
+Mapping with ACCESS_COPY keeps that safe: nothing here writes to them, and
+if a Qt code path ever did, it would get private pages rather than a fault
+or a modified file. The images must not outlive their mapping; mappings
+stay open for the life of the process and AnimationFrames.backing holds a
+reference as well.
+
+File layout: b"VCFS", uint32 version, uint32 header length, a JSON header,
+zero padding up to DATA_ALIGNMENT, then the unique frame cells back to back.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from PyQt5.QtGui import QImage
+
+try:
+    from PyQt5 import sip
+except ImportError:  # PyQt5 < 5.11 ships sip as a top-level module
+    import sip
+
+from .frame_cache import AnimationFrames
+
+FRAME_STORE_DIR = os.path.expanduser("~/.vcat/frames")
+STORE_MAGIC = b"VCFS"
+STORE_VERSION = 1
+DATA_ALIGNMENT = 4096
+_PREFIX = struct.Struct("<4sII")
+
+
+class FrameStore:
+    """Copy-on-write mmap store shared by all pets (and processes) of a skin."""
+
+    def __init__(self, directory=FRAME_STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._mappings = {}  # file name -> mmap, kept open for the process lifetime
+
+    def _file_for(self, path, size, lod=0):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        size_key = f"{size[0]}x{size[1]}" if size else "native"
+        digest = hashlib.sha1(
+            f"{os.path.realpath(path)}|{mtime}|{size_key}|{lod}|{STORE_VERSION}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.directory, digest + ".frames")
+
+    def _map(self, file_path):
+        with self._lock:
+            mapping = self._mappings.get(file_path)
+            if mapping is not None:
+                return mapping
+            with open(file_path, "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+            self._mappings[file_path] = mapping
+            return mapping
+
+    def load(self, path, size=None, lod=0):
+        """Return mmap-backed frames for (path, size, lod), or None if not stored.
+
+        The QImages point into the mapping and are only valid while it is open.
+        """
+        file_path = self._file_for(path, size, lod)
+        if file_path is None or not os.path.exists(file_path):
+            return None
+        try:
+            mapping = self._map(file_path)
+            magic, version, header_len = _PREFIX.unpack_from(mapping, 0)
+            if magic != STORE_MAGIC or version != STORE_VERSION:
+                return None
+            header = json.loads(mapping[_PREFIX.size:_PREFIX.size + header_len].decode("utf-8"))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[FrameStore] Ignoring unreadable {file_path}: {e}")
+            return None
+
+        width, height, stride = header["width"], header["height"], header["stride"]
+        cell_bytes = stride * height
+        offset = header["data_offset"]
+        view = memoryview(mapping)
+        cells = []
+        for index in range(header["cells"]):
+            start = offset + index * cell_bytes
+            cells.append(QImage(sip.voidptr(view[start:start + cell_bytes]), width, height, stride,
+                                QImage.Format_ARGB32_Premultiplied))
+
+        images = [cells[cell] for cell in header["frames"]]
+        frames = AnimationFrames(images, header["delays"], header["loop_count"], mapped=True)
+        frames.backing = mapping
+        return frames
+
+    def save(self, path, size, frames, lod=0):
+        """Write `frames` to the store and return the mmap-backed copy."""
+        file_path = self._file_for(path, size, lod)
+        if file_path is None or not frames or len(frames) == 0:
+            return None
+
+        cells = []
+        cell_index = {}
+        order = []
+        for image in frames.images:
+            key = image.cacheKey()
+            if key not in cell_index:
+                cell_index[key] = len(cells)
+                cells.append(image.convertToFormat(QImage.Format_ARGB32_Premultiplied))
+            order.append(cell_index[key])
+
+        first = cells[0]
+        header = {
+            "width": first.width(),
+            "height": first.height(),
+            "stride": first.bytesPerLine(),
+            "cells": len(cells),
+            "frames": order,
+            "delays": list(frames.delays),
+            "loop_count": frames.loop_count,
+        }
+        header_len = len(json.dumps(header).encode("utf-8")) + 32  # room for data_offset
+        header["data_offset"] = -(-(_PREFIX.size + header_len) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(_PREFIX.pack(STORE_MAGIC, STORE_VERSION, len(header_bytes)))
+                file.write(header_bytes)
+                file.write(b"\0" * (header["data_offset"] - _PREFIX.size - len(header_bytes)))
+                for cell in cells:
+                    bits = cell.constBits()
+                    bits.setsize(cell.bytesPerLine() * cell.height())
+                    file.write(bytes(bits))
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            print(f"[FrameStore] Failed to write {file_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except (OSError, UnboundLocalError):
+                pass
+            return None
+        return self.load(path, size, lod)
@@ -0,0 +1,97 @@
+"""Global frame-rate governor for pet animations."""
+import weakref
+
+DEFAULT_STATE_FPS = {
+    "sleeping": 4,
+}
+DEFAULT_LOW_POWER_FPS = 8
+
+
+class FrameRateGovernor:
+    """Caps animation frame rates and pauses animations nobody can see.
+
+    - `state_fps` caps the frame rate of animations played for a behavior
+      state (e.g. a sleeping pet needs only a few frames per second).
+    - Low-power mode applies `low_power_fps` to every animation.
+    - Pets that are hidden, or entirely covered by a registered occluder such
+      as the chat dialog, have their animation paused.
+    - While frozen (idle mode) every animation holds its current frame.
+
+    Players keep animations in real time under a cap by skipping frames
+    rather than slowing down.
+    """
+
+    def __init__(self):
+        self.state_fps = dict(DEFAULT_STATE_FPS)
+        self.low_power = False
+        self.low_power_fps = DEFAULT_LOW_POWER_FPS
+        self.frozen = False
+        self._pets = weakref.WeakSet()
+        self._occluders = weakref.WeakSet()
+
+    def configure(self, config):
+        """Apply `animation_fps_caps`, `low_power_fps` and `low_power_mode` from config."""
+        self.state_fps = dict(config.get("animation_fps_caps", DEFAULT_STATE_FPS))
+        self.low_power_fps = config.get("low_power_fps", DEFAULT_LOW_POWER_FPS)
+        self.set_low_power(config.get("low_power_mode", False))
+
+    def min_interval(self, state=None):
+        """Minimum milliseconds between frames for an animation in `state`."""
+        caps = []
+        fps = self.state_fps.get(state) if state else None
+        if fps:
+            caps.append(1000.0 / fps)
+        if self.low_power and self.low_power_fps:
+            caps.append(1000.0 / self.low_power_fps)
+        return int(max(caps)) if caps else 0
+
+    def set_low_power(self, enabled):
+        self.low_power = bool(enabled)
+
+    def set_frozen(self, frozen):
+        """Hold every pet animation on its current frame (or let them run again)."""
+        if self.frozen != bool(frozen):
+            self.frozen = bool(frozen)
+            self.refresh()
+
+    # Visibility --------------------------------------------------------
+    def register_pet(self, widget):
+        """Track a PetWidget so occluder changes can pause or resume it."""
+        self._pets.add(widget)
+
+    def add_occluder(self, widget):
+        self._occluders.add(widget)
+        self.refresh()
+
+    def remove_occluder(self, widget):
+        self._occluders.discard(widget)
+        self.refresh()
+
+    def has_occluders(self):
+        return len(self._occluders) > 0
+
+    def is_occluded(self, widget):
+        """True if `widget` is fully covered by a visible occluder window."""
+        if not self._occluders:
+            return False
+        rect = widget.rect().translated(widget.mapToGlobal(widget.rect().topLeft()))
+        for occluder in list(self._occluders):
+            if occluder.isVisible() and occluder.frameGeometry().contains(rect):
+                return True
+        return False
+
+    def refresh(self):
+        """Re-evaluate pause state for every tracked pet."""
+        for pet in list(self._pets):
+            pet.update_animation_visibility()
+
+
+_governor = None
+
+
+def get_frame_governor():
+    """Return the process-wide FrameRateGovernor."""
+    global _governor
+    if _governor is None:
+        _governor = FrameRateGovernor()
+    return _governor
@@ -0,0 +1,85 @@
+"""Background decoding into the shared FrameCache."""
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .frame_cache import FrameCache, get_frame_cache
+
+
+class BackgroundFrameLoader(QObject):
+    """Decodes animations off the GUI thread and reports back on it.
+
+    `load` returns immediately; callbacks run on the thread that owns the
+    loader (the GUI thread) once the frames are in the cache. Requests for a
+    key that is already being decoded are folded into the running job.
+    `prefetch=True` loads stay marked as prefetched in the cache until a
+    regular load asks for the same key.
+    """
+
+    _loaded = pyqtSignal(object, object)  # key, AnimationFrames or None
+
+    def __init__(self, cache=None, max_workers=1):
+        super().__init__()
+        self._cache = cache or get_frame_cache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vcat-frames")
+        self._callbacks = {}  # key -> [callback, ...]
+        self._speculative = set()  # pending keys only prefetch loads asked for
+        self._loaded.connect(self._deliver)
+
+    def load(self, path, size=None, callback=None, prefetch=False):
+        if not path:
+            return
+        key = FrameCache.make_key(path, size)
+        frames = self._cache.peek(*key)
+        if frames is not None:
+            if not prefetch:
+                self._cache.claim(*key)
+            if callback:
+                callback(frames)
+            return
+        waiting = self._callbacks.get(key)
+        if waiting is not None:
+            if not prefetch:
+                self._speculative.discard(key)
+            if callback:
+                waiting.append(callback)
+            return
+        self._callbacks[key] = [callback] if callback else []
+        if prefetch:
+            self._speculative.add(key)
+        self._executor.submit(self._decode, key, prefetch)
+
+    def is_pending(self, path, size=None):
+        return FrameCache.make_key(path, size) in self._callbacks
+
+    def _decode(self, key, prefetch):
+        frames = None
+        try:
+            frames = self._cache.get(*key, prefetch=prefetch)
+        except Exception as e:
+            print(f"[FrameLoader] Decoding {key[0]} failed: {e}")
+        self._loaded.emit(key, frames)
+
+    def _deliver(self, key, frames):
+        if key in self._speculative:
+            self._speculative.discard(key)
+        elif frames is not None:
+            # A regular load joined a prefetch job while it was decoding.
+            self._cache.claim(*key)
+        for callback in self._callbacks.pop(key, []):
+            if frames is not None:
+                callback(frames)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_frame_loader = None
+
+
+def get_frame_loader():
+    """Return the process-wide BackgroundFrameLoader (create it on the GUI thread)."""
+    global _frame_loader
+    if _frame_loader is None:
+        _frame_loader = BackgroundFrameLoader()
+    return _frame_loader
@@ -0,0 +1,82 @@
+"""Level-of-detail variants of pet animations, chosen by on-screen size.
+
+Frames are already decoded at the label's size, so resolution follows the
+pet, and default-sized pets keep full-colour ARGB32 frames. Small pets
+additionally get fewer frames (each kept frame inherits the delays of the
+ones it replaces, so the animation keeps its speed) and an 8-bit palette,
+which cuts cached bytes by four and halves or thirds the number of frame
+flips per second. The palette's 1-bit alpha is dithered with an ordered
+pattern, which softens edges without flickering from frame to frame.
+"""
+from collections import namedtuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+LodLevel = namedtuple("LodLevel", "max_width frame_step palette")
+
+# Ordered from full detail down; a level applies while the width fits.
+LOD_LEVELS = (
+    LodLevel(max_width=None, frame_step=1, palette=False),  # 0: full detail
+    LodLevel(max_width=400, frame_step=1, palette=False),   # 1: default-sized pets
+    LodLevel(max_width=160, frame_step=2, palette=True),    # 2: small pets
+    LodLevel(max_width=64, frame_step=3, palette=True),     # 3: toolbar-sized pets
+)
+MIN_LOD_FRAMES = 4  # never decimate an animation below this many frames
+PALETTE_CONVERSION = Qt.OrderedDither | Qt.OrderedAlphaDither
+
+_enabled = True
+
+
+def set_lod_enabled(enabled):
+    """Turn LOD selection on or off; off always picks full detail."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def select_lod(size):
+    """Return the LOD level index for a label of `size` (w, h)."""
+    if not _enabled or not size:
+        return 0
+    width = int(size[0])
+    level = 0
+    for index, lod in enumerate(LOD_LEVELS):
+        if lod.max_width is None or width <= lod.max_width:
+            level = index
+    return level
+
+
+def apply_lod(frames, level, palette=True):
+    """Return `frames` reduced to LOD `level` (the same object for level 0).
+
+    `palette=False` keeps ARGB32 frames even where the level would use a
+    palette, for frames that go to the FrameStore.
+    """
+    if frames is None or not level:
+        return frames
+    lod = LOD_LEVELS[min(level, len(LOD_LEVELS) - 1)]
+
+    images = list(frames.images)
+    delays = list(frames.delays)
+    if lod.frame_step > 1 and len(images) // lod.frame_step >= MIN_LOD_FRAMES:
+        kept_images = []
+        kept_delays = []
+        for start in range(0, len(images), lod.frame_step):
+            kept_images.append(images[start])
+            kept_delays.append(sum(delays[start:start + lod.frame_step]))
+        # Keep the final pose so one-shot animations end where they should.
+        if kept_images[-1] is not images[-1]:
+            kept_delays[-1] -= delays[-1]
+            kept_images.append(images[-1])
+            kept_delays.append(delays[-1])
+        images, delays = kept_images, kept_delays
+
+    if lod.palette and palette:
+        converted = {}
+        for image in images:
+            if image.cacheKey() not in converted:
+                converted[image.cacheKey()] = image.convertToFormat(
+                    QImage.Format_Indexed8, PALETTE_CONVERSION)
+        images = [converted[image.cacheKey()] for image in images]
+
+    return type(frames)(images, delays, frames.loop_count)
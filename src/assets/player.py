@@ -0,0 +1,127 @@
+"""QMovie replacement that plays shared AnimationFrames on a QLabel."""
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from .governor import get_frame_governor
+
+
+class AnimationPlayer(QObject):
+    """Steps through cached frames and pushes them to a label with setPixmap.
+
+    Mirrors the parts of the QMovie API the actions use (`start`, `stop`,
+    `setPaused`, `finished`, `frameChanged`) but never decodes anything: the
+    frames come from the shared FrameCache. Frame timing is capped by the
+    FrameRateGovernor for the player's `state`; under a cap whole frames are
+    skipped so the animation keeps its real-time speed.
+    """
+
+    frameChanged = pyqtSignal(int)
+    finished = pyqtSignal()
+
+    def __init__(self, label, parent=None):
+        super().__init__(parent)
+        self._label = label
+        self._frames = None
+        self._loop = True
+        self.state = None
+        self._interval = 0
+        self._index = 0
+        self._plays = 0
+        self._running = False
+        self._paused = False
+        self.stopped = False  # stop() called since the last set_frames
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._advance)
+
+    @property
+    def frames(self):
+        return self._frames
+
+    def currentFrameNumber(self):
+        return self._index
+
+    def set_frames(self, frames, loop=True, state=None):
+        """Replace the animation. `loop=False` honours the file's loop count.
+
+        `state` names the behavior state playing it, for per-state FPS caps.
+        """
+        self.stop()
+        self._frames = frames
+        self._loop = loop
+        self.state = state
+        self.stopped = False
+
+    def swap_frames(self, frames):
+        """Switch to another size tier of the same animation without restarting it."""
+        self._frames = frames
+        if not frames or len(frames) == 0:
+            self.stop()
+            return
+        self._index %= len(frames)
+        if self._running:
+            self._timer.stop()
+            self._show_frame()
+
+    def start(self):
+        if not self._frames or len(self._frames) == 0:
+            return
+        self._index = 0
+        self._plays = 0
+        self._running = True
+        self._paused = False
+        self._show_frame()
+
+    def stop(self):
+        self.stopped = True
+        self._running = False
+        self._timer.stop()
+
+    def setPaused(self, paused):
+        if not self._running or paused == self._paused:
+            return
+        self._paused = paused
+        if paused:
+            self._timer.stop()
+        else:
+            self._schedule()
+
+    def isRunning(self):
+        return self._running and not self._paused
+
+    def _show_frame(self):
+        self._label.setPixmap(self._frames.pixmap(self._index))
+        self.frameChanged.emit(self._index)
+        self._schedule()
+
+    def _schedule(self):
+        if self._running and not self._paused and len(self._frames) > 1:
+            delay = self._frames.delays[self._index]
+            self._interval = max(delay, get_frame_governor().min_interval(self.state))
+            self._timer.start(self._interval)
+
+    def _step(self):
+        """Move to the next frame; return False once a non-looping animation ends."""
+        self._index += 1
+        if self._index >= len(self._frames):
+            self._plays += 1
+            loop_count = self._frames.loop_count
+            if not self._loop and loop_count >= 0 and self._plays > loop_count:
+                self._index = len(self._frames) - 1
+                self._running = False
+                self.finished.emit()
+                return False
+            self._index = 0
+        return True
+
+    def _advance(self):
+        if not self._running:
+            return
+        # Time left over after the shown frame's own delay, when capped
+        spare = self._interval - self._frames.delays[self._index]
+        if not self._step():
+            return
+        while spare >= self._frames.delays[self._index]:
+            spare -= self._frames.delays[self._index]
+            if not self._step():
+                return
+        self._show_frame()
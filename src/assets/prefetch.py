@@ -0,0 +1,63 @@
+"""Background prefetch of the animations a pet is likely to play next."""
+from .frame_cache import get_frame_cache
+from .loader import get_frame_loader
+
+DEFAULT_PREFETCH_BYTES = 24 * 1024 * 1024
+DEFAULT_MIN_PROBABILITY = 0.05
+
+
+class AnimationPrefetcher:
+    """Warms the frame cache for likely next animations within a byte budget.
+
+    Candidates are (path, size, probability) tuples. The most probable ones
+    are decoded on the BackgroundFrameLoader thread while the cache's
+    prefetched-but-unused entries stay under `max_bytes`; past the budget
+    the oldest of those entries are evicted from the cache, so the budget
+    tracks what is actually useful now. Entries a pet has played no longer
+    count and are left to the cache's own LRU.
+    """
+
+    def __init__(self, cache=None, loader=None, max_bytes=DEFAULT_PREFETCH_BYTES,
+                 min_probability=DEFAULT_MIN_PROBABILITY):
+        self._cache = cache or get_frame_cache()
+        self._loader = loader
+        self.max_bytes = max_bytes
+        self.min_probability = min_probability
+
+    @property
+    def loader(self):
+        if self._loader is None:
+            self._loader = get_frame_loader()
+        return self._loader
+
+    def prefetch(self, candidates):
+        """Queue background decodes for the most probable candidates."""
+        ranked = sorted(
+            (c for c in candidates if c[0] and c[2] >= self.min_probability),
+            key=lambda c: c[2],
+            reverse=True,
+        )
+        for path, size, _probability in ranked:
+            if self._cache.contains(path, size):
+                # Still likely: keep it from being the next one trimmed.
+                self._cache.touch_prefetched(path, size)
+                continue
+            if self.loader.is_pending(path, size):
+                continue
+            if self._cache.prefetched_bytes() >= self.max_bytes:
+                break
+            self.loader.load(path, size, self._on_warmed, prefetch=True)
+
+    def _on_warmed(self, frames):
+        self._cache.trim_prefetched(self.max_bytes)
+
+
+_prefetcher = None
+
+
+def get_prefetcher():
+    """Return the process-wide AnimationPrefetcher."""
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = AnimationPrefetcher()
+    return _prefetcher
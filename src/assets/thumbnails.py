@@ -0,0 +1,109 @@
+"""Static first-frame thumbnails cached on disk, and their own frame cache."""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from .frame_cache import FrameCache, decode_first_frame
+from .loader import BackgroundFrameLoader
+
+THUMBNAIL_DIR = os.path.expanduser("~/.vcat/thumbnails")
+THUMBNAIL_FRAME_BYTES = 8 * 1024 * 1024  # animated previews, apart from the pets' cache
+
+
+class ThumbnailCache(QObject):
+    """Serves button-sized first frames, decoding each at most once per size.
+
+    Thumbnails are kept in memory and as PNGs under THUMBNAIL_DIR, so after
+    the first run opening the pet picker only loads small PNGs. Misses are
+    decoded on a worker thread and delivered on the GUI thread.
+    """
+
+    _ready = pyqtSignal(object, object)  # key, QImage
+
+    def __init__(self, directory=THUMBNAIL_DIR):
+        super().__init__()
+        self.directory = directory
+        self._images = {}     # key -> QImage
+        self._callbacks = {}  # key -> [callback, ...]
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vcat-thumbs")
+        self._ready.connect(self._deliver)
+
+    def _key(self, path, size):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        return (os.path.realpath(path), mtime, int(size[0]), int(size[1]))
+
+    def _file_for(self, key):
+        digest = hashlib.sha1("|".join(map(str, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".png")
+
+    def request(self, path, size, callback):
+        """Call `callback(QImage)` with the thumbnail, now or once it is ready."""
+        if not path:
+            return
+        key = self._key(path, size)
+        image = self._images.get(key)
+        if image is not None:
+            callback(image)
+            return
+        waiting = self._callbacks.get(key)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+        self._callbacks[key] = [callback]
+        self._executor.submit(self._load, path, size, key)
+
+    def _load(self, path, size, key):
+        file_path = self._file_for(key)
+        image = QImage(file_path) if os.path.exists(file_path) else QImage()
+        if image.isNull():
+            image = decode_first_frame(path, size)
+            if image is None:
+                print(f"[Thumbnails] Failed to decode {path}")
+                image = QImage()
+            else:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    image.save(file_path, "PNG")
+                except OSError as e:
+                    print(f"[Thumbnails] Failed to cache {file_path}: {e}")
+        self._ready.emit(key, image)
+
+    def _deliver(self, key, image):
+        callbacks = self._callbacks.pop(key, [])
+        if image.isNull():
+            return
+        self._images[key] = image
+        for callback in callbacks:
+            callback(image)
+
+
+_thumbnail_cache = None
+
+
+def get_thumbnail_cache():
+    """Return the process-wide ThumbnailCache (create it on the GUI thread)."""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
+
+
+_thumbnail_frame_loader = None
+
+
+def get_thumbnail_frame_loader():
+    """Return the loader for animated thumbnails (create it on the GUI thread).
+
+    It decodes into a small FrameCache of its own, so browsing skins never
+    evicts the frames of the pets on screen.
+    """
+    global _thumbnail_frame_loader
+    if _thumbnail_frame_loader is None:
+        _thumbnail_frame_loader = BackgroundFrameLoader(FrameCache(max_bytes=THUMBNAIL_FRAME_BYTES))
+    return _thumbnail_frame_loader
@@ -1,5 +1,17 @@
-"""Behavior package exports."""
-from .manager import BehaviorManager
-from .adapter import LegacyBehaviorAdapter
+"""Behavior package exports.
+
+BehaviorManager and LegacyBehaviorAdapter are imported on first use, so the
+Qt-free modules (config, transitions, trace, simulate) load without PyQt5.
+"""
 
 __all__ = ["BehaviorManager", "LegacyBehaviorAdapter"]
+
+
+def __getattr__(name):
+    if name == "BehaviorManager":
+        from .manager import BehaviorManager
+        return BehaviorManager
+    if name == "LegacyBehaviorAdapter":
+        from .adapter import LegacyBehaviorAdapter
+        return LegacyBehaviorAdapter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
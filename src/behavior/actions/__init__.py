@@ -1,11 +1,24 @@
-"""Exports for behavior action modules."""
-from .pet_sit import run as pet_sit
-from .pet_random_walk import run as pet_random_walk
-from .pet_move_to_portal import run as pet_move_to_portal
-from .pet_play import run as pet_play
-from .pet_code import run as pet_code, runterminal as pet_code_runterminal, showtxt as pet_code_showtxt
-from .pet_sleep import run as pet_sleep
-from .pet_startdefault import run as pet_startdefault
+"""Exports for behavior action modules.
+
+Each action's `run` is exported wrapped by the action profiler.
+"""
+from src.utils.profiler import get_action_profiler
+from .pet_sit import run as _sit
+from .pet_random_walk import run as _random_walk
+from .pet_move_to_portal import run as _move_to_portal
+from .pet_play import run as _play
+from .pet_code import run as _code, runterminal as pet_code_runterminal, showtxt as pet_code_showtxt
+from .pet_sleep import run as _sleep
+from .pet_startdefault import run as _startdefault
+
+_profiler = get_action_profiler()
+pet_sit = _profiler.wrap("pet_sit", _sit)
+pet_random_walk = _profiler.wrap("pet_random_walk", _random_walk)
+pet_move_to_portal = _profiler.wrap("pet_move_to_portal", _move_to_portal)
+pet_play = _profiler.wrap("pet_play", _play)
+pet_code = _profiler.wrap("pet_code", _code)
+pet_sleep = _profiler.wrap("pet_sleep", _sleep)
+pet_startdefault = _profiler.wrap("pet_startdefault", _startdefault)
 
 __all__ = [
     "pet_sit",
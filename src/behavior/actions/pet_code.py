@@ -2,9 +2,7 @@ import subprocess
 import os
 import time
 import random
-from PyQt5.QtCore import QTimer, QPoint
-from PyQt5.QtGui import QMovie
-from pet_data_loader import load_pet_data
+from PyQt5.QtCore import QPoint
 from src.ui.chat_dialog import ChatDialog
 
 
@@ -18,33 +16,18 @@ def run(self, parent, callback):
     
     self.resize_pet_label(parent)
 
-    if self.animation and self.animation.state() == getattr(self.animation, 'Running', None):
-        try:
-            self.animation.stop()
-        except Exception:
-            pass
-
-    pet_movie = QMovie(self.resource_path(load_pet_data(self.pet_kind, self.pet_color, "code")))
-    self.pet_label.setMovie(pet_movie)
-    self.pet_label.setScaledContents(True)
-    pet_movie.start()
-    pet_movie.finished.connect(pet_movie.start)
+    self.play_animation("code")
 
     # Store callback for later use when dialog closes
     self._coding_callback = callback
     
-    # Show chat dialog after a short delay
-    coding_duration_timer = QTimer(parent)
-    coding_duration_timer.setSingleShot(True)
-    self.active_timers.append(coding_duration_timer)
-
     def show_chat_dialog():
         global _active_dialog
         
         # Check if dialog already exists
         if parent.is_chat_dialog_open:
             # Dialog already open, just call callback after delay
-            QTimer.singleShot(5000, callback)
+            self.scope.single_shot(5000, callback, parent)
             return
             
         # Create and show chat dialog with pet_label reference for position tracking
@@ -75,8 +58,8 @@ def run(self, parent, callback):
             pet_size.height()
         )
 
-    coding_duration_timer.timeout.connect(show_chat_dialog)
-    coding_duration_timer.start(1000)  # Show dialog after 1 second
+    # Show chat dialog after a short delay
+    self.scope.single_shot(1000, show_chat_dialog, parent)
 
 
 def runterminal(self, command="echo Hello, Terminal!"):
@@ -46,6 +46,19 @@ class LegacyBehaviorAdapter:
     def resource_path(self, value):
         setattr(self._inner, "resource_path", value)
 
+    @property
+    def pet_name(self):
+        return getattr(self._inner, "pet_name", None)
+
+    @pet_name.setter
+    def pet_name(self, value):
+        setattr(self._inner, "pet_name", value)
+
+    @property
+    def rng(self):
+        """The pet's own seeded random.Random."""
+        return getattr(self._inner, "rng", None)
+
     @property
     def current_state(self):
         return getattr(self._inner, "current_state", None)
@@ -85,3 +98,13 @@ class LegacyBehaviorAdapter:
     @property
     def animation(self):
         return getattr(self._inner, "animation", None)
+
+    @property
+    def paused(self):
+        """True while the pet is paused (dragged, teleporting) and not yet resumed."""
+        return getattr(self._inner, "paused", False)
+
+    @property
+    def scope(self):
+        """Lifecycle scope owning the current state's timers and animations."""
+        return getattr(self._inner, "scope", None)
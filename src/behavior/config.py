@@ -13,8 +13,27 @@ DEFAULT_CONFIG = {
         "sitting_to_coding": 0.01,
         "sitting_to_sleeping": 0.3
     },
+    # Per-state transition rows, durations (ms or [min, max]) and actions;
+    # rows not listed follow behavior_probabilities (see transitions.py).
+    # These entries spell out the built-in defaults as an example.
+    "transitions": {"playing": {"sitting": 1.0}},
+    "state_durations": {"startdefault": 500},
+    "state_actions": {"sleeping": "pet_sleep"},
     "pet_size_ratio": 0.3,  # Default pet size (30%)
     "voice_wake_enabled": True,  # Voice wake-up feature enabled by default
+    "frame_store_enabled": False,  # Share decoded frames through ~/.vcat/frames
+    "compositor_mode": False,  # Paint all pets, name tags and portals in one widget
+    "window_mask": False,  # Opt-in: mask the full-screen window to the pet, tag and portal bounds
+    "animation_lod": True,  # Fewer frames / 8-bit palette for small pets
+    "animation_fps_caps": {"sleeping": 4},  # Max FPS per behavior state
+    "low_power_mode": False,
+    "low_power_fps": 8,  # FPS cap for every animation in low-power mode
+    "idle_mode_enabled": True,  # Sleep and freeze pets when nobody uses the machine
+    "idle_timeout_seconds": 600,  # Seconds without input before idle mode
+    "idle_poll_scale": 5,  # Cursor polling runs this many times slower while idle
+    "action_profiling": True,  # Per-action latency histograms (Settings > Performance)
+    "behavior_seed": None,  # Fixed seed for reproducible behavior (None: new seed per run)
+    "behavior_trace_path": None,  # Record a behavior trace to this file
     "version": "1.0"
 }
 
@@ -114,6 +133,38 @@ def validate_config(config: Dict) -> Tuple[bool, str]:
         if not 0 <= value <= 1:
             return False, f"Probability '{key}' out of range [0, 1]: {value}"
 
+    transitions = config.get("transitions", {})
+    if not isinstance(transitions, dict):
+        return False, "'transitions' must be a dictionary"
+    for state, row in transitions.items():
+        if not isinstance(row, dict):
+            return False, f"Transitions for '{state}' must be a dictionary"
+        for next_state, weight in row.items():
+            if not isinstance(weight, (int, float)) or weight < 0:
+                return False, f"Weight '{state}' -> '{next_state}' must be a non-negative number"
+
+    durations = config.get("state_durations", {})
+    if not isinstance(durations, dict):
+        return False, "'state_durations' must be a dictionary"
+    for state, value in durations.items():
+        bounds = value if isinstance(value, list) else [value, value]
+        if (len(bounds) != 2
+                or not all(isinstance(b, (int, float)) and not isinstance(b, bool) and b >= 0 for b in bounds)
+                or bounds[0] > bounds[1]):
+            return False, f"Duration for '{state}' must be milliseconds or [min, max] with min <= max"
+
+    seed = config.get("behavior_seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        return False, "'behavior_seed' must be an integer or null"
+
+    timeout = config.get("idle_timeout_seconds", 600)
+    if not isinstance(timeout, (int, float)) or timeout <= 0:
+        return False, "'idle_timeout_seconds' must be a positive number"
+
+    actions = config.get("state_actions", {})
+    if not isinstance(actions, dict) or not all(isinstance(a, str) for a in actions.values()):
+        return False, "'state_actions' must map states to action names"
+
     return True, ""
 
 
@@ -4,7 +4,8 @@ Allows dragging the pet to any position while holding Command key.
 Pauses current behavior during drag and resumes after release.
 """
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QCursor, QMovie
+
+from src.utils.spatial_index import get_pet_index
 
 
 class DragHandler:
@@ -33,13 +34,9 @@ class DragHandler:
         """
         # Check if Command key is pressed (Qt.ControlModifier on macOS is Command)
         if event.modifiers() & Qt.ControlModifier:
-            # Check if cursor is within pet label bounds
-            cursor_pos = QCursor.pos()
-            pet_global_pos = self.parent.pet_label.mapToGlobal(self.parent.pet_label.rect().topLeft())
-            pet_global_rect = self.parent.pet_label.rect()
-            pet_global_rect.moveTopLeft(pet_global_pos)
-            
-            if pet_global_rect.contains(cursor_pos):
+            # Check if the press hits the pet label via the shared pet index
+            pos = event.globalPos()
+            if self.parent.pet_label in get_pet_index().query_point(pos.x(), pos.y()):
                 # Start dragging
                 self.is_dragging = True
                 self.drag_start_pos = event.globalPos()
@@ -113,16 +110,13 @@ class DragHandler:
     
     def _play_drag_animation(self):
         """Play the drag animation GIF on the pet label."""
-        from pet_data_loader import load_pet_data
+        from src.pet_data_loader import load_pet_data
         from main_window import resource_path
         
         drag_gif_path = resource_path(
             load_pet_data(self.parent.pet_kind, self.parent.pet_color, "drag")
         )
-        drag_movie = QMovie(drag_gif_path)
-        self.parent.pet_label.setMovie(drag_movie)
-        self.parent.pet_label.setScaledContents(True)
-        drag_movie.start()
+        self.parent.pet_label.set_movie(drag_gif_path)
     
     def _is_in_toolbar_area(self, global_pos):
         """Check if the release position is in the toolbar area (top-right corner).
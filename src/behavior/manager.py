@@ -1,7 +1,16 @@
-import random
 from PyQt5.QtCore import QTimer
-from .pet_actions import PetActions
+from .pet_actions import PetActions, STATE_ANIMATIONS, state_from_name
 from .config import load_behavior_config
+from .transitions import compile_transitions, set_transition_table
+from .trace import new_run_seed, pet_seed, start_trace, trace_event, trace_path_from_config
+from src.pet_data_loader import load_pet_data
+from src.assets import get_frame_governor, get_prefetcher, set_lod_enabled
+from src.utils.idle_monitor import get_idle_monitor
+from src.utils.profiler import get_action_profiler
+
+
+# States owned by an interaction; idle mode does not put these pets to sleep
+IDLE_EXEMPT_STATES = (PetActions.CODING, PetActions.GOINGTOPORTAL, PetActions.REACHEDPORTAL)
 
 
 class BehaviorManager:
@@ -9,20 +18,41 @@ class BehaviorManager:
 
     Responsibility:
     - register pet behaviors
-    - advance state transitions using the same probabilities as the original
+    - advance state transitions from the compiled transition table (the
+      original probabilities unless `transitions` is configured)
     - invoke behavior.perform_action(...) and handle callbacks
+    - prefetch the animations of the likely next states in the background
+    - keep visible pets asleep while the user is idle
+    - seed each pet's RNG and record behavior traces when configured
     """
 
     def __init__(self, parent_app):
         self.parent = parent_app
         self.pets = []  # list of dicts: {name, behavior, label}
+        self.idle = False
 
         # Load behavior configuration
         self.config = load_behavior_config()
+        self.transitions = compile_transitions(self.config)
+        set_transition_table(self.transitions)
+        get_action_profiler().enabled = self.config.get("action_profiling", True)
+
+        # One seed per run; each pet derives its own from it and its name
+        seed = self.config.get("behavior_seed")
+        self.seed = new_run_seed() if seed is None else seed
+        trace_path = trace_path_from_config(self.config)
+        if trace_path:
+            start_trace(trace_path, self.seed, self.config)
 
     def reload_config(self):
         """Reload configuration from disk (called after settings save)."""
         self.config = load_behavior_config()
+        self.transitions = compile_transitions(self.config)
+        set_transition_table(self.transitions)
+        get_frame_governor().configure(self.config)
+        set_lod_enabled(self.config.get("animation_lod", True))
+        get_idle_monitor().configure(self.config)
+        get_action_profiler().enabled = self.config.get("action_profiling", True)
         print(f"[VCat] Config reloaded")
     
     def pause_all(self):
@@ -40,8 +70,35 @@ class BehaviorManager:
         behavior.resume(self.parent, lambda: self.advance_state(behavior))
         print(f"[BehaviorManager] Resumed behavior with state: {state}")
 
+    def set_idle(self, idle):
+        """Put visible pets to sleep while idle and wake them straight away afterwards.
+
+        Hidden pets (teleported, in the toolbar, mid-spawn), paused pets (being
+        dragged or teleported) and pets in an interaction (CODING with the chat
+        open, going to a portal) are left alone, so their own callbacks stay
+        the only thing driving them. Only the pets idle mode put to sleep are
+        woken again.
+        """
+        if idle == self.idle:
+            return
+        self.idle = idle
+        for entry in self.pets:
+            behavior = entry["behavior"]
+            if idle:
+                if (not entry["label"].isVisible() or behavior.paused
+                        or behavior.get_state() in IDLE_EXEMPT_STATES):
+                    continue
+                entry["idle_asleep"] = True
+                self.resume_with_state(behavior, PetActions.SLEEPING)
+            elif entry.pop("idle_asleep", False):
+                # Woken only if nothing else took the pet over while it slept.
+                if behavior.get_state() == PetActions.SLEEPING and not behavior.paused:
+                    self.advance_state(behavior)
+
     def register_pet(self, pet_name, behavior, label):
         entry = {"petname": pet_name, "behavior": behavior, "label": label}
+        behavior.pet_name = pet_name
+        behavior.rng.seed(pet_seed(self.seed, pet_name))
         self.pets.append(entry)
         # start the behavior loop for this pet
         # schedule immediate start to allow UI to settle
@@ -51,46 +108,45 @@ class BehaviorManager:
         behavior = entry["behavior"]
         # perform initial action; callback advances the state
         behavior.perform_action(self.parent, lambda: self.advance_state(behavior))
+        self.prefetch_next(behavior)
 
     def perform_action(self, behavior, ID=None):
         """Call through to a behavior's perform_action, wiring callback to advance_state."""
         behavior.perform_action(self.parent, lambda: self.advance_state(behavior, ID), ID)
+        self.prefetch_next(behavior)
+
+    def next_state_probabilities(self, state):
+        """Return {next_state: probability} for the transition out of `state`."""
+        return {
+            state_from_name(name): probability
+            for name, probability in self.transitions.probabilities(state).items()
+        }
+
+    def prefetch_next(self, behavior):
+        """Warm the frame cache for the animations this pet will most likely play next."""
+        label = behavior.pet_label
+        size = (label.width(), label.height())
+        candidates = []
+        for state, probability in self.next_state_probabilities(behavior.get_state()).items():
+            for action in STATE_ANIMATIONS.get(state, ()):
+                path = load_pet_data(behavior.pet_kind, behavior.pet_color, action)
+                if path:
+                    candidates.append((behavior.resource_path(path), size, probability))
+        get_prefetcher().prefetch(candidates)
 
     def advance_state(self, behavior, ID=None):
-        """Transition logic extracted from the original main_window.check_switch_state.
+        """Draw the next state from the transition table and perform it.
 
-        This sets the next state on the behavior and triggers the behavior.perform_action
-        again so the loop continues.
+        States without outgoing transitions (e.g. REACHEDPORTAL) are kept,
+        and pets keep sleeping while the user is idle.
         """
-        current_state = behavior.get_state()
-        # replicates original probabilities and transitions
-        if current_state == PetActions.STARTDEFAULT:
-            behavior.set_state(PetActions.WALKING)
-        elif current_state == PetActions.WALKING:
-            threshold = self.config["behavior_probabilities"]["walking_to_sitting"]
-            if random.random() <= threshold:
-                behavior.set_state(PetActions.SITTING)
-            else:
-                behavior.set_state(PetActions.WALKING)
-        elif current_state == PetActions.SITTING:
-            prob_coding = self.config["behavior_probabilities"]["sitting_to_coding"]
-            prob_sleeping = self.config["behavior_probabilities"]["sitting_to_sleeping"]
-
-            rand = random.random()
-            if rand <= prob_coding:
-                behavior.set_state(PetActions.CODING)
-            elif rand <= prob_coding + prob_sleeping:
-                behavior.set_state(PetActions.SLEEPING)
-            else:
-                behavior.set_state(PetActions.WALKING)
-        elif current_state == PetActions.PLAYING:
-            behavior.set_state(PetActions.SITTING)
-        elif current_state == PetActions.SLEEPING:
-            behavior.set_state(PetActions.SITTING)
-        elif current_state == PetActions.CODING:
-            behavior.set_state(PetActions.SITTING)
-        elif current_state == PetActions.GOINGTOPORTAL:
-            behavior.set_state(PetActions.REACHEDPORTAL)
+        if self.idle and behavior.get_state() == PetActions.SLEEPING:
+            next_state = PetActions.SLEEPING.value
+        else:
+            next_state = self.transitions.sample(behavior.get_state(), behavior.rng)
+            trace_event(behavior.pet_name, "s", next_state)
+        if next_state is not None:
+            behavior.set_state(state_from_name(next_state))
 
         # Trigger the next action
         QTimer.singleShot(0, lambda: self.perform_action(behavior, ID))
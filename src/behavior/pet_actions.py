@@ -9,7 +9,11 @@ from PyQt5.QtCore import QPropertyAnimation
 import os
 import subprocess
 import time
-from pet_data_loader import load_pet_data
+from src.pet_data_loader import load_pet_data
+from .transitions import get_transition_table, state_name
+from .trace import trace_event
+from src.utils.lifecycle import get_lifecycle_registry
+from src.utils.profiler import get_action_profiler
 
 
 class PetActions(Enum):
@@ -23,6 +27,25 @@ class PetActions(Enum):
     REACHEDPORTAL = "reachedportal"
 
 
+# Animations each state plays, used to prefetch frames before a transition.
+# Walking lists both directions because the target decides which one plays.
+STATE_ANIMATIONS = {
+    PetActions.WALKING: ("walk_right", "walk_left"),
+    PetActions.SITTING: ("sit",),
+    PetActions.SLEEPING: ("sleep",),
+    PetActions.CODING: ("code",),
+    PetActions.PLAYING: ("touch_belly",),
+    PetActions.GOINGTOPORTAL: ("start_move_portal", "end_move_portal"),
+}
+
+
+def state_from_name(name):
+    """Return the PetActions member for `name`, or the name itself for config-defined states."""
+    try:
+        return PetActions(name)
+    except ValueError:
+        return name
+
 
 class PetBehavior(QObject):
     def __init__(self, pet_label, pet_kind, pet_color, resource_path):
@@ -39,7 +62,13 @@ class PetBehavior(QObject):
         self.animation = None
         self.current_state = PetActions.STARTDEFAULT
         self.lock_flag=False
-        self.active_timers = []
+        # Set by BehaviorManager.register_pet; the RNG is reseeded per pet there
+        self.pet_name = None
+        self.rng = random.Random()
+        # True between pause() and the next resume/perform_action
+        self.paused = False
+        # Owns every timer, animation and movie the current state starts
+        self.enter_scope()
 
     def set_state(self, new_state):
         self.current_state = new_state
@@ -47,17 +76,18 @@ class PetBehavior(QObject):
     def get_state(self):
         return self.current_state
 
+    def enter_scope(self, state=None):
+        """Close the previous state's lifecycle scope and start one for `state`."""
+        self.scope = get_lifecycle_registry().begin(
+            self, state_name(state or self.current_state),
+            label=f"{self.pet_kind}/{self.pet_color}@{id(self):x}")
+        return self.scope
+
     def stop_all_timers(self):
-        for t in self.active_timers:
-            try:
-                t.stop()
-            except Exception:
-                pass
-        self.active_timers.clear()
-        if self.animation and self.animation.state() == QPropertyAnimation.Running:
-            self.animation.stop()
+        self.scope.close()
 
     def pause(self):
+        self.paused = True
         self.stop_all_timers()
 
     def resume(self, parent, callback):
@@ -67,23 +97,24 @@ class PetBehavior(QObject):
     def perform_action(self, parent, callback,ID=None):
         """Perform an action based on the current state."""
         print(f"[Action] {self.current_state} ID={ID}")
-        if self.current_state == PetActions.STARTDEFAULT:
-            self.pet_startdefault(parent, callback)
-        elif self.current_state == PetActions.WALKING:
-            self.pet_random_walk(parent, callback)
-        elif self.current_state == PetActions.SITTING:
-            self.pet_sit(parent, callback)
-        elif self.current_state == PetActions.PLAYING:
-            self.pet_play(parent, callback)
-        elif self.current_state == PetActions.SLEEPING:
-            self.pet_sleep(parent, callback)
-        elif self.current_state == PetActions.CODING:
-            self.pet_code(parent, callback)
-        elif self.current_state == PetActions.GOINGTOPORTAL:
-            self.pet_move_to_portal(parent, callback)
-        elif self.current_state == PetActions.REACHEDPORTAL:
-            # Old networking code disabled - REACHEDPORTAL state unused
-            pass
+        self.paused = False
+        get_action_profiler().on_perform(self)
+        trace_event(self.pet_name, "a", self.current_state)
+        self.enter_scope()
+        action = get_transition_table().action(self.current_state)
+        if action is None:
+            return
+        handler = getattr(self, action, None)
+        if handler is None:
+            print(f"[Action] Unknown action '{action}' for state {self.current_state}")
+            return
+        handler(parent, callback)
+
+    def state_duration(self, default):
+        """Milliseconds to stay in the current state, from `state_durations` or `default`."""
+        duration = get_transition_table().duration(self.current_state, default, self.rng)
+        trace_event(self.pet_name, "d", self.current_state, duration)
+        return duration
 
     def calculate_label_size(self, parent):
         """
@@ -121,6 +152,15 @@ class PetBehavior(QObject):
             base_height = int(base_width * 2 / 3)  # Height is 2/3 of width
             self.pet_label.resize(base_width, base_height)
 
+    def play_animation(self, action, loop=True):
+        """Play this pet's `action` animation on its label from the frame cache."""
+        path = load_pet_data(self.pet_kind, self.pet_color, action)
+        if not path:
+            return None
+        player = self.pet_label.set_movie(self.resource_path(path), loop=loop,
+                                          state=state_name(self.current_state))
+        return self.scope.add(player, "movies")
+
     def pet_sit(self, parent, callback):
         # Delegates to extracted action implementation
         from .actions import pet_sit as _pet_sit
@@ -151,6 +191,13 @@ class PetBehavior(QObject):
         return _pet_sleep(self, parent, callback)
 
     def pet_move_to_portal(self, parent, callback):
+        # Called directly by the teleport code, outside perform_action. The
+        # state is kept so recall resumes it, but replay must see the portal
+        # action like any other.
+        if self.current_state != PetActions.GOINGTOPORTAL:
+            trace_event(self.pet_name, "a", PetActions.GOINGTOPORTAL)
+        get_action_profiler().on_perform(self)
+        self.enter_scope(PetActions.GOINGTOPORTAL)
         from .actions import pet_move_to_portal as _pet_move_to_portal
         return _pet_move_to_portal(self, parent, callback)
 
@@ -0,0 +1,176 @@
+"""Headless behavior simulator driven by a virtual clock.
+
+Usage (from src/, like main_window.py):
+
+    python -m behavior.simulate [--pets 10000] [--steps 200] [--set walking_to_sitting=0.4] [--json]
+
+Runs the compiled transition table BehaviorManager uses for many simulated
+pets at once. No widgets, timers or event loop are involved: each pet's
+clock jumps straight to the end of its current state, and all pets advance
+one transition per vectorised NumPy step, so millions of transitions run in
+about a second. Reports time-in-state shares, visits, mean dwell times and
+transition counts, which makes it cheap to tune `behavior_probabilities`.
+
+State durations come from `state_durations` when configured and otherwise
+approximate the action implementations (SIM_DURATIONS). Interactive
+detours such as hover-to-play are not modelled.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from .config import load_behavior_config
+from .transitions import compile_transitions
+
+# (min, max) ms per state when `state_durations` does not set one, mirroring the actions.
+SIM_DURATIONS = {
+    "startdefault": (500, 500),
+    "walking": (1000, 13000),    # distance / speed across a typical screen
+    "sitting": (6000, 6000),     # fallback timer when nobody hovers
+    "sleeping": (20000, 26540),  # max(20 s, hour * 1 s + minute * 60 ms)
+    "coding": (6000, 6000),      # dialog delay plus the follow-up timer
+    "playing": (2000, 2000),     # absence timeout
+}
+DEFAULT_SIM_DURATION = (1000, 1000)
+START_STATE = "startdefault"
+
+
+def _compile_arrays(table):
+    """Flatten the table into padded NumPy arrays indexed by state number."""
+    names = table.states()
+    index = {name: i for i, name in enumerate(names)}
+    rows = {name: table.row(name) for name in names}
+    width = max([len(row[0]) for row in rows.values() if row] + [1])
+
+    count = np.zeros(len(names), dtype=np.int64)
+    threshold = np.ones((len(names), width))
+    alias = np.zeros((len(names), width), dtype=np.int64)
+    target = np.zeros((len(names), width), dtype=np.int64)
+    low = np.zeros(len(names))
+    high = np.zeros(len(names))
+    for name, i in index.items():
+        row = rows[name]
+        if row:
+            states, thresholds, aliases = row
+            count[i] = len(states)
+            threshold[i, :len(states)] = thresholds
+            alias[i, :len(states)] = aliases
+            target[i, :len(states)] = [index[s] for s in states]
+        bounds = table.duration_bounds(name) or SIM_DURATIONS.get(name, DEFAULT_SIM_DURATION)
+        low[i], high[i] = bounds
+    return names, count, threshold, alias, target, low, high
+
+
+def simulate(config, pets=10000, steps=200, seed=None, table=None):
+    """Run `pets` independent pets for up to `steps` transitions each.
+
+    `table` defaults to the one compiled from `config`; the running app's
+    table is never touched. Pets that reach a state with no outgoing
+    transitions stop there. Returns a JSON-serialisable report dict.
+    """
+    if table is None:
+        table = compile_transitions(config)
+    names, count, threshold, alias, target, low, high = _compile_arrays(table)
+    rng = np.random.default_rng(seed)
+    n = len(names)
+
+    state = np.full(pets, names.index(START_STATE), dtype=np.int64)
+    alive = np.ones(pets, dtype=bool)
+    clock = np.zeros(pets)  # virtual ms per pet
+    time_in_state = np.zeros(n)
+    visits = np.zeros(n, dtype=np.int64)
+    transitions = np.zeros((n, n), dtype=np.int64)
+    pets_index = np.arange(pets)
+
+    started = time.perf_counter()
+    for _ in range(steps):
+        live = pets_index[alive]
+        if live.size == 0:
+            break
+        current = state[live]
+        dwell = low[current] + (high[current] - low[current]) * rng.random(live.size)
+        clock[live] += dwell
+        np.add.at(time_in_state, current, dwell)
+        np.add.at(visits, current, 1)
+
+        moving = count[current] > 0
+        alive[live[~moving]] = False
+        live, current = live[moving], current[moving]
+        u = rng.random(live.size) * count[current]
+        column = u.astype(np.int64)
+        pick = np.where(u - column < threshold[current, column], column, alias[current, column])
+        nxt = target[current, pick]
+        np.add.at(transitions, (current, nxt), 1)
+        state[live] = nxt
+    wall = time.perf_counter() - started
+
+    total_time = time_in_state.sum() or 1.0
+    total_transitions = int(transitions.sum())
+    return {
+        "pets": pets,
+        "steps": steps,
+        "seed": seed,
+        "transitions_total": total_transitions,
+        "wall_seconds": round(wall, 4),
+        "transitions_per_second": round(total_transitions / wall) if wall > 0 else None,
+        "virtual_hours": round(float(clock.sum()) / 3600000.0, 2),
+        "states": {
+            name: {
+                "time_share": round(float(time_in_state[i] / total_time), 6),
+                "visits": int(visits[i]),
+                "mean_dwell_ms": round(float(time_in_state[i] / visits[i]), 1) if visits[i] else None,
+            }
+            for i, name in enumerate(names) if visits[i]
+        },
+        "transitions": {
+            names[i]: {names[j]: int(transitions[i, j]) for j in range(n) if transitions[i, j]}
+            for i in range(n) if transitions[i].any()
+        },
+    }
+
+
+def _print_report(report, out=sys.stdout):
+    print(f"{report['transitions_total']:,} transitions in {report['wall_seconds']} s "
+          f"({report['transitions_per_second']:,}/s), {report['virtual_hours']:,} virtual pet-hours",
+          file=out)
+    print(f"{'state':<16}{'time':>8}{'visits':>14}{'mean dwell':>14}", file=out)
+    for name, stats in sorted(report["states"].items(), key=lambda item: -item[1]["time_share"]):
+        print(f"{name:<16}{stats['time_share'] * 100:>7.2f}%{stats['visits']:>14,}"
+              f"{stats['mean_dwell_ms'] / 1000:>13.1f}s", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate pet behavior on a virtual clock")
+    parser.add_argument("--config", help="behavior_config.json to use (default: the app's)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a behavior_probabilities entry, e.g. walking_to_sitting=0.4")
+    parser.add_argument("--pets", type=int, default=10000, help="Pets simulated in parallel")
+    parser.add_argument("--steps", type=int, default=200, help="Transitions per pet")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        config = load_behavior_config()
+    config = dict(config)
+    config["behavior_probabilities"] = dict(config["behavior_probabilities"])
+    for override in args.set:
+        key, _, value = override.partition("=")
+        config["behavior_probabilities"][key.strip()] = float(value)
+
+    report = simulate(config, args.pets, args.steps, args.seed)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
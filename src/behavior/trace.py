@@ -0,0 +1,237 @@
+"""Per-pet seeded randomness and behavior trace record/replay.
+
+Every pet draws transitions, walk targets and state durations from its own
+`random.Random`, seeded from `behavior_seed` (a fresh seed per run when
+unset) and the pet's name, so a run is reproducible from its seed alone.
+
+With `behavior_trace_path` set (or VCAT_BEHAVIOR_TRACE in the environment)
+the manager records a compact trace, one JSON array per line:
+
+    {"trace": 1, "seed": 42, "config": {...transition sections...}}
+    [t_ms, pet, "a", state]                       action performed
+    [t_ms, pet, "s", state]                       state sampled by advance_state
+    [t_ms, pet, "d", state, ms]                   state duration drawn
+    [t_ms, pet, "w", x, y, duration, max_x, max_y]  walk target
+
+Usage (from src/, like main_window.py):
+
+    python -m behavior.trace TRACE [--verify] [--json]
+
+re-drives the trace headless on its recorded timeline, reports time in
+state per pet and, with --verify, re-draws every sampled value from the
+recorded seed and checks that it matches.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+from .transitions import compile_transitions, state_name
+
+TRACE_VERSION = 1
+START_STATE = "startdefault"
+
+
+def pet_seed(seed, pet):
+    """Stable per-pet seed derived from the run seed and the pet's name."""
+    return zlib.crc32(f"{seed}:{pet}".encode("utf-8"))
+
+
+def new_run_seed():
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def transition_sections(config):
+    return {
+        "behavior_probabilities": config["behavior_probabilities"],
+        "transitions": config.get("transitions", {}),
+        "state_durations": config.get("state_durations", {}),
+        "state_actions": config.get("state_actions", {}),
+    }
+
+
+class TraceRecorder:
+    """Appends behavior events to a trace file as they happen."""
+
+    def __init__(self, path, seed, config):
+        self.path = path
+        self._origin = time.monotonic()
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+        self._write({"trace": TRACE_VERSION, "seed": seed, "config": transition_sections(config)})
+        print(f"[Trace] Recording behavior trace to {path} (seed {seed})")
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def event(self, pet, kind, *values):
+        t = int((time.monotonic() - self._origin) * 1000)
+        self._write([t, pet, kind, *values])
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+_recorder = None
+
+
+def start_trace(path, seed, config):
+    """Start recording to `path`, replacing any running recorder."""
+    global _recorder
+    stop_trace()
+    _recorder = TraceRecorder(path, seed, config)
+    return _recorder
+
+
+def stop_trace():
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def trace_event(pet, kind, *values):
+    """Record an event if a trace is being recorded (a no-op otherwise)."""
+    if _recorder is not None:
+        _recorder.event(pet, kind, *(state_name(v) for v in values))
+
+
+def trace_path_from_config(config):
+    return os.environ.get("VCAT_BEHAVIOR_TRACE") or config.get("behavior_trace_path")
+
+
+def load_trace(path):
+    """Return (header, events) of the trace at `path`."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("trace") != TRACE_VERSION:
+            raise ValueError(f"{path}: unsupported trace version {header.get('trace')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
+
+
+class TraceReplayer:
+    """Re-drives a recorded trace without widgets, timers or an event loop."""
+
+    def __init__(self, path, table=None):
+        self.header, self.events = load_trace(path)
+        self.seed = self.header["seed"]
+        # The recorded config's table by default, never the running app's.
+        self.table = table or compile_transitions(self.header["config"])
+
+    def pets(self):
+        return sorted({event[1] for event in self.events})
+
+    def drive(self, on_event, speed=None):
+        """Call `on_event(t_ms, pet, kind, values)` for every event in order.
+
+        With `speed` the events are paced in real time (2.0 = twice as fast);
+        by default they run back to back on the recorded virtual timeline.
+        """
+        started = time.monotonic()
+        for t, pet, kind, *values in self.events:
+            if speed:
+                delay = t / 1000.0 / speed - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            on_event(t, pet, kind, values)
+
+    def states(self):
+        """{pet: [state, ...]} in the order each pet performed them."""
+        result = {}
+        for _, pet, kind, *values in self.events:
+            if kind == "a":
+                result.setdefault(pet, []).append(values[0])
+        return result
+
+    def time_in_state(self):
+        """{pet: {state: ms}} from the recorded action timeline."""
+        result = {}
+        current = {}
+        end = self.events[-1][0] if self.events else 0
+
+        def on_event(t, pet, kind, values):
+            if kind != "a":
+                return
+            previous = current.get(pet)
+            if previous is not None:
+                states = result.setdefault(pet, {})
+                states[previous[0]] = states.get(previous[0], 0) + t - previous[1]
+            current[pet] = (values[0], t)
+
+        self.drive(on_event)
+        for pet, (state, since) in current.items():
+            states = result.setdefault(pet, {})
+            states[state] = states.get(state, 0) + end - since
+        return result
+
+    def verify(self):
+        """Re-draw every sampled value from the seed; return a list of mismatches."""
+        rngs = {}
+        states = {}
+        mismatches = []
+
+        def on_event(t, pet, kind, values):
+            rng = rngs.setdefault(pet, random.Random(pet_seed(self.seed, pet)))
+            if kind == "a":
+                states[pet] = values[0]
+                return
+            if kind == "s":
+                expected = self.table.sample(states.get(pet, START_STATE), rng)
+                actual = values[0]
+            elif kind == "d":
+                expected = self.table.duration(values[0], values[1], rng)
+                actual = values[1]
+            elif kind == "w":
+                x, y, _, max_x, max_y = values
+                expected = [rng.randint(0, max_x), rng.randint(0, max_y)]
+                actual = [x, y]
+            else:
+                return
+            if expected != actual:
+                mismatches.append({"t_ms": t, "pet": pet, "kind": kind,
+                                   "expected": expected, "recorded": actual})
+
+        self.drive(on_event)
+        return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded behavior trace headless")
+    parser.add_argument("trace", help="Trace file written with behavior_trace_path")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check that the seed reproduces every sampled value")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    replayer = TraceReplayer(args.trace)
+    report = {
+        "seed": replayer.seed,
+        "events": len(replayer.events),
+        "time_in_state_ms": replayer.time_in_state(),
+    }
+    if args.verify:
+        report["mismatches"] = replayer.verify()
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+    print(f"{report['events']:,} events, seed {report['seed']}")
+    for pet, states in sorted(report["time_in_state_ms"].items()):
+        total = sum(states.values()) or 1
+        shares = ", ".join(f"{state} {ms / total * 100:.1f}%"
+                           for state, ms in sorted(states.items(), key=lambda item: -item[1]))
+        print(f"{pet}: {total / 1000:.1f} s ({shares})")
+    if args.verify:
+        mismatches = report["mismatches"]
+        print("Replay matches the recording" if not mismatches
+              else f"{len(mismatches)} mismatches, first: {mismatches[0]}")
+        sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
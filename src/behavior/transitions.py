@@ -0,0 +1,200 @@
+"""Declarative state-transition tables compiled for O(1) sampling.
+
+The transition matrix lives in behavior_config.json:
+
+    "transitions": {
+        "walking": {"sitting": 0.5, "walking": 0.5},
+        "napping": {"sitting": 1}
+    },
+    "state_durations": {"napping": [20000, 40000], "startdefault": 500},
+    "state_actions": {"napping": "pet_sleep"}
+
+Rows not listed fall back to the classic transitions derived from
+`behavior_probabilities`, so existing configs keep working. `state_actions`
+maps a state to the PetBehavior method that performs it, which lets new
+states reuse existing actions without code changes. Durations are either
+milliseconds or a [min, max] range.
+
+Each row is compiled into a Walker alias table, so drawing the next state
+costs one random number and one comparison regardless of row size. Tables
+are pure data and shared by every pet using the same config. Compiling has
+no side effects; the BehaviorManager installs the table the running pets
+use with `set_transition_table`, so simulations and replays can compile
+their own without touching it.
+"""
+import json
+import random
+
+# State name -> PetBehavior method performing it
+DEFAULT_STATE_ACTIONS = {
+    "startdefault": "pet_startdefault",
+    "walking": "pet_random_walk",
+    "sitting": "pet_sit",
+    "playing": "pet_play",
+    "sleeping": "pet_sleep",
+    "coding": "pet_code",
+    "goingtoportal": "pet_move_to_portal",
+    "reachedportal": None,  # Old networking code disabled - state unused
+}
+
+
+def state_name(state):
+    """Return the config name of a state given as a PetActions member or a string."""
+    return getattr(state, "value", state)
+
+
+def default_transitions(probabilities):
+    """Build the original hand-written transition rows from `behavior_probabilities`."""
+    to_sitting = probabilities["walking_to_sitting"]
+    to_coding = probabilities["sitting_to_coding"]
+    to_sleeping = probabilities["sitting_to_sleeping"]
+    return {
+        "startdefault": {"walking": 1.0},
+        "walking": {"sitting": to_sitting, "walking": 1.0 - to_sitting},
+        # Sequential like the original if/elif: coding first, then sleeping
+        # takes what is left of its share, walking the remainder.
+        "sitting": {
+            "coding": to_coding,
+            "sleeping": max(0.0, min(to_sleeping, 1.0 - to_coding)),
+            "walking": max(0.0, 1.0 - to_coding - to_sleeping),
+        },
+        "playing": {"sitting": 1.0},
+        "sleeping": {"sitting": 1.0},
+        "coding": {"sitting": 1.0},
+        "goingtoportal": {"reachedportal": 1.0},
+    }
+
+
+def _duration_bounds(value):
+    """Normalize a duration (ms, [ms] or [min, max]) to a (min, max) tuple."""
+    if isinstance(value, (list, tuple)):
+        return (value[0], value[-1]) if value else (0, 0)
+    return value, value
+
+
+class _AliasRow:
+    """Walker alias table over one row of outgoing weights."""
+
+    __slots__ = ("states", "probabilities", "threshold", "alias")
+
+    def __init__(self, weights):
+        states = [state for state, weight in weights.items() if weight > 0]
+        total = float(sum(weights[state] for state in states))
+        self.states = states
+        self.probabilities = {state: weights[state] / total for state in states}
+
+        count = len(states)
+        scaled = [self.probabilities[state] * count for state in states]
+        self.threshold = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            self.threshold[lo] = scaled[lo]
+            self.alias[lo] = hi
+            scaled[hi] -= 1.0 - scaled[lo]
+            (small if scaled[hi] < 1.0 else large).append(hi)
+
+    def sample(self, rng):
+        u = rng.random() * len(self.states)
+        column = int(u)
+        if u - column < self.threshold[column]:
+            return self.states[column]
+        return self.states[self.alias[column]]
+
+
+class TransitionTable:
+    """Compiled transition rows, per-state durations and the action dispatch table."""
+
+    def __init__(self, transitions, durations=None, actions=None):
+        self._rows = {}
+        for state, weights in transitions.items():
+            if weights and sum(w for w in weights.values() if w > 0) > 0:
+                self._rows[state] = _AliasRow(weights)
+        self._durations = {state: _duration_bounds(value) for state, value in (durations or {}).items()}
+        self._actions = dict(DEFAULT_STATE_ACTIONS)
+        self._actions.update(actions or {})
+
+    def states(self):
+        """Every state that has outgoing transitions or a registered action."""
+        names = set(self._rows) | set(self._actions)
+        for row in self._rows.values():
+            names.update(row.states)
+        return sorted(names)
+
+    def sample(self, state, rng=random):
+        """Draw the state after `state`, or None if it has no outgoing transitions."""
+        row = self._rows.get(state_name(state))
+        if row is None:
+            return None
+        return row.sample(rng)
+
+    def row(self, state):
+        """Return (next_states, thresholds, aliases) for `state`, or None if it is absorbing."""
+        row = self._rows.get(state_name(state))
+        if row is None:
+            return None
+        return list(row.states), list(row.threshold), list(row.alias)
+
+    def duration_bounds(self, state):
+        """Return the configured (min, max) duration of `state` in ms, or None."""
+        bounds = self._durations.get(state_name(state))
+        if bounds is None:
+            return None
+        return float(bounds[0]), float(bounds[1])
+
+    def probabilities(self, state):
+        """Return {next_state_name: probability} for the row of `state`."""
+        row = self._rows.get(state_name(state))
+        return dict(row.probabilities) if row else {}
+
+    def duration(self, state, default=None, rng=random):
+        """Milliseconds to stay in `state`, or `default` when not configured."""
+        bounds = self._durations.get(state_name(state))
+        if bounds is None:
+            return default
+        if bounds[0] == bounds[1]:
+            return int(bounds[0])
+        return int(rng.uniform(bounds[0], bounds[1]))
+
+    def action(self, state):
+        """Name of the PetBehavior method that performs `state`, or None."""
+        return self._actions.get(state_name(state))
+
+
+_compiled = {}  # config fingerprint -> TransitionTable
+_active = None
+
+
+def compile_transitions(config):
+    """Compile the transition sections of `config`, reusing an identical table."""
+    sections = {
+        "behavior_probabilities": config["behavior_probabilities"],
+        "transitions": config.get("transitions", {}),
+        "state_durations": config.get("state_durations", {}),
+        "state_actions": config.get("state_actions", {}),
+    }
+    fingerprint = json.dumps(sections, sort_keys=True)
+    table = _compiled.get(fingerprint)
+    if table is None:
+        rows = default_transitions(sections["behavior_probabilities"])
+        rows.update(sections["transitions"])
+        table = TransitionTable(rows, sections["state_durations"], sections["state_actions"])
+        _compiled[fingerprint] = table
+    return table
+
+
+def get_transition_table():
+    """Return the table the running pets use (the defaults until one is set)."""
+    global _active
+    if _active is None:
+        from .config import DEFAULT_CONFIG
+        _active = compile_transitions(DEFAULT_CONFIG)
+    return _active
+
+
+def set_transition_table(table):
+    global _active
+    _active = table
@@ -20,10 +20,15 @@ from PyQt5.QtGui import QCursor
 from behavior.pet_actions import PetActions
 from behavior import LegacyBehaviorAdapter
 from src.ui.pet_widget import PetWidget
+from src.ui.compositor import PetSurface, set_pet_surface
+from src.ui.damage import WindowDamage, set_window_damage
 from behavior import BehaviorManager
-from src.pet_data_loader import load_pet_data, get_current_pet  # keep data loader for resources
+from src.pet_data_loader import load_pet_data, get_current_pet, update_current_pet  # keep data loader for resources
 from src.toolbar_pet import MacOSToolbarIcon
 from src.teleport.teleport_cat import TeleportManager
+from src.assets import FrameStore, get_frame_cache, get_frame_governor, set_lod_enabled
+from src.utils.cursor_service import get_cursor_service
+from src.utils.idle_monitor import get_idle_monitor
 
 
 def resource_path(relative_path):
@@ -46,6 +51,28 @@ class PetApp(QMainWindow):
         # Pet size ratio - load from config or use default
         self.load_pet_size_from_config()
 
+        # Per-state FPS caps and low-power mode for every pet animation
+        get_frame_governor().configure(self.behavior_manager.config)
+        # Fewer frames and an 8-bit palette for small pets
+        set_lod_enabled(self.behavior_manager.config.get("animation_lod", True))
+
+        # Optional mmap-backed frame store shared by every pet of the same skin
+        if self.behavior_manager.config.get("frame_store_enabled", False):
+            get_frame_cache().set_frame_store(FrameStore())
+            print("[VCat] Shared frame store enabled")
+
+        # Window mask and dirty rects follow the pet, name tag and portal bounds
+        self.window_damage = WindowDamage(self, mask=self.behavior_manager.config.get("window_mask", False))
+        set_window_damage(self.window_damage)
+
+        # Compositor mode: one surface paints every pet, name tag and portal
+        if self.behavior_manager.config.get("compositor_mode", False):
+            self.pet_surface = PetSurface(self)
+            self.setCentralWidget(self.pet_surface)
+            set_pet_surface(self.pet_surface)
+            self.window_damage.surface = self.pet_surface
+            print("[VCat] Compositor mode enabled")
+
         self.pet_kind, self.pet_color = get_current_pet()
         self.pet_behavior, self.pet_label = self.add_pet("超级大恐龙", self.pet_kind, self.pet_color)
         self.pet_label.setAttribute(Qt.WA_TransparentForMouseEvents, True)
@@ -80,6 +107,23 @@ class PetApp(QMainWindow):
         self.resize(screen_width, screen_height)
         self.move(screen_geometry.topLeft())
 
+        # Idle mode: sleep, freeze and poll less while nobody uses the machine
+        get_idle_monitor().idle_changed.connect(self.on_idle_changed)
+        get_idle_monitor().configure(self.behavior_manager.config)
+
+    def on_idle_changed(self, idle):
+        """Enter or leave idle mode for the pets, the cursor sampler and the chat dialog."""
+        scale = self.behavior_manager.config.get("idle_poll_scale", 5) if idle else 1
+        get_cursor_service().set_interval_scale(scale)
+        if self.chat_dialog:
+            self.chat_dialog.suspend_position_tracking(idle)
+        if idle:
+            self.behavior_manager.set_idle(True)
+            get_frame_governor().set_frozen(True)
+        else:
+            get_frame_governor().set_frozen(False)
+            self.behavior_manager.set_idle(False)
+
     def mousePressEvent(self, event):
         """Handle mouse press - delegate to drag handler."""
         if self.drag_handler.handle_press(event):
@@ -297,28 +341,18 @@ class PetApp(QMainWindow):
         self.pet_behavior.pet_kind = new_kind
         self.pet_behavior.pet_color = new_color
         
-        # Save to current_pet.json
-        current_pet_path = os.path.join(os.path.dirname(__file__), "current_pet.json")
-        with open(current_pet_path, 'w') as f:
-            json.dump({
-                "Current_Pet_Kind": new_kind,
-                "Current_Pet_Color": new_color
-            }, f, indent=2)
+        # Save to current_pet.json and refresh the in-memory asset registry
+        update_current_pet(new_kind, new_color)
         
         # Get current state and reload the GIF for that state
         current_state = self.pet_behavior.get_state()
         if current_state:
             # Load the appropriate GIF for the new pet with current state
-            state_name = current_state.value  # Get the enum value name
-            gif_path = load_pet_data(new_kind, new_color, state_name)
+            gif_path = load_pet_data(new_kind, new_color, getattr(current_state, "value", current_state))
             
             if gif_path:
                 # Update the pet label with new GIF
-                pet_movie = QMovie(gif_path)
-                self.pet_label.setMovie(pet_movie)
-                self.pet_label.setScaledContents(True)
-                pet_movie.start()
-                pet_movie.finished.connect(pet_movie.start)  # Loop the animation
+                self.pet_label.set_movie(resource_path(gif_path))
             
             # Resume behavior from current state
             self.pet_behavior.resume(self, lambda: self.check_switch_state(self.pet_behavior))
@@ -432,11 +466,8 @@ class PetApp(QMainWindow):
             self.voice_wake_recognizer.stop()
             self.voice_wake_recognizer = None
         
-        # Disconnect from room if connected
-        if self.teleport_manager.room_thread and self.teleport_manager.room_thread.is_alive():
-            print("[TELEPORT] Cleaning up room connection...")
-            self.teleport_manager.room_stop_event.set()
-            self.teleport_manager.room_thread.join(timeout=3)
+        # Disconnect from room if connected and stop portal animations
+        self.teleport_manager.shutdown()
         
         # Call parent close handler
         super().closeEvent(event)
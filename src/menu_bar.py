@@ -1,13 +1,14 @@
 """Menu UI module - VCat menu bar and dialogs."""
 
-from PyQt5.QtGui import QMovie, QPixmap
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QAction, QMenu, QDialog, QVBoxLayout, QLineEdit, QLabel, QPushButton, QMessageBox,
     QScrollArea, QWidget, QGridLayout, QHBoxLayout, QTabWidget, QFrame
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
 
-from pet_data_loader import get_all_pet_kinds_and_colors, load_pet_data
+from src.pet_data_loader import get_all_pet_kinds_and_colors, load_pet_data
+from src.ui.pet_thumbnail import PetThumbnail
 
 
 
@@ -164,7 +165,7 @@ class PetSettingDialog(QDialog):
         super().__init__()
         self.setWindowTitle("Pet Settings")
         self.parent_app = parent_app
-        self.active_movies = []  # Track all active QMovie objects
+        self.thumbnails = []  # Only the ones scrolled into view are animated
 
         # Dialog layout
         layout = QVBoxLayout(self)
@@ -213,20 +214,9 @@ class PetSettingDialog(QDialog):
                                 """)
                 button_layout.addWidget(button)
 
-                # Add a QLabel to display the image inside the button
-                gif_label = QLabel(button)
-                gif_label.setFixedSize(button_width, button_width)  # Same size as button
-                gif_label.setAlignment(Qt.AlignCenter)
-                gif_label.setStyleSheet("background: transparent;")
-
-                # Load and play the GIF
-                movie = QMovie(gif_path)
-                movie.setScaledSize(QSize(button_width, button_width))  # Resize the GIF to match the button size
-                gif_label.setMovie(movie)
-                movie.start()  # Start the GIF playback
-
-                # Keep track of the active movies for cleanup later
-                self.active_movies.append(movie)
+                # Button-sized thumbnail: cached static frame, animated only when visible
+                thumbnail = PetThumbnail(gif_path, button_width, button)
+                self.thumbnails.append(thumbnail)
 
                 # Connect the button to save_settings (unlock functionality commented out)
                 button.clicked.connect(
@@ -238,21 +228,36 @@ class PetSettingDialog(QDialog):
 
         scroll_area.setWidget(scroll_content)
         layout.addWidget(scroll_area)
+        scroll_area.verticalScrollBar().valueChanged.connect(self.update_visible_thumbnails)
+        scroll_area.horizontalScrollBar().valueChanged.connect(self.update_visible_thumbnails)
 
         # Close button
         close_button = QPushButton("Close", self)
         close_button.clicked.connect(self.handle_close)
         layout.addWidget(close_button)
 
+    def update_visible_thumbnails(self):
+        """Animate thumbnails inside the scroll viewport and freeze the rest."""
+        for thumbnail in self.thumbnails:
+            thumbnail.set_animating(not thumbnail.visibleRegion().isEmpty())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Wait for the first layout pass so visibleRegion() is meaningful
+        QTimer.singleShot(0, self.update_visible_thumbnails)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_visible_thumbnails()
+
     def handle_close(self):
         """Ensure the dialog is properly closed."""
         self.close()
 
     def closeEvent(self, event):
-        """Stop all active movies when the dialog is closed."""
-        for movie in self.active_movies:
-            movie.stop()
-        self.active_movies.clear()
+        """Stop all thumbnail animations when the dialog is closed."""
+        for thumbnail in self.thumbnails:
+            thumbnail.set_animating(False)
         super().closeEvent(event)
 
     def save_settings(self, kind, color):
@@ -1,59 +1,267 @@
 import json
+import os
+import threading
+import time
 
-def get_current_pet():
-    """
-    Load the JSON file and return the current pet kind and color.
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PETS_INFO_PATH = os.path.join(_SRC_DIR, "pets_info.json")
+CURRENT_PET_PATH = os.path.join(_SRC_DIR, "current_pet.json")
+ATLAS_MANIFEST_PATH = os.path.join(_SRC_DIR, "pets_atlas.json")
+_UNLOADED = object()  # mtime before the first load or after invalidate()
+
+
+class PetAssetRegistry:
+    """In-memory index of the pet manifest and the current pet selection.
+
+    `pets_info.json` is parsed once into a flat dict keyed by
+    (kind, color, action) and `current_pet.json` is held in memory, so the
+    behavior actions and the toolbar tick no longer hit the disk. Both files
+    are re-read when their mtime changes (checked at most every
+    `check_interval` seconds) or when `update_pet` / `invalidate` is called.
+    A missing or broken file is not re-read until its mtime changes, and
+    each error is printed once rather than on every check.
+
+    If `python -m src.assets.compile_atlas` has been run, `pets_atlas.json`
+    is indexed too and `compiled_animation` maps a GIF path to its sprite atlas.
+    Whether a source GIF changed since it was compiled is checked on the
+    same schedule, at most once per `check_interval` for each GIF.
+
+    Import this module as `src.pet_data_loader` only; a second import
+    identity would be a second module with its own registry.
     """
-    try:
-        with open("src/current_pet.json", "r") as file:
-            data = json.load(file)
+
+    def __init__(self, manifest_path=PETS_INFO_PATH, current_pet_path=CURRENT_PET_PATH,
+                 check_interval=1.0, atlas_manifest_path=ATLAS_MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self.current_pet_path = current_pet_path
+        self.atlas_manifest_path = atlas_manifest_path
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._paths = {}         # (kind, color, action) -> "src/..." path
+        self._lock_flags = {}    # kind -> {color: lock_flag}
+        self._manifest_mtime = _UNLOADED
+        self._current = (None, None)
+        self._current_mtime = _UNLOADED
+        self._compiled = {}      # real path of source GIF -> atlas entry
+        self._atlas_mtime = _UNLOADED
+        self._source_current = {}  # atlas key -> GIF unchanged since compiling, this check
+        self._next_check = 0.0
+        self._errors = {}        # file path -> last error printed for it
+
+    # Loading -----------------------------------------------------------
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _report(self, path, error):
+        """Print `error` for `path` unless it was the last one printed; None clears it."""
+        if error != self._errors.get(path):
+            self._errors[path] = error
+            if error:
+                print(error)
+
+    def _load_manifest(self, mtime):
+        self._paths = {}
+        self._lock_flags = {}
+        self._manifest_mtime = mtime
+        try:
+            with open(self.manifest_path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            self._report(self.manifest_path, "Error: pets_info.json file not found.")
+            return
+        except json.JSONDecodeError as e:
+            self._report(self.manifest_path, f"Error decoding JSON: {e}")
+            return
+        self._report(self.manifest_path, None)
+
+        for pet_kind, colors in data.items():
+            self._lock_flags[pet_kind] = {}
+            for color, color_data in colors.items():
+                self._lock_flags[pet_kind][color] = color_data.get("lock_flag", None)
+                for action, rel_path in color_data.items():
+                    if isinstance(rel_path, str):
+                        self._paths[(pet_kind, color, action)] = "src/" + rel_path
+
+    def _load_current(self, mtime):
+        self._current = (None, None)
+        self._current_mtime = mtime
+        try:
+            with open(self.current_pet_path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            self._report(self.current_pet_path, "Error: current_pet.json file not found.")
+            return
+        except json.JSONDecodeError as e:
+            self._report(self.current_pet_path, f"Error decoding JSON: {e}")
+            return
 
         pet_kind = data.get("Current_Pet_Kind", None)
         pet_color = data.get("Current_Pet_Color", None)
-
         if pet_kind and pet_color:
-            return pet_kind, pet_color
+            self._current = (pet_kind, pet_color)
+            self._report(self.current_pet_path, None)
         else:
-            print("Error: Current_Pet_Kind or Current_Pet_Color is missing in the JSON file.")
-            return None, None
-    except FileNotFoundError:
-        print("Error: current_pet.json file not found.")
-        return None, None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return None, None
+            self._report(self.current_pet_path,
+                         "Error: Current_Pet_Kind or Current_Pet_Color is missing in the JSON file.")
+
+    @staticmethod
+    def _asset_key(path):
+        return os.path.normcase(os.path.realpath(path))
+
+    def _load_atlas_manifest(self, mtime):
+        self._compiled = {}
+        self._atlas_mtime = mtime
+        if mtime is None:
+            return
+        try:
+            with open(self.atlas_manifest_path, "r") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            self._report(self.atlas_manifest_path, f"Error loading pets_atlas.json: {e}")
+            return
+        self._report(self.atlas_manifest_path, None)
+
+        base_dir = os.path.dirname(os.path.abspath(self.atlas_manifest_path))
+        for source, entry in data.get("animations", {}).items():
+            entry = dict(entry)
+            entry["source_path"] = os.path.join(base_dir, source)
+            entry["atlas_path"] = os.path.join(base_dir, entry["atlas"])
+            self._compiled[self._asset_key(entry["source_path"])] = entry
+
+    def _refresh(self):
+        """Reload whichever file changed on disk, throttled by `check_interval`."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        self._source_current = {}
+
+        mtime = self._mtime(self.manifest_path)
+        if mtime != self._manifest_mtime:
+            self._load_manifest(mtime)
+        mtime = self._mtime(self.current_pet_path)
+        if mtime != self._current_mtime:
+            self._load_current(mtime)
+        mtime = self._mtime(self.atlas_manifest_path)
+        if mtime != self._atlas_mtime:
+            self._load_atlas_manifest(mtime)
+
+    def invalidate(self):
+        """Force both files to be re-read on the next lookup."""
+        with self._lock:
+            self._manifest_mtime = _UNLOADED
+            self._current_mtime = _UNLOADED
+            self._atlas_mtime = _UNLOADED
+            self._next_check = 0.0
+
+    # Queries -----------------------------------------------------------
+    def resolve(self, pet_kind, pet_color, action):
+        """Return the "src/..." path for (kind, color, action), or None."""
+        with self._lock:
+            self._refresh()
+            path = self._paths.get((pet_kind, pet_color, action))
+            if path is not None:
+                return path
+            if pet_kind not in self._lock_flags:
+                print(f"Pet kind '{pet_kind}' not found in the configuration.")
+            elif pet_color not in self._lock_flags[pet_kind]:
+                print(f"Color '{pet_color}' not found under pet kind '{pet_kind}'.")
+            else:
+                print(f"Action '{action}' not found for pet '{pet_kind}' of color '{pet_color}'.")
+            return None
+
+    def actions(self, pet_kind, pet_color):
+        """Return {action: path} for one skin."""
+        with self._lock:
+            self._refresh()
+            return {
+                action: path
+                for (kind, color, action), path in self._paths.items()
+                if kind == pet_kind and color == pet_color
+            }
+
+    def compiled_animation(self, path):
+        """Return the sprite-atlas entry compiled from the GIF at `path`.
+
+        Returns None if there is no atlas or the GIF changed since it was
+        compiled, in which case callers decode the GIF directly.
+        """
+        with self._lock:
+            self._refresh()
+            key = self._asset_key(path)
+            entry = self._compiled.get(key)
+            if entry is None:
+                return None
+            current = self._source_current.get(key)
+            if current is None:
+                current = self._mtime(entry["source_path"]) == entry.get("source_mtime")
+                self._source_current[key] = current
+        return entry if current else None
+
+    def kinds_and_colors(self):
+        """Return {kind: {color: lock_flag}} for every skin in the manifest."""
+        with self._lock:
+            self._refresh()
+            return {kind: dict(colors) for kind, colors in self._lock_flags.items()}
+
+    def current_pet(self):
+        """Return the (kind, color) currently selected, or (None, None)."""
+        with self._lock:
+            self._refresh()
+            return self._current
+
+    def update_pet(self, pet_kind, pet_color):
+        """Persist a new current pet and update the in-memory selection."""
+        with self._lock:
+            with open(self.current_pet_path, "w") as f:
+                json.dump({
+                    "Current_Pet_Kind": pet_kind,
+                    "Current_Pet_Color": pet_color
+                }, f, indent=2)
+            self._current = (pet_kind, pet_color)
+            self._current_mtime = self._mtime(self.current_pet_path)
+            self._report(self.current_pet_path, None)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide PetAssetRegistry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PetAssetRegistry()
+    return _registry
+
+
+def get_current_pet():
+    """
+    Return the current pet kind and color from the in-memory registry.
+    """
+    return get_registry().current_pet()
+
+
+def update_current_pet(pet_kind, pet_color):
+    """
+    Save the current pet kind and color and refresh the registry.
+    """
+    get_registry().update_pet(pet_kind, pet_color)
+
 
 def load_pet_data(pet_kind, pet_color, action):
     """
-    Load the JSON file and retrieve the path for the given pet kind, color, and action.
+    Retrieve the path for the given pet kind, color, and action from the registry.
     """
-    try:
-        with open("src/pets_info.json", 'r') as file:
-            data = json.load(file)
-
-        # Navigate through the JSON structure
-        if pet_kind in data:
-            kind_data = data[pet_kind]
-            if pet_color in kind_data:
-                color_data = kind_data[pet_color]
-                if action in color_data:
-                    # print("src/"+color_data[action])
-                    return "src/"+color_data[action]
-                else:
-                    print(f"Action '{action}' not found for pet '{pet_kind}' of color '{pet_color}'.")
-                    return None
-            else:
-                print(f"Color '{pet_color}' not found under pet kind '{pet_kind}'.")
-                return None
-        else:
-            print(f"Pet kind '{pet_kind}' not found in the configuration.")
-            return None
-    except FileNotFoundError:
-        print(f"File not found: pets_info.json")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return None
+    return get_registry().resolve(pet_kind, pet_color, action)
+
 
 def get_all_pet_kinds_and_colors():
     """
@@ -67,27 +275,4 @@ def get_all_pet_kinds_and_colors():
         ...
     }
     """
-    try:
-        with open("src/pets_info.json", "r") as file:
-            data = json.load(file)
-
-        all_pet_kinds_and_colors = {}
-        for pet_kind, colors in data.items():
-            all_pet_kinds_and_colors[pet_kind] = {
-                color: color_data.get("lock_flag", None)  # Get lock_flag value or None if missing
-                for color, color_data in colors.items()
-            }
-
-        return all_pet_kinds_and_colors
-    except FileNotFoundError:
-        print("Error: pets_info.json file not found.")
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return {}
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return {}
-
-
-
+    return get_registry().kinds_and_colors()
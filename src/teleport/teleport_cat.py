@@ -3,11 +3,12 @@ TeleportManager - Handles all room connection and pet teleportation functionalit
 """
 import os
 import threading
-from PyQt5.QtCore import QTimer, Qt, pyqtSlot, QMetaObject, Q_ARG
-from PyQt5.QtWidgets import QLabel
-from PyQt5.QtGui import QPixmap, QMovie
+from PyQt5.QtCore import Qt, pyqtSlot, QMetaObject, Q_ARG
 from supabase import create_client
 
+from src.ui.compositor import create_portal
+from src.utils.lifecycle import get_lifecycle_registry
+
 
 class TeleportManager:
     """Manages room connections and pet teleportation between users"""
@@ -29,6 +30,39 @@ class TeleportManager:
         self.room_worker = None  # For compatibility with menu_bar.py checks
         self.remote_pets = {}  # Track remote pets by user_id
         self.pet_teleported = False  # Track if local pet is teleported
+
+        # Portal animation timers and the portals they show; both are torn
+        # down by cancel_animations() on disconnect and on shutdown
+        self.scope = get_lifecycle_registry().scope(self, label="teleport")
+        self.portals = []
+
+    def _open_portal(self, center_x, center_y, size):
+        from src.main_window import resource_path
+        portal = create_portal(self.app, resource_path("src/teleport/portal.png"),
+                               center_x, center_y, size)
+        self.portals.append(portal)
+        return portal
+
+    def _close_portal(self, portal):
+        if portal in self.portals:
+            self.portals.remove(portal)
+        portal.hide()
+        portal.deleteLater()
+
+    def cancel_animations(self):
+        """Stop pending portal timers and remove the portals they would have closed."""
+        self.scope = get_lifecycle_registry().begin(self, label="teleport")
+        for portal in list(self.portals):
+            self._close_portal(portal)
+
+    def shutdown(self):
+        """Stop the room connection and every pending portal animation."""
+        if self.room_thread and self.room_thread.is_alive():
+            print("[TELEPORT] Cleaning up room connection...")
+            self.room_stop_event.set()
+            self.room_thread.join(timeout=3)
+        self.cancel_animations()
+        get_lifecycle_registry().end(self)
     
     def teleport_pet_to_portal(self):
         """Teleport pet to portal and freeze actions (for non-holder users)"""
@@ -63,18 +97,8 @@ class TeleportManager:
         portal_center_x = self.app.width() // 2
         portal_center_y = self.app.height() // 2
         
-        portal = QLabel(self.app)
-        portal.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        portal.setAttribute(Qt.WA_TranslucentBackground)
-        portal_pixmap = QPixmap(resource_path("src/teleport/portal.png"))
-        portal.setPixmap(portal_pixmap)
-        portal.setScaledContents(True)
-        
         portal_size = int(self.app.width() * 0.1)
-        portal.resize(portal_size, portal_size)
-        portal.move(portal_center_x - portal_size // 2, portal_center_y - portal_size // 2)
-        portal.lower()
-        portal.show()
+        portal = self._open_portal(portal_center_x, portal_center_y, portal_size)
         
         # Position pet at center (initially hidden)
         center_x = (self.app.width() - self.app.pet_label.width()) // 2
@@ -83,36 +107,26 @@ class TeleportManager:
         
         # After portal shows for a moment, play end_move_portal animation (pet emerging)
         def show_pet_emerging():
-            end_movie = QMovie(resource_path(load_pet_data(self.app.pet_kind, self.app.pet_color, "end_move_portal")))
-            self.app.pet_label.setMovie(end_movie)
-            self.app.pet_label.setScaledContents(True)
+            self.app.pet_label.set_movie(
+                resource_path(load_pet_data(self.app.pet_kind, self.app.pet_color, "end_move_portal")),
+                loop=False
+            )
             self.app.pet_label.show()
-            end_movie.start()
             
             def finish_recall():
-                try:
-                    end_movie.stop()
-                except Exception:
-                    pass
+                self.app.pet_label.stop_movie()
                 
                 # Hide portal
-                portal.hide()
-                portal.deleteLater()
+                self._close_portal(portal)
                 
                 # Resume normal behavior
                 self.app.pet_behavior.resume(self.app, lambda: self.app.check_switch_state(self.app.pet_behavior))
                 self.pet_teleported = False
                 print("[TELEPORT] Pet has been recalled and resumed")
             
-            finish_timer = QTimer(self.app)
-            finish_timer.setSingleShot(True)
-            finish_timer.timeout.connect(finish_recall)
-            finish_timer.start(1000)
-        
-        emerge_timer = QTimer(self.app)
-        emerge_timer.setSingleShot(True)
-        emerge_timer.timeout.connect(show_pet_emerging)
-        emerge_timer.start(500)  # Show portal for 500ms before pet emerges
+            self.scope.single_shot(1000, finish_recall, self.app)
+        
+        self.scope.single_shot(500, show_pet_emerging, self.app)  # Show portal for 500ms before pet emerges
     
     @pyqtSlot(int, str, str)
     def spawn_remote_pet(self, user_id, pet_kind, pet_color):
@@ -129,18 +143,8 @@ class TeleportManager:
         portal_center_x = self.app.width() // 2
         portal_center_y = self.app.height() // 2
         
-        portal = QLabel(self.app)
-        portal.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        portal.setAttribute(Qt.WA_TranslucentBackground)
-        portal_pixmap = QPixmap(resource_path("src/teleport/portal.png"))
-        portal.setPixmap(portal_pixmap)
-        portal.setScaledContents(True)
-        
         portal_size = int(self.app.width() * 0.1)
-        portal.resize(portal_size, portal_size)
-        portal.move(portal_center_x - portal_size // 2, portal_center_y - portal_size // 2)
-        portal.lower()
-        portal.show()
+        portal = self._open_portal(portal_center_x, portal_center_y, portal_size)
         
         print(f"[TELEPORT] Portal established, summoning User {user_id}'s pet...")
         
@@ -172,36 +176,26 @@ class TeleportManager:
         # Animate pet coming out of portal
         def show_pet_from_portal():
             # Play end_move_portal animation (pet emerging)
-            end_movie = QMovie(resource_path(load_pet_data(pet_kind, pet_color, "end_move_portal")))
-            remote_pet_label.setMovie(end_movie)
-            remote_pet_label.setScaledContents(True)
+            remote_pet_label.set_movie(
+                resource_path(load_pet_data(pet_kind, pet_color, "end_move_portal")),
+                loop=False
+            )
             remote_pet_label.show()
-            end_movie.start()
             
             def finish_spawn():
-                try:
-                    end_movie.stop()
-                except Exception:
-                    pass
+                remote_pet_label.stop_movie()
                 
                 # Hide portal
-                portal.hide()
-                portal.deleteLater()
+                self._close_portal(portal)
                 
                 # Resume pet behavior
                 remote_pet_behavior.resume(self.app, lambda: self.app.check_switch_state(remote_pet_behavior, user_id))
                 print(f"[TELEPORT] User {user_id}'s pet has been spawned")
             
-            finish_timer = QTimer(self.app)
-            finish_timer.setSingleShot(True)
-            finish_timer.timeout.connect(finish_spawn)
-            finish_timer.start(1000)
+            self.scope.single_shot(1000, finish_spawn, self.app)
         
         # Delay before showing pet (portal display time)
-        spawn_timer = QTimer(self.app)
-        spawn_timer.setSingleShot(True)
-        spawn_timer.timeout.connect(show_pet_from_portal)
-        spawn_timer.start(500)  # Show portal for 500ms before pet emerges
+        self.scope.single_shot(500, show_pet_from_portal, self.app)  # Show portal for 500ms before pet emerges
     
     @pyqtSlot(int)
     def despawn_remote_pet(self, user_id):
@@ -228,40 +222,26 @@ class TeleportManager:
         pet_y = remote_pet_label.y() + remote_pet_label.height() // 2
         
         # Create portal at pet's position
-        portal = QLabel(self.app)
-        portal.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        portal.setAttribute(Qt.WA_TranslucentBackground)
-        portal_pixmap = QPixmap(resource_path("src/teleport/portal.png"))
-        portal.setPixmap(portal_pixmap)
-        portal.setScaledContents(True)
-        
         portal_size = int(self.app.width() * 0.1)
-        portal.resize(portal_size, portal_size)
-        portal.move(pet_x - portal_size // 2, pet_y - portal_size // 2)
-        portal.lower()
-        portal.show()
+        portal = self._open_portal(pet_x, pet_y, portal_size)
         
         print(f"[TELEPORT] User {user_id}'s pet is returning...")
         
         # Play start_move_portal animation (pet entering portal)
-        start_movie = QMovie(resource_path(load_pet_data(pet_kind, pet_color, "start_move_portal")))
-        remote_pet_label.setMovie(start_movie)
-        remote_pet_label.setScaledContents(True)
-        start_movie.start()
+        remote_pet_label.set_movie(
+            resource_path(load_pet_data(pet_kind, pet_color, "start_move_portal")),
+            loop=False
+        )
         
         def hide_pet_and_portal():
             # Hide pet
             remote_pet_label.hide()
             
             def cleanup():
-                try:
-                    start_movie.stop()
-                except Exception:
-                    pass
+                remote_pet_label.stop_movie()
                 
                 # Hide portal
-                portal.hide()
-                portal.deleteLater()
+                self._close_portal(portal)
                 
                 # Remove pet from behavior manager and cleanup
                 if hasattr(self.app.behavior_manager, 'pets') and f"RemotePet_{user_id}" in self.app.behavior_manager.pets:
@@ -271,16 +251,10 @@ class TeleportManager:
                 del self.remote_pets[user_id]
                 print(f"[TELEPORT] User {user_id}'s pet has been removed")
             
-            cleanup_timer = QTimer(self.app)
-            cleanup_timer.setSingleShot(True)
-            cleanup_timer.timeout.connect(cleanup)
-            cleanup_timer.start(500)  # Wait for portal visibility
+            self.scope.single_shot(500, cleanup, self.app)  # Wait for portal visibility
         
         # Wait for animation to finish before hiding
-        hide_timer = QTimer(self.app)
-        hide_timer.setSingleShot(True)
-        hide_timer.timeout.connect(hide_pet_and_portal)
-        hide_timer.start(1000)  # 1 second for start_move_portal animation
+        self.scope.single_shot(1000, hide_pet_and_portal, self.app)  # 1 second for start_move_portal animation
     
     def connect_to_room(self, room_id, user_id):
         """Connect to a room (called from menu)"""
@@ -409,6 +383,9 @@ class TeleportManager:
         """Disconnect from current room"""
         if self.room_thread and self.room_thread.is_alive():
             print("正在断开房间连接...")
+            # Half-played spawns, despawns and recalls would otherwise fire
+            # later against pets and portals this teardown removes.
+            self.cancel_animations()
             
             # Clean up remote pets if holder is leaving
             if self.is_room_holder:
@@ -5,7 +5,7 @@ Inspired by macOS Sequoia Siri design with glass morphism and gradient effects.
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QLineEdit, QScrollArea, QFrame,
+    QPushButton, QLineEdit, QFrame,
     QGraphicsDropShadowEffect, QApplication, QDialog
 )
 import math
@@ -25,7 +25,12 @@ from PyQt5.QtGui import (
     QLinearGradient, QRadialGradient
 )
 
+from src.assets import get_frame_governor
+from src.utils.cursor_service import get_cursor_service
+from src.utils.frame_clock import get_frame_clock
+from src.utils.motion_engine import MOTION_INTERVAL
 from src.chat.handler import ChatHandler
+from src.ui.chat_transcript import ChatTranscript
 from src.ui.llm_settings_panel import LLMSettingsPanel
 from src.ui.setup_wizard import SetupWizard
 
@@ -113,16 +118,16 @@ class SiriGradientBubble(QWidget):
         
         painter.end()
 
-    def append_text(self, chunk: str):
-        if not chunk:
-            return
-        self.text += chunk
-        self.label.setText(self.text)
-
     def set_text(self, text: str):
         self.text = text or ""
         self.label.setText(self.text)
 
+    def bind(self, message):
+        """Show `message`; the chat transcript recycles bubbles between messages."""
+        self.is_error = message.is_error
+        self.set_text(message.text)
+        self.update()
+
 
 class UserBubble(QWidget):
     """User message bubble."""
@@ -154,6 +159,10 @@ class UserBubble(QWidget):
         
         self.setStyleSheet("background: transparent;")
 
+    def bind(self, message):
+        self.text = message.text
+        self.label.setText(self.text)
+
 
 class SiriInputBar(QWidget):
     """Siri-style input bar with gradient border."""
@@ -313,10 +322,14 @@ class ChatDialog(QWidget):
         super().__init__(parent)
         self.chat_handler = ChatHandler()
         self.pet_label = pet_label
-        self.position_timer = None
+        self._following = False
+        self._follow_suspended = False
+        self._follow_task = get_frame_clock().timer(self.update_position, single_shot=True, owner=self)
+        self._last_follow = 0.0
+        self._follow_geometry = None
         self.whisper = None
         self.is_voice_active = False
-        self.active_response_bubble = None
+        self.active_response = None  # transcript index of the streaming reply
         self.settings_panel = None
         self.panel_animation = None
         self.panel_visible = False
@@ -396,12 +409,10 @@ class ChatDialog(QWidget):
         container_layout.addWidget(header)
         
         # Chat area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Only the visible bubbles are live widgets, recycled while scrolling
+        self.transcript = ChatTranscript({"user": UserBubble, "cat": SiriGradientBubble})
+        self.transcript.setStyleSheet("""
+            QAbstractScrollArea {
                 background: transparent;
                 border: none;
             }
@@ -423,16 +434,7 @@ class ChatDialog(QWidget):
                 height: 0px;
             }
         """)
-        
-        self.messages_widget = QWidget()
-        self.messages_widget.setStyleSheet("background: transparent;")
-        self.messages_layout = QVBoxLayout(self.messages_widget)
-        self.messages_layout.setAlignment(Qt.AlignTop)
-        self.messages_layout.setSpacing(8)
-        self.messages_layout.setContentsMargins(16, 8, 16, 8)
-        
-        self.scroll_area.setWidget(self.messages_widget)
-        container_layout.addWidget(self.scroll_area, 1)
+        container_layout.addWidget(self.transcript, 1)
         
         # Input bar
         self.input_bar = SiriInputBar()
@@ -502,8 +504,7 @@ class ChatDialog(QWidget):
             greeting = "Hi! I'm VCat. What would you like to chat about? 喵～"
         else:
             greeting = "主人好喵～有什么想跟我说的喵？"
-        bubble = SiriGradientBubble(greeting)
-        self.messages_layout.addWidget(bubble)
+        self.transcript.append("cat", greeting)
 
     def _default_placeholder(self) -> str:
         language = self.chat_handler.config.get("language", "zh")
@@ -577,8 +578,7 @@ class ChatDialog(QWidget):
             return
             
         # User bubble
-        user_bubble = UserBubble(text)
-        self.messages_layout.addWidget(user_bubble)
+        self.transcript.append("user", text)
         self.input_bar.clear()
         self.scroll_to_bottom()
 
@@ -603,20 +603,16 @@ class ChatDialog(QWidget):
         
     def add_response(self, response: str, is_error: bool = False):
         """Add cat response."""
-        bubble = SiriGradientBubble(response, is_error=is_error)
-        self.messages_layout.addWidget(bubble)
+        self.transcript.append("cat", response, is_error=is_error)
         QTimer.singleShot(50, self.scroll_to_bottom)
         
     def scroll_to_bottom(self):
-        scrollbar = self.scroll_area.verticalScrollBar()
+        scrollbar = self.transcript.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
     def clear_messages(self):
-        while self.messages_layout.count():
-            item = self.messages_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        self.active_response = None
+        self.transcript.clear()
         self.add_greeting()
 
     def set_input_enabled(self, enabled: bool, placeholder: str = None):
@@ -652,35 +648,32 @@ class ChatDialog(QWidget):
             self.set_input_enabled(False, self._setup_required_text())
 
     def _start_streaming_response(self):
-        self.active_response_bubble = SiriGradientBubble("")
-        self.messages_layout.addWidget(self.active_response_bubble)
+        self.active_response = self.transcript.append("cat", "")
         self.scroll_to_bottom()
         self.set_input_enabled(False, self._streaming_placeholder())
 
     def _on_response_chunk(self, chunk: str):
-        if not self.active_response_bubble:
-            self.active_response_bubble = SiriGradientBubble("")
-            self.messages_layout.addWidget(self.active_response_bubble)
-        self.active_response_bubble.append_text(chunk)
+        if self.active_response is None:
+            self.active_response = self.transcript.append("cat", "")
+        if chunk:
+            self.transcript.update_message(self.active_response, append=chunk)
         self.scroll_to_bottom()
 
     def _on_response_complete(self, response: str):
-        if not self.active_response_bubble:
+        if self.active_response is None:
             self.add_response(response)
         else:
-            if not self.active_response_bubble.text:
-                self.active_response_bubble.set_text(response)
-        self.active_response_bubble = None
+            if not self.transcript.message(self.active_response).text:
+                self.transcript.update_message(self.active_response, text=response)
+        self.active_response = None
         if self.chat_handler.is_configured():
             self.set_input_enabled(True)
         self.scroll_to_bottom()
 
     def _on_response_error(self, message: str):
-        if self.active_response_bubble:
-            self.active_response_bubble.is_error = True
-            self.active_response_bubble.set_text(message)
-            self.active_response_bubble.update()
-            self.active_response_bubble = None
+        if self.active_response is not None:
+            self.transcript.update_message(self.active_response, text=message, is_error=True)
+            self.active_response = None
         else:
             self.add_response(message, is_error=True)
         if self.chat_handler.is_configured():
@@ -742,6 +735,19 @@ class ChatDialog(QWidget):
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._update_settings_panel_geometry()
+
+    # Pets fully hidden behind the dialog stop animating
+    def showEvent(self, event):
+        super().showEvent(event)
+        get_frame_governor().add_occluder(self)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        get_frame_governor().remove_occluder(self)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        get_frame_governor().refresh()
     
     # ===== Drag support =====
     def mousePressEvent(self, event):
@@ -749,9 +755,7 @@ class ChatDialog(QWidget):
             self._drag_pos = event.globalPos() - self.frameGeometry().topLeft()
             self._is_dragging = True
             # Stop following pet when user starts dragging
-            if self.position_timer:
-                self.position_timer.stop()
-                self.position_timer = None
+            self.stop_position_tracking()
             event.accept()
     
     def mouseMoveEvent(self, event):
@@ -766,9 +770,7 @@ class ChatDialog(QWidget):
             event.accept()
         
     def close_dialog(self):
-        if self.position_timer:
-            self.position_timer.stop()
-            self.position_timer = None
+        self.stop_position_tracking()
         if self.whisper:
             self.whisper.cancel()
             self.whisper = None
@@ -817,7 +819,8 @@ class ChatDialog(QWidget):
             else:
                 dialog_x, dialog_y = clamp_position(center_x, above_y)
 
-        self.move(dialog_x, dialog_y)
+        if (dialog_x, dialog_y) != (self.x(), self.y()):
+            self.move(dialog_x, dialog_y)
         
     def show_dialog(self, pet_x: int, pet_y: int, pet_width: int, pet_height: int):
         if self.pet_label:
@@ -834,17 +837,66 @@ class ChatDialog(QWidget):
         self.start_position_tracking()
         
     def start_position_tracking(self):
-        if self.pet_label and not self.position_timer:
-            self.position_timer = QTimer(self)
-            self.position_timer.timeout.connect(self.update_position)
-            self.position_timer.start(50)
-            
+        """Follow the pet: reposition whenever it or its window moves or resizes."""
+        if self.pet_label and not self._following:
+            self._following = True
+            self.pet_label.geometry_changed.connect(self._schedule_follow)
+            # Moving the pet's window moves the pet without a geometry change of
+            # its own; widget_rect() makes the cursor service watch that window.
+            cursor_service = get_cursor_service()
+            cursor_service.widget_rect(self.pet_label)
+            cursor_service.window_moved.connect(self._on_window_moved)
+
+    def stop_position_tracking(self):
+        if not self._following:
+            return
+        self._following = False
+        self._follow_task.stop()
+        try:
+            get_cursor_service().window_moved.disconnect(self._on_window_moved)
+        except (TypeError, RuntimeError):
+            pass
+        try:
+            self.pet_label.geometry_changed.disconnect(self._schedule_follow)
+        except (TypeError, RuntimeError):
+            pass  # pet already deleted
+
+    def _on_window_moved(self, window):
+        try:
+            if window is self.pet_label.window():
+                self._schedule_follow()
+        except RuntimeError:  # pet deleted on the C++ side
+            self.stop_position_tracking()
+
+    def _schedule_follow(self):
+        """Coalesce pet geometry changes into at most one reposition per frame."""
+        if self._follow_task.isActive():
+            return
+        delay = self._last_follow + MOTION_INTERVAL - get_frame_clock().now()
+        self._follow_task.start(max(0, int(delay)))
+
+    def suspend_position_tracking(self, suspended):
+        """Stop following the pet while idle; catch up and follow again afterwards."""
+        if suspended:
+            if self._following:
+                self.stop_position_tracking()
+                self._follow_suspended = True
+        elif self._follow_suspended:
+            self._follow_suspended = False
+            self.update_position()
+            self.start_position_tracking()
+
     def update_position(self):
         if not self.pet_label:
             return
         try:
             pos = self.pet_label.mapToGlobal(QPoint(0, 0))
             size = self.pet_label.size()
-            self.position_near_pet(pos.x(), pos.y(), size.width(), size.height())
-        except Exception:
-            pass
+        except RuntimeError:
+            return  # pet already deleted
+        self._last_follow = get_frame_clock().now()
+        geometry = (pos.x(), pos.y(), size.width(), size.height(), self.width(), self.height())
+        if geometry == self._follow_geometry:
+            return
+        self._follow_geometry = geometry
+        self.position_near_pet(pos.x(), pos.y(), size.width(), size.height())
@@ -0,0 +1,187 @@
+"""Virtualized chat transcript for the chat dialog.
+
+The transcript keeps every message as plain data (TranscriptMessage) and
+shows only the bubbles that intersect the viewport as live widgets. When a
+bubble scrolls out of view its widget returns to a per-role pool and is
+re-bound to the next message that scrolls in. A bubble class takes
+`(text, parent=...)` and has a `bind(message)` method.
+
+Heights are measured once per message, with a hidden bubble of the right
+role, and kept with running offsets. Appending a message or streaming into
+the last one costs a single measurement, and finding the visible range is
+a bisect. Everything is re-measured only when the content width changes.
+"""
+import bisect
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QAbstractScrollArea, QFrame, QLayout
+
+TRANSCRIPT_MARGINS = (16, 8, 16, 8)  # left, top, right, bottom px
+TRANSCRIPT_SPACING = 8  # px between bubbles
+
+
+class TranscriptMessage:
+    """One chat message: `role` picks the bubble class."""
+
+    __slots__ = ("role", "text", "is_error")
+
+    def __init__(self, role, text, is_error=False):
+        self.role = role
+        self.text = text or ""
+        self.is_error = is_error
+
+
+class ChatTranscript(QAbstractScrollArea):
+    """Scrollable list of chat messages backed by a small pool of bubble widgets."""
+
+    def __init__(self, bubble_types, parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.viewport().setAutoFillBackground(False)
+        self.viewport().setStyleSheet("background: transparent;")
+        self.verticalScrollBar().setSingleStep(20)
+        self._types = bubble_types  # role -> bubble class
+        self._messages = []
+        self._heights = []
+        self._offsets = []  # top of each message in content coordinates
+        self._width = None  # bubble width the heights were measured for
+        self._measurers = {}  # role -> hidden bubble used for measuring
+        self._live = {}  # message index -> bound bubble
+        self._pool = {role: [] for role in bubble_types}
+
+    # Messages ----------------------------------------------------------
+    def __len__(self):
+        return len(self._messages)
+
+    def message(self, index):
+        return self._messages[index]
+
+    def append(self, role, text, is_error=False):
+        """Add a message at the end and return its index."""
+        message = TranscriptMessage(role, text, is_error)
+        index = len(self._messages)
+        self._check_width()
+        top = (self._offsets[-1] + self._heights[-1] + TRANSCRIPT_SPACING
+               if self._messages else TRANSCRIPT_MARGINS[1])
+        self._messages.append(message)
+        self._offsets.append(top)
+        self._heights.append(self._measure(message))
+        self._relayout()
+        return index
+
+    def update_message(self, index, text=None, append=None, is_error=None):
+        """Change message `index` in place (used while a response streams in)."""
+        message = self._messages[index]
+        if text is not None:
+            message.text = text
+        if append:
+            message.text += append
+        if is_error is not None:
+            message.is_error = is_error
+        self._check_width()
+        self._set_height(index, self._measure(message))
+        bubble = self._live.get(index)
+        if bubble is not None:
+            bubble.bind(message)
+        self._relayout()
+
+    def clear(self):
+        for index in list(self._live):
+            self._release(index)
+        self._messages.clear()
+        self._heights.clear()
+        self._offsets.clear()
+        self._relayout()
+
+    # Measuring ---------------------------------------------------------
+    def _bubble_width(self):
+        return max(1, self.viewport().width() - TRANSCRIPT_MARGINS[0] - TRANSCRIPT_MARGINS[2])
+
+    def _check_width(self):
+        """Re-measure every message if the bubble width changed."""
+        width = self._bubble_width()
+        if width == self._width:
+            return False
+        self._width = width
+        top = TRANSCRIPT_MARGINS[1]
+        for index, message in enumerate(self._messages):
+            self._offsets[index] = top
+            self._heights[index] = self._measure(message)
+            top += self._heights[index] + TRANSCRIPT_SPACING
+        return True
+
+    def _measure(self, message):
+        bubble = self._measurers.get(message.role)
+        if bubble is None:
+            bubble = self._types[message.role]("", parent=self.viewport())
+            bubble.hide()
+            bubble.ensurePolished()
+            self._measurers[message.role] = bubble
+        bubble.bind(message)
+        # A hidden bubble's layouts are not told that the text changed.
+        for layout in bubble.findChildren(QLayout):
+            layout.invalidate()
+        height = bubble.heightForWidth(self._width)
+        return height if height > 0 else bubble.sizeHint().height()
+
+    def _set_height(self, index, height):
+        delta = height - self._heights[index]
+        if not delta:
+            return
+        self._heights[index] = height
+        for later in range(index + 1, len(self._offsets)):
+            self._offsets[later] += delta
+
+    def _content_height(self):
+        if not self._messages:
+            return 0
+        return self._offsets[-1] + self._heights[-1] + TRANSCRIPT_MARGINS[3]
+
+    # Layout ------------------------------------------------------------
+    def _acquire(self, role):
+        pool = self._pool[role]
+        if pool:
+            return pool.pop()
+        return self._types[role]("", parent=self.viewport())
+
+    def _release(self, index):
+        bubble = self._live.pop(index)
+        bubble.hide()
+        self._pool[self._messages[index].role].append(bubble)
+
+    def _relayout(self):
+        """Update the scroll range and place bubbles for the visible messages."""
+        viewport_height = self.viewport().height()
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setPageStep(viewport_height)
+        scrollbar.setRange(0, max(0, self._content_height() - viewport_height))
+        self._place_visible()
+
+    def _place_visible(self):
+        top = self.verticalScrollBar().value()
+        first = max(0, bisect.bisect_right(self._offsets, top) - 1)
+        end = bisect.bisect_left(self._offsets, top + self.viewport().height())
+        for index in [i for i in self._live if not first <= i < end]:
+            self._release(index)
+        left = TRANSCRIPT_MARGINS[0]
+        for index in range(first, end):
+            bubble = self._live.get(index)
+            if bubble is None:
+                bubble = self._live[index] = self._acquire(self._messages[index].role)
+                bubble.bind(self._messages[index])
+            bubble.setGeometry(left, self._offsets[index] - top, self._width, self._heights[index])
+            bubble.show()
+
+    def scrollContentsBy(self, dx, dy):
+        self._place_visible()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._check_width()
+        self._relayout()
+
+    def widget_count(self):
+        """Number of bubble widgets in existence, bound or pooled."""
+        return len(self._live) + sum(len(pool) for pool in self._pool.values())
@@ -0,0 +1,274 @@
+"""Single-surface compositor for pets, name tags and portals.
+
+In compositor mode (`compositor_mode` in behavior_config.json) one
+PetSurface widget fills the PetApp window and paints everything in a single
+paintEvent: portals, then the current cached frame of every visible pet,
+then the name tags. PetWidgets stay in the widget tree, because the actions,
+the cursor sampler and the spatial index need their geometry and
+visibility. They paint nothing themselves, and each new frame only asks
+the surface to repaint their rect. Name tags and portals are drawn items
+rather than top-level windows, so the number of windows and the composition
+work no longer grow with the number of pets. Repaints go through the
+window's damage tracker (ui/damage.py), which merges them into one dirty
+region per frame; paintEvent only draws the items inside that region.
+
+Name tags are rendered once per name into a small LRU of pixmaps
+(name_tag_pixmap) and drawn with the tag's opacity at paint time. Without compositor mode the
+same pixmap is shown by a NameTag child widget of the pet window.
+"""
+from collections import OrderedDict
+
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QGuiApplication, QPainter, QPixmap
+from PyQt5.QtWidgets import QLabel, QWidget
+
+from src.ui.damage import get_window_damage
+
+NAME_TAG_FONT = ("Noto Sans CJK SC", 20)
+NAME_TAG_PADDING = (8, 3)  # horizontal, vertical px
+NAME_TAG_RADIUS = 5
+NAME_TAG_BACKGROUND = QColor(0, 0, 0, 150)
+NAME_TAG_CACHE_SIZE = 32  # rendered names kept; pets come and go with rooms
+
+_portal_pixmaps = {}  # (path, size) -> scaled QPixmap
+_name_tag_pixmaps = OrderedDict()  # text -> rendered name tag QPixmap, least recent first
+
+
+def name_tag_font():
+    font = QFont(NAME_TAG_FONT[0])
+    font.setPixelSize(NAME_TAG_FONT[1])
+    font.setBold(True)
+    return font
+
+
+class Sprite:
+    """A pixmap drawn by the surface, with the QLabel calls portals use."""
+
+    def __init__(self, surface, pixmap, rect, z=-1):
+        self._surface = surface
+        self.pixmap = pixmap
+        self.rect = QRect(rect)
+        self.z = z
+        self.visible = True
+
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self._surface._sync_sprite(self)
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self._surface._sync_sprite(self)
+
+    def deleteLater(self):
+        self.hide()
+        self._surface.remove_sprite(self)
+
+
+class PetSurface(QWidget):
+    """Paints every registered pet, name tag and sprite of the window."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self._pets = {}  # id(widget) -> PetWidget, in paint order
+        self._sprites = []
+
+    # Pets --------------------------------------------------------------
+    def add_pet(self, widget):
+        self._pets[id(widget)] = widget
+        widget.destroyed.connect(lambda _=None, key=id(widget): self._pets.pop(key, None))
+
+    def remove_pet(self, widget):
+        if self._pets.pop(id(widget), None) is not None:
+            self.update_pet(widget)
+
+    def _to_surface(self, rect):
+        return rect.translated(-self.x(), -self.y())
+
+    def update_pet(self, widget, old_rect=None):
+        """Repaint `widget`'s area (and `old_rect`, in parent coordinates, after a move)."""
+        self._invalidate(widget.paint_rect())
+        if old_rect is not None:
+            self._invalidate(old_rect)
+
+    def _invalidate(self, rect):
+        """Repaint `rect` (parent coordinates) on the next damage flush."""
+        damage = get_window_damage()
+        if damage is not None and damage.surface is self:
+            damage.damage(rect)
+        else:
+            self.update(self._to_surface(rect))
+
+    # Sprites -----------------------------------------------------------
+    def add_sprite(self, pixmap, rect, z=-1):
+        """Draw `pixmap` in `rect` (parent coordinates); z < 0 is below the pets."""
+        sprite = Sprite(self, pixmap, self._to_surface(rect), z)
+        self._sprites.append(sprite)
+        self._sprites.sort(key=lambda s: s.z)
+        self._sync_sprite(sprite)
+        return sprite
+
+    def remove_sprite(self, sprite):
+        if sprite in self._sprites:
+            self._sprites.remove(sprite)
+            self._sync_sprite(sprite)
+
+    def _sync_sprite(self, sprite):
+        """Report `sprite`'s bounds to the damage tracker (or just repaint it)."""
+        damage = get_window_damage()
+        if damage is None or damage.surface is not self:
+            self.update(sprite.rect)
+            return
+        live = sprite.visible and sprite in self._sprites
+        damage.set_bounds(id(sprite), sprite.rect.translated(self.pos()) if live else None)
+
+    # Painting ----------------------------------------------------------
+    def paintEvent(self, event):
+        clip = event.region()
+        painter = QPainter(self)
+        for sprite in self._sprites:
+            if sprite.z < 0:
+                self._draw_sprite(painter, sprite, clip)
+        pets = [pet for pet in self._pets.values() if pet.isVisible()]
+        for pet in pets:
+            frame = pet.current_frame()
+            rect = self._to_surface(pet.geometry())
+            if frame is None or frame.isNull() or not clip.intersects(rect):
+                continue
+            if frame.width() == rect.width() and frame.height() == rect.height():
+                painter.drawPixmap(rect.topLeft(), frame)
+            else:  # a new size tier is still decoding
+                painter.drawPixmap(rect, frame)
+        for pet in pets:
+            self._draw_name_tag(painter, pet, clip)
+        for sprite in self._sprites:
+            if sprite.z >= 0:
+                self._draw_sprite(painter, sprite, clip)
+        painter.end()
+
+    def _draw_sprite(self, painter, sprite, clip):
+        if sprite.visible and clip.intersects(sprite.rect):
+            painter.drawPixmap(sprite.rect, sprite.pixmap)
+
+    def _draw_name_tag(self, painter, pet, clip):
+        pixmap, opacity = pet.name_tag()
+        if pixmap is None or opacity <= 0:
+            return
+        rect = self._to_surface(pet.name_tag_rect())
+        if not clip.intersects(rect):
+            return
+        painter.setOpacity(opacity)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+        painter.setOpacity(1.0)
+
+
+class NameTag(QWidget):
+    """Child widget showing a cached name tag when compositor mode is off."""
+
+    def __init__(self, pixmap, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self._pixmap = pixmap
+        self._opacity = 0.0
+        self.resize(*name_tag_size(pixmap))
+
+    def set_opacity(self, opacity):
+        if opacity != self._opacity:
+            self._opacity = opacity
+            self.update()
+
+    def paintEvent(self, event):
+        if self._opacity <= 0:
+            return
+        painter = QPainter(self)
+        painter.setOpacity(self._opacity)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
+
+
+def name_tag_pixmap(text):
+    """The name tag for `text`, rendered once at the screen's pixel ratio."""
+    pixmap = _name_tag_pixmaps.get(text)
+    if pixmap is not None:
+        _name_tag_pixmaps.move_to_end(text)
+        return pixmap
+    font = name_tag_font()
+    metrics = QFontMetrics(font)
+    width = metrics.horizontalAdvance(text) + 2 * NAME_TAG_PADDING[0]
+    height = metrics.height() + 2 * NAME_TAG_PADDING[1]
+    ratio = QGuiApplication.instance().devicePixelRatio()
+    pixmap = QPixmap(int(width * ratio), int(height * ratio))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.transparent)
+    rect = QRect(0, 0, width, height)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(NAME_TAG_BACKGROUND)
+    painter.drawRoundedRect(rect, NAME_TAG_RADIUS, NAME_TAG_RADIUS)
+    painter.setPen(Qt.white)
+    painter.setFont(font)
+    painter.drawText(rect, Qt.AlignCenter, text)
+    painter.end()
+    _name_tag_pixmaps[text] = pixmap
+    while len(_name_tag_pixmaps) > NAME_TAG_CACHE_SIZE:
+        _name_tag_pixmaps.popitem(last=False)
+    return pixmap
+
+
+def name_tag_size(pixmap):
+    """Size of a name tag pixmap in device-independent pixels."""
+    ratio = pixmap.devicePixelRatio()
+    return (round(pixmap.width() / ratio), round(pixmap.height() / ratio))
+
+
+_surface = None
+
+
+def get_pet_surface():
+    """Return the compositor surface, or None when compositor mode is off."""
+    return _surface
+
+
+def set_pet_surface(surface):
+    global _surface
+    _surface = surface
+
+
+def create_portal(parent, pixmap_path, center_x, center_y, size):
+    """Show the teleport portal centred on (center_x, center_y), below the pets.
+
+    The centre is in `parent` coordinates in both modes. Returns a surface
+    sprite in compositor mode, otherwise a frameless QLabel; both support
+    show(), hide() and deleteLater().
+    """
+    rect = QRect(center_x - size // 2, center_y - size // 2, size, size)
+    surface = get_pet_surface()
+    if surface is not None:
+        window = surface.parentWidget()
+        if window is not None and parent is not window:
+            rect.moveTopLeft(window.mapFromGlobal(parent.mapToGlobal(rect.topLeft())))
+        pixmap = _portal_pixmaps.get((pixmap_path, size))
+        if pixmap is None:
+            pixmap = QPixmap(pixmap_path).scaled(size, size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            _portal_pixmaps[(pixmap_path, size)] = pixmap
+        return surface.add_sprite(pixmap, rect, z=-1)
+
+    portal = QLabel(parent)
+    portal.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+    portal.setAttribute(Qt.WA_TranslucentBackground)
+    portal.setPixmap(QPixmap(pixmap_path))
+    portal.setScaledContents(True)
+    portal.resize(size, size)
+    # The window flags can make the label a top-level window, placed globally.
+    portal.move(parent.mapToGlobal(rect.topLeft()) if portal.isWindow() else rect.topLeft())
+    # Lower portal so pet animations appear on top
+    portal.lower()
+    portal.show()
+    return portal
@@ -0,0 +1,149 @@
+"""Dirty-rect and window-region bookkeeping for the full-screen PetApp window.
+
+PetApp covers the whole screen with a translucent window, yet only the pets,
+their name tags and portals are ever drawn. WindowDamage records the live
+bounds of each of those items and keeps the window mask set to their union,
+so the window system only composites, and only routes input to, the
+pixels that belong to a pet. The mask is opt-in (`window_mask`). Rects are
+snapped outward to a small grid, and the mask is re-set at most every
+MASK_INTERVAL ms, and only when the union has outgrown it or shrunk by
+more than MASK_SHRINK_SLACK, so a walking pet does not cost a setMask()
+per step.
+
+In compositor mode the tracker also collects the dirty rects of the
+PetSurface: frame changes and bounds changes are merged into one region and
+flushed as a single update() per frame, and the surface paints only the
+rects of that region.
+"""
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QRegion
+
+from src.utils.frame_clock import get_frame_clock
+
+REGION_GRID = 16  # px the mask is aligned to
+REGION_MARGIN = 4  # px of slack around every item
+MASK_INTERVAL = 100  # ms between setMask() calls at most
+MASK_SHRINK_SLACK = 128 * 128  # px² of unused mask kept before shrinking it
+
+
+def _snap(rect, grid=REGION_GRID, margin=REGION_MARGIN):
+    """Grow `rect` by `margin` and align it outward to `grid`."""
+    x0 = (rect.left() - margin) // grid * grid
+    y0 = (rect.top() - margin) // grid * grid
+    x1 = -(-(rect.right() + 1 + margin) // grid) * grid
+    y1 = -(-(rect.bottom() + 1 + margin) // grid) * grid
+    return QRect(x0, y0, x1 - x0, y1 - y0)
+
+
+def _area(region):
+    return sum(rect.width() * rect.height() for rect in region.rects())
+
+
+class WindowDamage:
+    """Live item bounds, the window mask derived from them and pending dirty rects."""
+
+    def __init__(self, window, clock=None, mask=False):
+        self._window = window
+        self._clock = clock or get_frame_clock()
+        self.mask_enabled = mask
+        self.surface = None
+        self._bounds = {}  # key -> QRect in window coordinates
+        self._dirty = QRegion()
+        self._mask = None
+        self._mask_stale = False
+        self._mask_time = None  # clock time of the last setMask()
+        self._mask_task = None
+        self._task = None
+
+    def set_bounds(self, key, rect):
+        """Record the area item `key` covers now (None when hidden or gone)."""
+        old = self._bounds.get(key)
+        if rect is None or rect.isEmpty():
+            if old is None:
+                return
+            del self._bounds[key]
+        else:
+            if old == rect:
+                return
+            self._bounds[key] = QRect(rect)
+            self.damage(rect)
+        if old is not None:
+            self.damage(old)
+        if self.mask_enabled:
+            # Without a mask only the surface needs flushing, and damage() asks for that.
+            self._mask_stale = True
+            self._schedule()
+
+    def remove(self, key):
+        self.set_bounds(key, None)
+
+    def damage(self, rect):
+        """Mark `rect` (window coordinates) for repainting on the next flush."""
+        if self.surface is not None and not rect.isEmpty():
+            self._dirty += rect
+            self._schedule()
+
+    def _schedule(self):
+        if self._task is None or not self._task.isActive():
+            self._task = self._clock.call_later(0, self.flush)
+
+    def flush(self):
+        """Repaint the dirty region and refresh the window mask."""
+        if not self._dirty.isEmpty() and self.surface is not None:
+            dirty = self._dirty.translated(-self.surface.x(), -self.surface.y())
+            self._dirty = QRegion()
+            self.surface.update(dirty)
+        if self._mask_stale and self.mask_enabled:
+            self._update_mask()
+
+    def _update_mask(self):
+        now = self._clock.now()
+        if self._mask_time is not None and now - self._mask_time < MASK_INTERVAL:
+            if self._mask_task is None or not self._mask_task.isActive():
+                self._mask_task = self._clock.call_later(
+                    MASK_INTERVAL - (now - self._mask_time), self._update_mask)
+            return
+        if not self._mask_stale or not self.mask_enabled:
+            return
+        self._mask_stale = False
+        region = QRegion()
+        for rect in self._bounds.values():
+            region += _snap(rect)
+        if region.isEmpty():
+            # An empty mask means "no mask"; keep a single pixel instead.
+            region = QRegion(0, 0, 1, 1)
+        if self._mask is not None and region.subtracted(self._mask).isEmpty():
+            if _area(self._mask) - _area(region) <= MASK_SHRINK_SLACK:
+                return  # still covered, and not much is wasted
+        self._mask = region
+        self._mask_time = now
+        self._window.setMask(region)
+
+    def set_mask_enabled(self, enabled):
+        self.mask_enabled = bool(enabled)
+        if self.mask_enabled:
+            self._mask_stale = True
+            self._schedule()
+        elif self._mask is not None:
+            self._mask = None
+            self._window.clearMask()
+
+    def region(self):
+        """Union of the live item bounds (unsnapped), in window coordinates."""
+        region = QRegion()
+        for rect in self._bounds.values():
+            region += rect
+        return region
+
+
+_damage = None
+
+
+def get_window_damage():
+    """Return the PetApp window's damage tracker, or None before it exists."""
+    return _damage
+
+
+def set_window_damage(damage):
+    global _damage
+    _damage = damage
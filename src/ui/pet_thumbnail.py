@@ -0,0 +1,52 @@
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt
+
+try:
+    from PyQt5 import sip
+except ImportError:  # PyQt5 < 5.11 ships sip as a top-level module
+    import sip
+
+from src.assets import AnimationPlayer
+from src.assets.thumbnails import get_thumbnail_cache, get_thumbnail_frame_loader
+
+
+class PetThumbnail(QLabel):
+    """Button-sized pet preview for the skin picker.
+
+    Shows a static first frame from the on-disk thumbnail cache and only
+    decodes and plays the full animation while `set_animating(True)`, i.e.
+    while the thumbnail is scrolled into view. Animations go to the small
+    thumbnail frame cache, never the pets' one. Loads may finish after the
+    dialog is gone, so the callbacks check that the label still exists.
+    """
+
+    def __init__(self, gif_path, size, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(size, size)
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("background: transparent;")
+        self._path = gif_path
+        self._size = (size, size)
+        self._player = AnimationPlayer(self, self)
+        self._animating = False
+        get_thumbnail_cache().request(gif_path, self._size, self._on_static_frame)
+
+    def _on_static_frame(self, image):
+        if not sip.isdeleted(self) and not self._animating:
+            self.setPixmap(QPixmap.fromImage(image))
+
+    def set_animating(self, animating):
+        """Start or stop playback; stopping keeps the current frame on screen."""
+        if animating == self._animating or not self._path:
+            return
+        self._animating = animating
+        if animating:
+            get_thumbnail_frame_loader().load(self._path, self._size, self._on_frames)
+        else:
+            self._player.stop()
+
+    def _on_frames(self, frames):
+        if not sip.isdeleted(self) and self._animating:
+            self._player.set_frames(frames)
+            self._player.start()
@@ -1,143 +1,301 @@
-from PyQt5.QtWidgets import QLabel, QGraphicsOpacityEffect
-from PyQt5.QtGui import QMovie, QCursor
-from PyQt5.QtCore import QPropertyAnimation, QPoint, Qt, QTimer, QRect
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import QVariantAnimation, QRect, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+try:
+    from PyQt5 import sip
+except ImportError:  # PyQt5 < 5.11 ships sip as a top-level module
+    import sip
+
+from src.assets import (AnimationPlayer, decode_first_frame, get_frame_cache,
+                        get_frame_governor, get_frame_loader)
+from src.utils.cursor_service import get_cursor_service
+from src.utils.motion_engine import get_motion_engine
+from src.utils.spatial_index import get_pet_index
+from src.ui.compositor import NameTag, get_pet_surface, name_tag_pixmap, name_tag_size
+from src.ui.damage import get_window_damage
 
 
 class PetWidget(QLabel):
     """Thin QLabel wrapper for the desktop pet.
 
-    - Keeps references to QMovie and QPropertyAnimation to avoid GC issues.
+    - Plays animations from the shared frame cache instead of per-pet QMovies.
+    - Moves through the shared batched motion engine (`move_to`).
     - Provides small helper API for future refactors: `set_movie`, `move_to`, `resize_for_window`.
+    - In compositor mode paints nothing itself: the shared PetSurface draws
+      its current frame and name tag.
+    - Emits `geometry_changed` after every move or resize, for widgets that
+      follow the pet (the chat dialog).
     """
 
+    geometry_changed = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.setStyleSheet("background-color: transparent;")
         self.setScaledContents(True)
-        self._movie = None
+        self._player = AnimationPlayer(self, self)
+        self._movie_path = None
+        self._movie_serial = 0  # bumps on every set_movie so stale loads are dropped
         self._animation = None
-        self._name_label = None
+        self._name_tag = None
         self._parent_window = parent
         self._hover_timer = None
         self._hover_poll_timer = None
         self._is_hovering = False
-        self._name_opacity_effect = None
         self._name_fade_animation = None
         self._name_fade_delay_timer = None
+        self._name_text = None
+        self._name_pixmap = None
+        self._name_size = (0, 0)
+        self._name_opacity = 0.0
+        self._frame = None
+        self._surface = get_pet_surface()
+        if self._surface is not None:
+            self._surface.add_pet(self)
+        get_frame_governor().register_pet(self)
+        self.destroyed.connect(lambda _=None, key=id(self): get_pet_index().remove(key))
+        get_cursor_service().window_moved.connect(self._on_window_moved)
+        damage = get_window_damage()
+        if damage is not None:
+            self.destroyed.connect(lambda _=None, key=id(self): damage.remove(key))
+
+    def set_movie(self, path, loop=True, state=None):
+        """Play the animation at `path` from the shared frame cache.
 
-    def set_movie(self, path):
-        """Set and start a QMovie from path. If path is None, does nothing."""
+        Frames are decoded once per (path, label size) and shared with every
+        other pet. On a cache miss only the first frame is decoded here and
+        shown at once; the rest is decoded by the background loader and the
+        animation starts when it arrives. `loop=False` plays the file's own
+        loop count and then emits `finished` on the returned player. `state`
+        is the behavior state name used for the governor's FPS cap. If path
+        is None, does nothing.
+        """
         if not path:
+            return None
+        size = (self.width(), self.height())
+        self._movie_path = path
+        self._movie_serial += 1
+        cache = get_frame_cache()
+        if cache.contains(path, size):
+            self._play_frames(cache.get(path, size), loop, state)
+            return self._player
+
+        self._player.set_frames(None, loop=loop, state=state)
+        first = decode_first_frame(path, size)
+        if first is not None:
+            self.setScaledContents(False)
+            self.setPixmap(QPixmap.fromImage(first))
+        serial = self._movie_serial
+
+        def play(frames):
+            # Dropped if superseded, or stopped meanwhile (e.g. by a closing LifecycleScope)
+            if sip.isdeleted(self) or self._movie_serial != serial or self._player.stopped:
+                return
+            self._play_frames(frames, loop, state)
+            self._rebuild_frames_for_size()  # resized while decoding
+
+        get_frame_loader().load(path, size, play)
+        return self._player
+
+    def _play_frames(self, frames, loop, state):
+        self._player.set_frames(frames, loop=loop, state=state)
+        # Frames are pre-scaled to the label, so painting is a plain blit.
+        self.setScaledContents(False)
+        self._player.start()
+        self.update_animation_visibility()
+
+    def stop_movie(self):
+        """Stop the current animation, keeping the last frame on screen."""
+        self._player.stop()
+
+    def clear(self):
+        self._player.stop()
+        self._movie_path = None
+        self._movie_serial += 1
+        super().clear()
+        if self._surface is not None:
+            self._frame = None
+            self._surface.update_pet(self)
+
+    def setPixmap(self, pixmap):
+        """Show `pixmap`; in compositor mode hand it to the surface instead."""
+        if self._surface is None:
+            super().setPixmap(pixmap)
             return
-        try:
-            if self._movie:
-                self._movie.stop()
-        except Exception:
-            pass
-        self._movie = QMovie(path)
-        self.setMovie(self._movie)
-        self._movie.start()
+        self._frame = pixmap
+        self._surface.update_pet(self)
+
+    def current_frame(self):
+        """The frame the surface draws for this pet (compositor mode)."""
+        return self._frame
+
+    def paint_rect(self):
+        """Area this pet covers in its parent, including a visible name tag."""
+        rect = self.geometry()
+        if self._name_text and self._name_opacity > 0:
+            rect = rect.united(self.name_tag_rect())
+        return rect
+
+    def name_tag(self):
+        """(pixmap, opacity) of the name tag the surface draws."""
+        return self._name_pixmap, self._name_opacity
+
+    def name_tag_rect(self):
+        """Name tag rect in parent coordinates, centred right above the pet."""
+        width, height = self._name_size
+        return QRect(self.x() + (self.width() - width) // 2, self.y() - height, width, height)
+
+    def paintEvent(self, event):
+        if self._surface is None:
+            super().paintEvent(event)
+
+    def update_animation_visibility(self):
+        """Pause the animation while the pet is hidden, fully occluded or frozen."""
+        governor = get_frame_governor()
+        hidden = not self.isVisible() or governor.frozen or governor.is_occluded(self)
+        self._player.setPaused(hidden)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_animation_visibility()
+        self._update_spatial_index()
+        self._sync_window_region()
+        if self._name_tag is not None:
+            self._name_tag.show()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_animation_visibility()
+        self._update_spatial_index()
+        self._sync_window_region()
+        if self._name_tag is not None and self.isHidden():
+            self._name_tag.hide()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._sync_window_region(QRect(self.pos(), event.oldSize()))
+        self.update_name_position()
+        get_cursor_service().invalidate(self)
+        self._update_spatial_index()
+        self._rebuild_frames_for_size()
+        self.geometry_changed.emit()
+
+    def _sync_window_region(self, old_rect=None):
+        """Report this pet's area to the window's damage tracker.
+
+        The tracker repaints the old and new area and keeps the window mask in
+        step. `old_rect` (parent coordinates) is only needed without a tracker.
+        """
+        damage = get_window_damage()
+        if damage is not None:
+            damage.set_bounds(id(self), None if self.isHidden() else self.paint_rect())
+        elif self._surface is not None:
+            self._surface.update_pet(self, old_rect)
+
+    def _update_spatial_index(self):
+        """Keep this pet's global rect in the shared pet index while visible."""
+        if self.isVisible():
+            rect = get_cursor_service().widget_rect(self)
+            get_pet_index().update(id(self), (rect.x(), rect.y(), rect.width(), rect.height()), self)
+        else:
+            get_pet_index().remove(id(self))
+
+    def _on_window_moved(self, window):
+        """Our global rect changed with the window; the service already dropped it."""
+        if window is self.window():
+            self._update_spatial_index()
+
+    def neighbours(self, k=1, max_distance=None):
+        """Up to `k` other visible pets closest to this one's center."""
+        rect = get_cursor_service().widget_rect(self)
+        center = rect.center()
+        return get_pet_index().nearest(center.x(), center.y(), k, max_distance, exclude=id(self))
+
+    def _rebuild_frames_for_size(self):
+        """Re-scale the current animation for a new size tier in the background.
+
+        Until the new tier is decoded the old frames keep playing, stretched
+        by QLabel, so resizing never blocks the GUI thread.
+        """
+        frames = self._player.frames
+        if not self._movie_path or frames is None:
+            return
+        size = (self.width(), self.height())
+        if (frames.size.width(), frames.size.height()) == size:
+            return
+        self.setScaledContents(True)
+        path = self._movie_path
+
+        def swap(new_frames):
+            if sip.isdeleted(self):
+                return
+            if self._movie_path == path and (self.width(), self.height()) == size:
+                self._player.swap_frames(new_frames)
+                self.setScaledContents(False)
+
+        get_frame_loader().load(path, size, swap)
 
     def move_to(self, x, y, duration_ms=1000, finished_callback=None):
         """Animate the widget's position to (x, y) over `duration_ms` milliseconds.
 
-        Keeps a reference to the animation to avoid garbage collection.
+        Runs on the shared motion engine; keeps a reference to the handle.
         """
-        try:
-            if self._animation:
-                self._animation.stop()
-        except Exception:
-            pass
-        self._animation = QPropertyAnimation(self, b"pos")
-        self._animation.setDuration(int(duration_ms))
-        self._animation.setStartValue(self.pos())
-        self._animation.setEndValue(QPoint(int(x), int(y)))
-        if finished_callback:
-            self._animation.finished.connect(finished_callback)
-        self._animation.start()
+        self._animation = get_motion_engine().move(
+            self, int(x), int(y), duration_ms, finished_callback)
 
     def resize_for_window(self, width, height, ratio=0.12):
         """Resize pet to a sensible fraction of available space."""
         base_width = max(40, int(min(width, height) * ratio))
         base_height = int(base_width * 2 / 3)  # Height is 2/3 of width
         self.resize(base_width, base_height)
-        # Update name position when pet resizes
-        if self._name_label:
-            self.update_name_position()
     
     def create_name_label(self, pet_name):
-        """Create a name label that hovers above the pet as a separate window."""
-        self._name_label = QLabel(pet_name, self._parent_window)
-        self._name_label.setWindowFlags(
-            Qt.FramelessWindowHint | 
-            Qt.WindowStaysOnTopHint | 
-            Qt.WindowTransparentForInput |
-            Qt.WindowDoesNotAcceptFocus
-        )
-        self._name_label.setAttribute(Qt.WA_TranslucentBackground)
-        self._name_label.setAttribute(Qt.WA_ShowWithoutActivating)
-        self._name_label.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self._name_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(0, 0, 0, 150);
-                color: white;
-                padding: 3px 8px;
-                border-radius: 5px;
-                font-family: "Noto Sans CJK SC";
-                font-size: 20px;
-                font-weight: bold;
-            }
-        """)
-        
-        # Set up opacity effect for fade animation
-        self._name_opacity_effect = QGraphicsOpacityEffect()
-        self._name_opacity_effect.setOpacity(0.0)  # Start hidden
-        self._name_label.setGraphicsEffect(self._name_opacity_effect)
-        
-        self._name_label.adjustSize()
-        self.update_name_position()
-        self._name_label.show()
-        
-        # Start cursor polling to detect hover
-        self._start_hover_polling()
-        
+        """Show `pet_name` in a tag centred right above the pet.
+
+        The tag is rendered once into a cached pixmap; its opacity is applied
+        when it is painted. In compositor mode the surface draws it with the
+        pet, otherwise a NameTag child widget of the pet window shows it.
+        """
+        self._name_text = pet_name
+        self._name_pixmap = name_tag_pixmap(pet_name)
+        self._name_size = name_tag_size(self._name_pixmap)
+        if self._surface is None:
+            self._name_tag = NameTag(self._name_pixmap, self._parent_window)
+            self.destroyed.connect(self._name_tag.deleteLater)
+            self.update_name_position()
+            self._name_tag.setVisible(not self.isHidden())
         # Start cursor polling to detect hover
         self._start_hover_polling()
     
     def update_name_position(self):
-        """Position the name label at the top-center of the pet."""
-        if not self._name_label:
-            return
-        # Get pet's global position
-        pet_global_pos = self.mapToGlobal(QPoint(0, 0))
-        # Center horizontally, position above pet (with small offset)
-        name_x = pet_global_pos.x() + (self.width() - self._name_label.width()) // 2
-        name_y = pet_global_pos.y() - self._name_label.height()  # right above the pet
-        self._name_label.move(name_x, name_y)
+        """Position the name tag widget at the top-center of the pet."""
+        if self._name_tag is not None:
+            self._name_tag.move(self.name_tag_rect().topLeft())
     
     def moveEvent(self, event):
         """Update name position when pet moves."""
         super().moveEvent(event)
-        if self._name_label:
-            self.update_name_position()
+        self._sync_window_region(self.paint_rect().translated(event.oldPos() - self.pos()))
+        get_cursor_service().invalidate(self)
+        self._update_spatial_index()
+        self.update_name_position()
+        if get_frame_governor().has_occluders():
+            self.update_animation_visibility()
+        self.geometry_changed.emit()
     
     def _start_hover_polling(self):
-        """Start polling cursor position to detect hover."""
+        """Subscribe to the shared cursor sampler to detect hover."""
         if not self._hover_poll_timer:
-            self._hover_poll_timer = QTimer()
-            self._hover_poll_timer.setInterval(100)  # Check every 100ms
-            self._hover_poll_timer.timeout.connect(self._check_hover)
-            self._hover_poll_timer.start()
+            self._hover_poll_timer = get_cursor_service().subscribe(
+                self,
+                on_enter=lambda: self._check_hover(True),
+                on_leave=lambda: self._check_hover(False),
+            )
     
-    def _check_hover(self):
-        """Check if cursor is over the pet widget."""
-        cursor_pos = QCursor.pos()
-        label_global_pos = self.mapToGlobal(self.rect().topLeft())
-        label_global_rect = QRect(label_global_pos, self.size())
-        
-        is_over = label_global_rect.contains(cursor_pos)
-        
+    def _check_hover(self, is_over):
+        """React to the cursor entering or leaving the pet widget."""
         if is_over and not self._is_hovering:
             # Just entered
             self._is_hovering = True
@@ -156,8 +314,7 @@ class PetWidget(QLabel):
             self._name_fade_delay_timer.stop()
         
         # Show name with full opacity
-        if self._name_opacity_effect:
-            self._name_opacity_effect.setOpacity(1.0)
+        self._set_name_opacity(1.0)
         
         # Start timer to print every 1 second (for debugging)
         if not self._hover_timer:
@@ -178,14 +335,26 @@ class PetWidget(QLabel):
             self._name_fade_delay_timer.timeout.connect(self._start_fade_out)
         self._name_fade_delay_timer.start(5000)  # 5 seconds
     
+    def _set_name_opacity(self, opacity):
+        """Set the name tag opacity and repaint the tag."""
+        if not self._name_text:
+            return
+        old = self.paint_rect()
+        self._name_opacity = opacity
+        if self._name_tag is not None:
+            self._name_tag.set_opacity(opacity)
+        else:
+            self._surface.update_pet(self, old)
+        self._sync_window_region()
+
     def _start_fade_out(self):
-        """Start gradually fading out the name label."""
-        if not self._name_opacity_effect:
+        """Start gradually fading out the name tag."""
+        if not self._name_text:
             return
-        
-        # Create fade out animation
-        self._name_fade_animation = QPropertyAnimation(self._name_opacity_effect, b"opacity")
-        self._name_fade_animation.setDuration(1000)  # 1 second fade
-        self._name_fade_animation.setStartValue(1.0)
-        self._name_fade_animation.setEndValue(0.0)
+        if not self._name_fade_animation:
+            self._name_fade_animation = QVariantAnimation()
+            self._name_fade_animation.setDuration(1000)  # 1 second fade
+            self._name_fade_animation.setStartValue(1.0)
+            self._name_fade_animation.setEndValue(0.0)
+            self._name_fade_animation.valueChanged.connect(self._set_name_opacity)
         self._name_fade_animation.start()
@@ -7,12 +7,13 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QSlider, QSpinBox, QRadioButton, QButtonGroup, QFrame,
     QMessageBox, QGraphicsDropShadowEffect, QWidget, QScrollArea,
-    QCheckBox
+    QCheckBox, QFileDialog
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPainter, QBrush
 
 from src.behavior.config import load_behavior_config, save_behavior_config, get_default_config
+from src.utils.profiler import get_action_profiler
 
 
 class ToggleSwitch(QWidget):
@@ -301,6 +302,17 @@ class SettingsWindow(QDialog):
         content_layout.addWidget(sitting_coding_card)
         content_layout.addWidget(sitting_sleeping_card)
 
+        # Performance section
+        content_layout.addSpacing(8)
+        divider = QFrame()
+        divider.setFixedHeight(1)
+        divider.setStyleSheet("background-color: #E5E5E5;")
+        content_layout.addWidget(divider)
+        content_layout.addSpacing(8)
+        content_layout.addWidget(self._section_header("Performance"))
+        content_layout.addSpacing(4)
+        content_layout.addWidget(self._create_profile_card())
+
         content_layout.addStretch()
 
         scroll.setWidget(content_widget)
@@ -576,6 +588,44 @@ class SettingsWindow(QDialog):
 
         return container, control
 
+    def _create_profile_card(self):
+        """Per-action latency histograms from the action profiler."""
+        card = self._create_card()
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(16, 14, 16, 14)
+        layout.setSpacing(10)
+
+        header = QHBoxLayout()
+        label = QLabel("⏱ Action Timing (ms)")
+        label.setFont(QFont(".AppleSystemUIFont", 14))
+        label.setStyleSheet("color: #1A1A1A; border: none;")
+        header.addWidget(label)
+        header.addStretch()
+
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.setFixedHeight(32)
+        refresh_btn.setCursor(Qt.PointingHandCursor)
+        refresh_btn.setStyleSheet(self._secondary_button_style())
+        refresh_btn.clicked.connect(self._refresh_profile)
+        header.addWidget(refresh_btn)
+
+        export_btn = QPushButton("Export…")
+        export_btn.setFixedHeight(32)
+        export_btn.setCursor(Qt.PointingHandCursor)
+        export_btn.setStyleSheet(self._secondary_button_style())
+        export_btn.clicked.connect(self._export_profile)
+        header.addWidget(export_btn)
+        layout.addLayout(header)
+
+        self.profile_label = QLabel()
+        self.profile_label.setFont(QFont("Menlo", 10))
+        self.profile_label.setStyleSheet("color: #666666; border: none;")
+        self.profile_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.profile_label)
+        self._refresh_profile()
+
+        return card
+
     def _create_action_buttons(self):
         """Reset and Save buttons."""
         container = QFrame()
@@ -649,6 +699,21 @@ class SettingsWindow(QDialog):
         else:
             self.parent_app._on_voice_wake()
 
+    def _refresh_profile(self):
+        lines = get_action_profiler().summary_lines()
+        self.profile_label.setText("\n".join(lines) if len(lines) > 1 else "No actions recorded yet")
+
+    def _export_profile(self):
+        """Write the action profile to a JSON file."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Action Profile", "vcat_action_profile.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            get_action_profiler().dump(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export: {e}")
+
     def _open_pet_selection(self):
         """Open pet selection dialog."""
         from src.menu_bar import PetSettingDialog
@@ -0,0 +1,192 @@
+"""Shared cursor sampler with enter/leave/dwell hit-testing.
+
+One FrameClock task reads QCursor.pos() per tick and tests it against the
+cached global rect of every subscribed widget, so N pets watching the
+pointer cost one cursor query per tick instead of one query and one
+mapToGlobal each. Widgets invalidate their cached rect when they move or
+resize (PetWidget does this in moveEvent/resizeEvent). Moving or resizing
+their top-level window drops the rects of everything inside it and emits
+`window_moved`, and a destroyed widget's rect is dropped with it. Pets in
+the shared spatial index are hit-tested with one grid lookup per tick.
+"""
+import weakref
+
+from PyQt5.QtCore import QEvent, QObject, QPoint, QRect, pyqtSignal
+from PyQt5.QtGui import QCursor
+
+from src.utils.frame_clock import get_frame_clock
+from src.utils.spatial_index import get_pet_index
+
+CURSOR_SAMPLE_INTERVAL = 100  # ms, same rate as the pollers it replaces
+
+
+class CursorSubscription:
+    """Enter/leave/dwell callbacks for one widget; `stop()` unsubscribes."""
+
+    def __init__(self, service, widget, on_enter=None, on_leave=None, on_dwell=None, dwell_ms=None):
+        self._service = service
+        self.widget = widget
+        self.on_enter = on_enter
+        self.on_leave = on_leave
+        self.on_dwell = on_dwell
+        self.dwell_ms = dwell_ms
+        self.inside = False
+        self.entered_at = None
+        self.dwell_fired = False
+
+    def stop(self):
+        self._service.unsubscribe(self)
+
+    def isActive(self):
+        return self in self._service._subscriptions
+
+
+class CursorService(QObject):
+    """Samples the pointer once per clock tick and dispatches to subscribers."""
+
+    window_moved = pyqtSignal(object)  # top-level window whose geometry changed
+
+    def __init__(self, clock=None, interval=CURSOR_SAMPLE_INTERVAL):
+        super().__init__()
+        self._clock = clock or get_frame_clock()
+        self.interval = interval
+        self.base_interval = interval
+        self._subscriptions = []
+        self._rects = weakref.WeakKeyDictionary()  # widget -> cached global QRect
+        self._watched = weakref.WeakSet()  # widgets whose destroyed signal is connected
+        self._windows = weakref.WeakSet()  # top-level windows with our event filter
+        self._task = None
+        self._pos = QPoint()
+
+    def position(self):
+        """Cursor position from the last sample."""
+        return QPoint(self._pos)
+
+    def widget_rect(self, widget):
+        """Global rect of `widget`, cached until `invalidate(widget)`."""
+        rect = self._rects.get(widget)
+        if rect is None:
+            rect = QRect(widget.mapToGlobal(QPoint(0, 0)), widget.size())
+            self._watch(widget)
+            self._rects[widget] = rect
+        return rect
+
+    def invalidate(self, widget):
+        self._rects.pop(widget, None)
+
+    def invalidate_window(self, window):
+        """Drop the cached rects of every widget inside top-level `window`."""
+        for widget in list(self._rects.keys()):
+            try:
+                inside = widget.window() is window
+            except RuntimeError:  # widget deleted on the C++ side
+                inside = True
+            if inside:
+                self._rects.pop(widget, None)
+
+    def _watch(self, widget):
+        if widget not in self._watched:
+            self._watched.add(widget)
+            ref = weakref.ref(widget)
+            widget.destroyed.connect(lambda _=None: self._forget(ref()))
+        window = widget.window()
+        if window not in self._windows:
+            self._windows.add(window)
+            window.installEventFilter(self)
+
+    def _forget(self, widget):
+        if widget is not None:
+            self._rects.pop(widget, None)
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.Move, QEvent.Resize):
+            self.invalidate_window(watched)
+            self.window_moved.emit(watched)
+        return False
+
+    def contains(self, widget, pos=None):
+        """True if `pos` (default: last sample) is inside the visible `widget`."""
+        if not widget.isVisible():
+            return False
+        return self.widget_rect(widget).contains(self._pos if pos is None else pos)
+
+    def subscribe(self, widget, on_enter=None, on_leave=None, on_dwell=None, dwell_ms=None):
+        """Watch `widget`; `on_dwell` fires once per hover lasting `dwell_ms`.
+
+        The cursor is sampled immediately, so `on_enter` runs right away if the
+        pointer is already over the widget.
+        """
+        subscription = CursorSubscription(self, widget, on_enter, on_leave, on_dwell, dwell_ms)
+        self._subscriptions.append(subscription)
+        try:
+            widget.destroyed.connect(subscription.stop)
+        except (AttributeError, TypeError):
+            pass
+        if self._task is None:
+            self._task = self._clock.every(self.interval, self._tick)
+        self._pos = QCursor.pos()
+        self._dispatch(subscription, self._clock.now())
+        return subscription
+
+    def set_interval_scale(self, scale):
+        """Sample every `base_interval * scale` ms, e.g. to poll less while idle."""
+        self.interval = int(self.base_interval * max(1, scale))
+        if self._task is not None:
+            self._task.start(self.interval)
+
+    def unsubscribe(self, subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.remove(subscription)
+        if not any(s.widget is subscription.widget for s in self._subscriptions):
+            self.invalidate(subscription.widget)
+        if not self._subscriptions and self._task is not None:
+            self._task.stop()
+            self._task = None
+
+    def _tick(self):
+        self._pos = QCursor.pos()
+        now = self._clock.now()
+        index = get_pet_index()
+        hits = {id(pet) for pet in index.query_point(self._pos.x(), self._pos.y())}
+        for subscription in list(self._subscriptions):
+            if subscription in self._subscriptions:
+                self._dispatch(subscription, now, index, hits)
+
+    def _dispatch(self, subscription, now, index=None, hits=None):
+        widget = subscription.widget
+        if index is not None and id(widget) in index:
+            inside = id(widget) in hits
+        else:
+            try:
+                inside = self.contains(widget)
+            except RuntimeError:  # widget deleted on the C++ side
+                self.unsubscribe(subscription)
+                return
+        if inside and not subscription.inside:
+            subscription.inside = True
+            subscription.entered_at = now
+            subscription.dwell_fired = False
+            if subscription.on_enter:
+                subscription.on_enter()
+        elif not inside and subscription.inside:
+            subscription.inside = False
+            subscription.entered_at = None
+            if subscription.on_leave:
+                subscription.on_leave()
+        if (inside and subscription.on_dwell and not subscription.dwell_fired
+                and subscription in self._subscriptions
+                and now - subscription.entered_at >= (subscription.dwell_ms or 0)):
+            subscription.dwell_fired = True
+            subscription.on_dwell()
+
+
+_cursor_service = None
+
+
+def get_cursor_service():
+    """Return the process-wide CursorService (create it on the GUI thread)."""
+    global _cursor_service
+    if _cursor_service is None:
+        _cursor_service = CursorService()
+    return _cursor_service
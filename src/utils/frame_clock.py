@@ -0,0 +1,154 @@
+"""Single application clock driving every periodic and delayed callback.
+
+Instead of one QTimer per pet, poll loop and dialog, tasks register a
+deadline in one heap and a single QTimer is armed for the earliest of them.
+Repeating tasks are aligned to multiples of their interval, so every
+100 ms poller in the app fires in the same wakeup no matter how many pets
+or dialogs are open.
+"""
+import heapq
+import itertools
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+def _monotonic_ms():
+    return time.monotonic() * 1000.0
+
+
+class ClockTask:
+    """A QTimer-like handle on a FrameClock callback.
+
+    Supports the QTimer calls the actions already use (`start`, `stop`,
+    `isActive`, `setInterval`), so it can be tracked by a LifecycleScope.
+    """
+
+    def __init__(self, clock, callback, interval=0, single_shot=False):
+        self._clock = clock
+        self.callback = callback
+        self.interval = int(interval)
+        self.single_shot = single_shot
+        self.deadline = None
+        self._generation = 0  # bumps on every (re)start so stale heap entries are skipped
+
+    def setInterval(self, interval):
+        self.interval = int(interval)
+
+    def setSingleShot(self, single_shot):
+        self.single_shot = single_shot
+
+    def start(self, interval=None):
+        if interval is not None:
+            self.interval = int(interval)
+        self._clock._schedule(self)
+
+    def stop(self):
+        if self.deadline is None:
+            return
+        self._generation += 1
+        self.deadline = None
+        self._clock._arm()
+
+    def isActive(self):
+        return self.deadline is not None
+
+
+class FrameClock(QObject):
+    """Heap of task deadlines served by one single-shot QTimer.
+
+    `now` returns milliseconds and defaults to the monotonic clock; tests and
+    simulations can pass a virtual clock and call `run_due()` themselves.
+    """
+
+    def __init__(self, now=None, parent=None):
+        super().__init__(parent)
+        self._now = now or _monotonic_ms
+        self._heap = []  # (deadline, seq, generation, task)
+        self._seq = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.run_due)
+
+    def now(self):
+        return self._now()
+
+    # Task creation -----------------------------------------------------
+    def timer(self, callback, interval=0, single_shot=False, owner=None):
+        """Return an unstarted task; it stops automatically when `owner` is destroyed."""
+        task = ClockTask(self, callback, interval, single_shot)
+        if owner is not None:
+            owner.destroyed.connect(task.stop)
+        return task
+
+    def every(self, interval, callback, owner=None):
+        """Run `callback` every `interval` ms until the returned task is stopped."""
+        task = self.timer(callback, interval, owner=owner)
+        task.start()
+        return task
+
+    def call_later(self, delay, callback, owner=None):
+        """Run `callback` once after `delay` ms."""
+        task = self.timer(callback, delay, single_shot=True, owner=owner)
+        task.start()
+        return task
+
+    # Scheduling --------------------------------------------------------
+    def _schedule(self, task, now=None):
+        now = self.now() if now is None else now
+        interval = max(0, task.interval)
+        if task.single_shot or interval == 0:
+            deadline = now + interval
+        else:
+            # Align repeating tasks so equal intervals share one wakeup.
+            deadline = (now // interval + 1) * interval
+        task._generation += 1
+        task.deadline = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), task._generation, task))
+        self._arm()
+
+    def _arm(self):
+        while self._heap and self._heap[0][2] != self._heap[0][3]._generation:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay = max(0, int(self._heap[0][0] - self.now() + 0.999))
+        if not self._timer.isActive() or self._timer.remainingTime() > delay:
+            self._timer.start(delay)
+
+    def run_due(self):
+        """Run every task whose deadline has passed, then re-arm the timer."""
+        now = self.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, generation, task = heapq.heappop(self._heap)
+            if generation == task._generation:
+                due.append((generation, task))
+        for generation, task in due:
+            if generation != task._generation:
+                continue  # stopped or restarted by an earlier callback
+            if task.single_shot:
+                task.deadline = None
+            else:
+                self._schedule(task, now)
+            try:
+                task.callback()
+            except Exception as e:
+                print(f"[FrameClock] Task {task.callback!r} raised: {e}")
+        self._arm()
+
+    def pending(self):
+        """Number of active tasks."""
+        return sum(1 for entry in self._heap if entry[2] == entry[3]._generation)
+
+
+_frame_clock = None
+
+
+def get_frame_clock():
+    """Return the process-wide FrameClock (create it on the GUI thread)."""
+    global _frame_clock
+    if _frame_clock is None:
+        _frame_clock = FrameClock()
+    return _frame_clock
@@ -0,0 +1,155 @@
+"""Detects when nobody is using the machine and when they come back.
+
+Idle time comes from the system on macOS (seconds since the last input
+event in the session) and otherwise from the cursor position and the input
+events this app receives. While the user is active a single check is
+scheduled for the moment the idle timeout could expire; without a system
+idle source the cursor is also sampled every CURSOR_TRACK_POLL ms, so a
+movement is dated to within that interval rather than to the next check.
+While idle the monitor polls cheaply every IDLE_WAKE_POLL ms, and any input
+event the app receives ends idle mode at once. The app-wide event filter
+that sees those events is only installed while it is needed: for the cursor
+fallback, and while idle. With a system idle source an active user's input
+does not pass through the monitor at all.
+"""
+from PyQt5.QtCore import QEvent, QObject, pyqtSignal
+from PyQt5.QtGui import QCursor
+from PyQt5.QtWidgets import QApplication
+
+from src.utils.frame_clock import get_frame_clock
+
+DEFAULT_IDLE_TIMEOUT = 600  # seconds without input before idle mode
+IDLE_WAKE_POLL = 250  # ms between input checks while idle
+CURSOR_TRACK_POLL = 1000  # ms between cursor samples without a system idle source
+
+_INPUT_EVENTS = {
+    QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseMove,
+    QEvent.KeyPress, QEvent.Wheel, QEvent.TouchBegin, QEvent.TabletPress,
+}
+
+_quartz = None  # Quartz module, or False where it is unavailable
+
+
+def _system_idle_seconds():
+    """Seconds since the last keyboard/mouse event in the session, or None."""
+    global _quartz
+    if _quartz is None:
+        try:
+            import Quartz
+            _quartz = Quartz
+        except ImportError:
+            _quartz = False
+    if not _quartz:
+        return None
+    try:
+        any_input = getattr(_quartz, "kCGAnyInputEventType", 0xFFFFFFFF)
+        return _quartz.CGEventSourceSecondsSinceLastEventType(
+            _quartz.kCGEventSourceStateCombinedSessionState, any_input)
+    except Exception:
+        return None
+
+
+class IdleMonitor(QObject):
+    """Emits `idle_changed(True)` after `timeout` seconds without input, False on return."""
+
+    idle_changed = pyqtSignal(bool)
+
+    def __init__(self, clock=None, parent=None):
+        super().__init__(parent)
+        self._clock = clock or get_frame_clock()
+        self.enabled = False
+        self.timeout = DEFAULT_IDLE_TIMEOUT
+        self.idle = False
+        self._task = self._clock.timer(self._check, single_shot=True)
+        self._last_input = self._clock.now()
+        self._cursor = None
+        self._tracking_cursor = False  # no system idle source; sample the cursor
+        self._filter_installed = False
+
+    def configure(self, config):
+        """Apply `idle_mode_enabled` and `idle_timeout_seconds` from config."""
+        self.timeout = max(1, config.get("idle_timeout_seconds", DEFAULT_IDLE_TIMEOUT))
+        self.set_enabled(config.get("idle_mode_enabled", True))
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        if not self.enabled:
+            self._task.stop()
+            self._set_idle(False)
+            self._update_filter()
+            return
+        self._check()
+
+    def _update_filter(self):
+        """Filter the app's input events only for the cursor fallback and while idle."""
+        wanted = self.enabled and (self._tracking_cursor or self.idle)
+        if wanted == self._filter_installed:
+            return
+        app = QApplication.instance()
+        if app is None:
+            return
+        if wanted:
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+        self._filter_installed = wanted
+
+    def idle_seconds(self):
+        """Seconds since the last user input."""
+        seconds = _system_idle_seconds()
+        self._tracking_cursor = seconds is None
+        if seconds is not None:
+            return seconds
+        return self._cursor_idle_seconds()
+
+    def _cursor_idle_seconds(self):
+        cursor = QCursor.pos()
+        if cursor != self._cursor:
+            self._cursor = cursor
+            self._last_input = self._clock.now()
+        return (self._clock.now() - self._last_input) / 1000.0
+
+    def eventFilter(self, obj, event):
+        if event.type() in _INPUT_EVENTS:
+            self._last_input = self._clock.now()
+            if self.idle:
+                self._set_idle(False)
+                self._check()
+        return False
+
+    def _check(self):
+        if not self.enabled:
+            return
+        idle_for = self.idle_seconds()
+        self._set_idle(idle_for >= self.timeout)
+        self._update_filter()
+        if self.idle:
+            self._task.start(IDLE_WAKE_POLL)
+        else:
+            # Nothing can change before the timeout expires for the current idle time.
+            delay = max(1000, int((self.timeout - idle_for) * 1000))
+            if self._tracking_cursor:
+                # Cursor fallback: keep sampling so movement is noticed when it happens.
+                delay = min(delay, CURSOR_TRACK_POLL)
+            self._task.start(delay)
+
+    def _set_idle(self, idle):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if idle:
+            print(f"[Idle] No input for {self.timeout} s, entering idle mode")
+        else:
+            print("[Idle] Input detected, leaving idle mode")
+        self.idle_changed.emit(idle)
+
+
+_idle_monitor = None
+
+
+def get_idle_monitor():
+    """Return the process-wide IdleMonitor (create it on the GUI thread)."""
+    global _idle_monitor
+    if _idle_monitor is None:
+        _idle_monitor = IdleMonitor()
+    return _idle_monitor
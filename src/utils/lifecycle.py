@@ -0,0 +1,152 @@
+"""Ownership of the timers, animations and movies a pet state starts.
+
+Each pet has one LifecycleScope per state. Actions create their timers
+through the scope, or add the objects they start to it, and entering the
+next state closes the previous scope, which stops everything it still owns.
+A timer an action forgot about can then no longer keep waking the app after
+its state has ended. Timers the scope created are also deleted when they
+are done, instead of piling up as children of the main window.
+
+The registry reports what is still running per owner, so leaked wakeups
+show up in `get_lifecycle_registry().live_counts()` and can be asserted on.
+"""
+import weakref
+
+from PyQt5.QtCore import QAbstractAnimation, QTimer
+
+KINDS = ("timers", "subscriptions", "animations", "movies")
+
+
+def _is_live(obj):
+    """True while `obj` can still fire or repaint."""
+    try:
+        if hasattr(obj, "isActive"):  # QTimer, ClockTask, CursorSubscription
+            return bool(obj.isActive())
+        if hasattr(obj, "isRunning"):  # AnimationPlayer
+            return bool(obj.isRunning())
+        return obj.state() == QAbstractAnimation.Running  # animations, QMovie
+    except RuntimeError:  # deleted on the C++ side
+        return False
+
+
+class LifecycleScope:
+    """Timers, cursor subscriptions, animations and movies owned by one state."""
+
+    def __init__(self, label, state=None):
+        self.label = label
+        self.state = state
+        self._objects = {kind: [] for kind in KINDS}
+        self._owned = set()  # ids of QTimers this scope created and deletes
+
+    def add(self, obj, kind="timers"):
+        """Track `obj` (anything with `stop()`) until the scope closes; returns it."""
+        if obj is not None and not any(o is obj for o in self._objects[kind]):
+            self._objects[kind].append(obj)
+        return obj
+
+    def discard(self, obj):
+        for objects in self._objects.values():
+            for i, o in enumerate(objects):
+                if o is obj:
+                    del objects[i]
+                    break
+        self._owned.discard(id(obj))
+
+    def timer(self, callback, parent=None, single_shot=False):
+        """Create a QTimer owned by the scope, connected to `callback` but not started."""
+        timer = QTimer(parent)
+        timer.setSingleShot(single_shot)
+        timer.timeout.connect(callback)
+        self._owned.add(id(timer))
+        return self.add(timer, "timers")
+
+    def single_shot(self, msec, callback, parent=None):
+        """Run `callback` once after `msec` unless the scope closes first."""
+        def fire():
+            self._release(timer)
+            callback()
+
+        timer = self.timer(fire, parent, single_shot=True)
+        timer.start(msec)
+        return timer
+
+    def _release(self, timer):
+        owned = id(timer) in self._owned
+        self.discard(timer)
+        if owned:
+            timer.deleteLater()
+
+    def counts(self):
+        """{kind: number of tracked objects that are still running}."""
+        return {kind: sum(1 for obj in objects if _is_live(obj))
+                for kind, objects in self._objects.items()}
+
+    def close(self):
+        """Stop everything the scope tracks and delete the timers it created."""
+        objects = [obj for kind in KINDS for obj in self._objects[kind]]
+        owned = self._owned
+        self._objects = {kind: [] for kind in KINDS}
+        self._owned = set()
+        for obj in objects:
+            try:
+                obj.stop()
+                if id(obj) in owned:
+                    obj.deleteLater()
+            except RuntimeError:
+                pass
+
+
+class LifecycleRegistry:
+    """Current scope of every owner (a pet's behavior, the teleport manager, ...)."""
+
+    def __init__(self):
+        self._scopes = weakref.WeakKeyDictionary()  # owner -> LifecycleScope
+
+    def begin(self, owner, state=None, label=None):
+        """Close `owner`'s current scope and return a fresh one for `state`."""
+        old = self._scopes.get(owner)
+        if old is not None:
+            old.close()
+            label = label or old.label
+        scope = LifecycleScope(label or f"{type(owner).__name__}@{id(owner):x}", state)
+        self._scopes[owner] = scope
+        return scope
+
+    def scope(self, owner, label=None):
+        """`owner`'s current scope, started on first use."""
+        scope = self._scopes.get(owner)
+        if scope is None:
+            scope = self.begin(owner, label=label)
+        return scope
+
+    def end(self, owner):
+        scope = self._scopes.pop(owner, None)
+        if scope is not None:
+            scope.close()
+
+    def live_counts(self):
+        """{owner label: {kind: live objects}} for every owner."""
+        return {scope.label: scope.counts() for scope in list(self._scopes.values())}
+
+    def total_counts(self):
+        totals = dict.fromkeys(KINDS, 0)
+        for counts in self.live_counts().values():
+            for kind, count in counts.items():
+                totals[kind] += count
+        return totals
+
+    def log_counts(self):
+        for scope in sorted(list(self._scopes.values()), key=lambda s: s.label):
+            live = ", ".join(f"{count} {kind}" for kind, count in scope.counts().items() if count)
+            print(f"[Lifecycle] {scope.label} ({scope.state}): {live or 'idle'}")
+
+
+_lifecycle_registry = None
+
+
+def get_lifecycle_registry():
+    """Return the process-wide LifecycleRegistry."""
+    global _lifecycle_registry
+    if _lifecycle_registry is None:
+        _lifecycle_registry = LifecycleRegistry()
+    return _lifecycle_registry
@@ -0,0 +1,148 @@
+"""Batched linear motion for every pet, advanced together each frame.
+
+Start points, targets, start times and durations of all moving pets live in
+NumPy arrays. One FrameClock task interpolates every position in a single
+vectorised step and then moves only the widgets whose pixel position
+changed, so the per-frame cost barely grows with the number of pets.
+"""
+import numpy as np
+from PyQt5.QtCore import QAbstractAnimation, QObject, pyqtSignal
+
+from src.utils.frame_clock import get_frame_clock
+
+MOTION_INTERVAL = 16  # ms, ~60 FPS
+_INITIAL_CAPACITY = 8
+
+
+class MotionHandle(QObject):
+    """QPropertyAnimation-like handle for one engine-driven move.
+
+    Supports `state()`, `stop()` and `finished`, which is what the actions
+    use on `PetBehavior.animation`.
+    """
+
+    Stopped = QAbstractAnimation.Stopped
+    Running = QAbstractAnimation.Running
+
+    finished = pyqtSignal()
+
+    def __init__(self, engine, widget):
+        super().__init__()
+        self._engine = engine
+        self.widget = widget
+        self._state = self.Stopped
+
+    def state(self):
+        return self._state
+
+    def stop(self):
+        if self._state == self.Running:
+            self._engine._release(self)
+
+
+class MotionEngine:
+    """Moves widgets along straight lines at constant speed in one batch."""
+
+    def __init__(self, clock=None, interval=MOTION_INTERVAL):
+        self._clock = clock or get_frame_clock()
+        self.interval = interval
+        self._task = None
+        self._handles = [None] * _INITIAL_CAPACITY
+        self._free = list(range(_INITIAL_CAPACITY - 1, -1, -1))
+        self._slots = {}  # handle -> slot
+        self._start = np.zeros((_INITIAL_CAPACITY, 2))
+        self._delta = np.zeros((_INITIAL_CAPACITY, 2))
+        self._t0 = np.zeros(_INITIAL_CAPACITY)
+        self._duration = np.ones(_INITIAL_CAPACITY)
+        self._last = np.full((_INITIAL_CAPACITY, 2), np.iinfo(np.int64).min, dtype=np.int64)
+        self._active = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _grow(self):
+        old = len(self._handles)
+        new = old * 2
+        self._handles.extend([None] * old)
+        self._free.extend(range(new - 1, old - 1, -1))
+        self._start = np.resize(self._start, (new, 2))
+        self._delta = np.resize(self._delta, (new, 2))
+        self._t0 = np.resize(self._t0, new)
+        self._duration = np.resize(self._duration, new)
+        self._last = np.resize(self._last, (new, 2))
+        self._active = np.concatenate([self._active, np.zeros(old, dtype=bool)])
+
+    def move(self, widget, x, y, duration_ms, finished=None):
+        """Move `widget` to (x, y) over `duration_ms`; return its MotionHandle.
+
+        Any move already running for the same widget is stopped first.
+        """
+        for handle in list(self._slots):
+            if handle.widget is widget:
+                handle.stop()
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        handle = MotionHandle(self, widget)
+        if finished is not None:
+            handle.finished.connect(finished)
+        pos = widget.pos()
+        self._handles[slot] = handle
+        self._slots[handle] = slot
+        self._start[slot] = (pos.x(), pos.y())
+        self._delta[slot] = (x - pos.x(), y - pos.y())
+        self._t0[slot] = self._clock.now()
+        self._duration[slot] = max(1, int(duration_ms))
+        self._last[slot] = (pos.x(), pos.y())
+        self._active[slot] = True
+        handle._state = MotionHandle.Running
+        if self._task is None:
+            self._task = self._clock.every(self.interval, self._tick)
+        return handle
+
+    def _release(self, handle):
+        slot = self._slots.pop(handle)
+        self._active[slot] = False
+        self._handles[slot] = None
+        self._free.append(slot)
+        handle._state = MotionHandle.Stopped
+        if not self._slots and self._task is not None:
+            self._task.stop()
+            self._task = None
+
+    def _tick(self):
+        slots = np.flatnonzero(self._active)
+        if slots.size == 0:
+            return
+        progress = np.clip((self._clock.now() - self._t0[slots]) / self._duration[slots], 0.0, 1.0)
+        positions = np.rint(self._start[slots] + self._delta[slots] * progress[:, None]).astype(np.int64)
+        changed = np.any(positions != self._last[slots], axis=1)
+        self._last[slots] = positions
+
+        done = []
+        for slot, (x, y), moved, complete in zip(slots.tolist(), positions.tolist(),
+                                                 changed.tolist(), (progress >= 1.0).tolist()):
+            handle = self._handles[slot]
+            if moved:
+                try:
+                    handle.widget.move(x, y)
+                except RuntimeError:  # widget deleted on the C++ side
+                    self._release(handle)
+                    continue
+            if complete:
+                done.append(handle)
+        for handle in done:
+            if handle in self._slots:
+                self._release(handle)
+                handle.finished.emit()
+
+
+_motion_engine = None
+
+
+def get_motion_engine():
+    """Return the process-wide MotionEngine (create it on the GUI thread)."""
+    global _motion_engine
+    if _motion_engine is None:
+        _motion_engine = MotionEngine()
+    return _motion_engine
@@ -0,0 +1,193 @@
+"""Per-action profiling of pet behaviors.
+
+Every action module's `run` is wrapped (see behavior/actions/__init__.py)
+and PetBehavior.perform_action reports each dispatch, which yields per
+action:
+
+- setup_ms: time spent inside `run` before it returns to the event loop
+  (resizing, decoding, dialog creation, ...);
+- time_in_state_ms: from entering the action until it calls its callback;
+- callback_latency_ms: from that callback until the pet's next
+  perform_action starts, i.e. the cost of the hand-off between states.
+
+Values go into log-bucketed histograms. The last RECENT_EVENTS entries and
+exits are also kept with their timestamps. `dump(path)` writes everything
+as JSON, and the settings window shows `summary_lines()`.
+"""
+import bisect
+import json
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended.
+BUCKET_BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                 1000, 2500, 5000, 10000, 30000, 60000)
+_BUCKET_LABELS = [f"<={b}" for b in BUCKET_BOUNDS] + [f">{BUCKET_BOUNDS[-1]}"]
+RECENT_EVENTS = 500
+
+
+def _now_ms():
+    return time.perf_counter() * 1000.0
+
+
+class Histogram:
+    """Count, sum, min, max and bucketed distribution of millisecond samples."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (capped at max)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3),
+            "min": round(self.min or 0.0, 3),
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "max": round(self.max or 0.0, 3),
+            "buckets": {label: n for label, n in zip(_BUCKET_LABELS, self.buckets) if n},
+        }
+
+
+class ActionProfiler:
+    """Collects setup, time-in-state and callback-latency histograms per action."""
+
+    def __init__(self):
+        self.enabled = True
+        self.started = datetime.now()
+        self._origin = _now_ms()
+        self._histograms = {}  # (action, metric) -> Histogram
+        self._open = weakref.WeakKeyDictionary()  # behavior -> finish() of its current action
+        self._pending = weakref.WeakKeyDictionary()  # behavior -> (action, callback time)
+        self.recent = deque(maxlen=RECENT_EVENTS)
+
+    def record(self, action, metric, value):
+        key = (action, metric)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.add(value)
+
+    def histogram(self, action, metric):
+        return self._histograms.get((action, metric))
+
+    def on_perform(self, behavior):
+        """Called at the start of perform_action; closes the previous state and hand-off."""
+        if not self.enabled:
+            return
+        finish = self._open.pop(behavior, None)
+        if finish is not None:
+            finish(False)  # left without its callback, e.g. sit -> play on hover
+        pending = self._pending.pop(behavior, None)
+        if pending is not None:
+            action, called_at = pending
+            self.record(action, "callback_latency_ms", _now_ms() - called_at)
+
+    def wrap(self, action, run):
+        """Return `run` instrumented to record `action`'s setup and time in state."""
+        def profiled_run(behavior, parent, callback):
+            if not self.enabled:
+                return run(behavior, parent, callback)
+            entered = _now_ms()
+            pet = f"{id(behavior):x}"
+            done = []
+
+            def finish(via_callback):
+                if done:
+                    return
+                done.append(True)
+                exited = _now_ms()
+                self.record(action, "time_in_state_ms", exited - entered)
+                self.recent.append(("exit", pet, action, round(exited - self._origin, 3)))
+                if via_callback:
+                    self._pending[behavior] = (action, exited)
+
+            def profiled_callback(*args, **kwargs):
+                finish(True)
+                return callback(*args, **kwargs)
+
+            self._open[behavior] = finish
+            self.recent.append(("enter", pet, action, round(entered - self._origin, 3)))
+            try:
+                return run(behavior, parent, profiled_callback)
+            finally:
+                self.record(action, "setup_ms", _now_ms() - entered)
+
+        profiled_run.__name__ = getattr(run, "__name__", "run")
+        profiled_run.__doc__ = run.__doc__
+        profiled_run.__wrapped__ = run
+        return profiled_run
+
+    def reset(self):
+        self._histograms.clear()
+        self._open = weakref.WeakKeyDictionary()
+        self._pending = weakref.WeakKeyDictionary()
+        self.recent.clear()
+        self.started = datetime.now()
+        self._origin = _now_ms()
+
+    def snapshot(self):
+        """JSON-serialisable dict of every histogram and the recent events."""
+        actions = {}
+        for (action, metric), histogram in sorted(self._histograms.items()):
+            actions.setdefault(action, {})[metric] = histogram.to_dict()
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "actions": actions,
+            "recent": [{"event": event, "pet": pet, "action": action, "t_ms": t}
+                       for event, pet, action, t in self.recent],
+        }
+
+    def dump(self, path):
+        """Write `snapshot()` to `path` as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        print(f"[Profiler] Action profile written to {path}")
+
+    def summary_lines(self):
+        """One line per action and metric: count, p50, p95 and max in ms."""
+        lines = [f"{'action':<20}{'metric':<22}{'n':>6}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for (action, metric), h in sorted(self._histograms.items()):
+            lines.append(f"{action:<20}{metric:<22}{h.count:>6}{h.percentile(50):>9.1f}"
+                         f"{h.percentile(95):>9.1f}{h.max:>9.1f}")
+        return lines
+
+
+_profiler = None
+
+
+def get_action_profiler():
+    """Return the process-wide ActionProfiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = ActionProfiler()
+    return _profiler
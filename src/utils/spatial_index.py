@@ -0,0 +1,158 @@
+"""Uniform-grid spatial index for pet hit-testing and proximity queries.
+
+Rects are (x, y, width, height) tuples in global screen coordinates. Each
+entry is bucketed into every grid cell it overlaps, so point and rect
+queries only look at the few entries sharing a cell with the query, and
+k-nearest queries search outward ring by ring until no closer entry can
+exist. The module is Qt-free; PetWidget keeps the shared pet index current
+as it moves, resizes, shows and hides.
+"""
+import heapq
+import math
+
+DEFAULT_CELL_SIZE = 256  # px, about one default-sized pet
+
+
+def _rect_distance(rect, x, y):
+    """Euclidean distance from (x, y) to the nearest point of `rect`."""
+    rx, ry, rw, rh = rect
+    dx = max(rx - x, 0, x - (rx + rw))
+    dy = max(ry - y, 0, y - (ry + rh))
+    return math.hypot(dx, dy)
+
+
+class SpatialGrid:
+    """Maps keys to rects and answers point, rect and k-nearest queries."""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}    # (cx, cy) -> set of keys
+        self._entries = {}  # key -> (rect, item, cells)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _cell_range(self, rect):
+        x, y, w, h = rect
+        size = self.cell_size
+        x0, y0 = int(x // size), int(y // size)
+        x1, y1 = int((x + max(w - 1, 0)) // size), int((y + max(h - 1, 0)) // size)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def update(self, key, rect, item=None):
+        """Insert `key` or move it to `rect`; queries return `item` (default: key)."""
+        rect = tuple(int(v) for v in rect)
+        old = self._entries.get(key)
+        cells = self._cell_range(rect)
+        if old is not None and old[2] == cells:
+            self._entries[key] = (rect, key if item is None else item, cells)
+            return
+        if old is not None:
+            self._unlink(key, old[2])
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._entries[key] = (rect, key if item is None else item, cells)
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._unlink(key, entry[2])
+
+    def _unlink(self, key, cells):
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def rect(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def query_point(self, x, y):
+        """Items whose rect contains (x, y)."""
+        size = self.cell_size
+        found = []
+        for key in self._cells.get((int(x // size), int(y // size)), ()):
+            rect, item, _ = self._entries[key]
+            rx, ry, rw, rh = rect
+            if rx <= x < rx + rw and ry <= y < ry + rh:
+                found.append(item)
+        return found
+
+    def query_rect(self, rect):
+        """Items whose rect intersects `rect`."""
+        qx, qy, qw, qh = rect
+        seen = set()
+        found = []
+        for cell in self._cell_range(rect):
+            for key in self._cells.get(cell, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                (rx, ry, rw, rh), item, _ = self._entries[key]
+                if rx < qx + qw and qx < rx + rw and ry < qy + qh and qy < ry + rh:
+                    found.append(item)
+        return found
+
+    def nearest(self, x, y, k=1, max_distance=None, exclude=None):
+        """Up to `k` items closest to (x, y) by distance to their rect edge.
+
+        `exclude` is a key to skip, e.g. the pet asking for its neighbours.
+        """
+        if not self._entries or k <= 0:
+            return []
+        size = self.cell_size
+        cx, cy = int(x // size), int(y // size)
+
+        best = []  # max-heap of (-distance, order, item)
+        seen = set()
+        order = 0
+        ring = -1
+        while len(seen) < len(self._entries):
+            ring += 1
+            # Nothing in this ring or beyond can beat the current k-th best.
+            ring_min = max(0, (ring - 1) * size)
+            if len(best) == k and ring_min > -best[0][0]:
+                break
+            if max_distance is not None and ring_min > max_distance:
+                break
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for key in self._cells.get((gx, gy), ()):
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        if key == exclude:
+                            continue
+                        rect, item, _ = self._entries[key]
+                        distance = _rect_distance(rect, x, y)
+                        if max_distance is not None and distance > max_distance:
+                            continue
+                        order += 1
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, order, item))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, order, item))
+        return [item for _, _, item in sorted(best, key=lambda e: (-e[0], e[1]))]
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+
+_pet_index = None
+
+
+def get_pet_index():
+    """Return the shared index of visible pets (keys are id(widget), items the widgets)."""
+    global _pet_index
+    if _pet_index is None:
+        _pet_index = SpatialGrid()
+    return _pet_index
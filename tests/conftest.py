@@ -0,0 +1,17 @@
+"""Make the app's import roots available, as main_window.py does when run from src/."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def qapp():
+    """A QCoreApplication for tests of Qt timers; skips when PyQt5 is missing."""
+    QtCore = pytest.importorskip("PyQt5.QtCore")
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
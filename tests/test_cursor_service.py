@@ -0,0 +1,112 @@
+"""CursorService subscriptions on a virtual FrameClock and a fake pointer."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QEvent, QPoint, QSize  # noqa: E402
+
+from src.utils import cursor_service as cursor_module  # noqa: E402
+from src.utils.cursor_service import CursorService  # noqa: E402
+from src.utils.frame_clock import FrameClock  # noqa: E402
+
+
+class _Window:
+    def __init__(self):
+        self.filters = []
+
+    def installEventFilter(self, obj):
+        self.filters.append(obj)
+
+
+class _Widget:
+    def __init__(self, window, x, y, width=100, height=100):
+        self._window = window
+        self.origin = QPoint(x, y)
+        self._size = QSize(width, height)
+        self.destroyed = SimpleNamespace(connect=lambda slot: None)
+
+    def isVisible(self):
+        return True
+
+    def mapToGlobal(self, point):
+        return self.origin + point
+
+    def size(self):
+        return QSize(self._size)
+
+    def window(self):
+        return self._window
+
+
+@pytest.fixture
+def env(qapp, monkeypatch):
+    now = [0]
+    pointer = [QPoint(-1, -1)]
+    monkeypatch.setattr(cursor_module, "QCursor", SimpleNamespace(pos=lambda: QPoint(pointer[0])))
+    clock = FrameClock(now=lambda: now[0])
+    service = CursorService(clock=clock, interval=100)
+
+    def step(t, x=None, y=None):
+        if x is not None:
+            pointer[0] = QPoint(x, y)
+        now[0] = t
+        clock.run_due()
+
+    return SimpleNamespace(service=service, clock=clock, pointer=pointer, step=step)
+
+
+def test_enter_is_sampled_on_subscribe_and_leave_on_tick(env):
+    widget = _Widget(_Window(), 0, 0)
+    events = []
+    env.pointer[0] = QPoint(10, 10)
+    env.service.subscribe(widget, on_enter=lambda: events.append("enter"),
+                          on_leave=lambda: events.append("leave"))
+    assert events == ["enter"]
+
+    env.step(100, 500, 500)
+    env.step(200)
+    assert events == ["enter", "leave"]
+
+
+def test_dwell_fires_once_per_hover(env):
+    widget = _Widget(_Window(), 0, 0)
+    dwells = []
+    env.service.subscribe(widget, on_dwell=lambda: dwells.append(env.clock.now()), dwell_ms=300)
+
+    env.step(100, 10, 10)
+    for t in (200, 300, 400, 500):
+        env.step(t)
+    assert dwells == [400]
+
+    env.step(600, 500, 500)
+    env.step(700, 10, 10)
+    env.step(1000)
+    assert dwells == [400, 1000]
+
+
+def test_last_unsubscribe_stops_sampling(env):
+    widget = _Widget(_Window(), 0, 0)
+    subscription = env.service.subscribe(widget, on_enter=lambda: subscription.stop())
+    assert env.clock.pending() == 1
+
+    env.step(100, 10, 10)
+    assert not subscription.isActive()
+    assert env.clock.pending() == 0
+
+
+def test_window_move_drops_cached_rects(env):
+    window = _Window()
+    widget = _Widget(window, 0, 0)
+    moved = []
+    env.service.window_moved.connect(moved.append)
+
+    assert env.service.widget_rect(widget).topLeft() == QPoint(0, 0)
+    assert window.filters == [env.service]
+    widget.origin = QPoint(300, 200)
+    assert env.service.widget_rect(widget).topLeft() == QPoint(0, 0)
+
+    env.service.eventFilter(window, QEvent(QEvent.Move))
+    assert moved == [window]
+    assert env.service.widget_rect(widget).topLeft() == QPoint(300, 200)
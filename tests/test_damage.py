@@ -0,0 +1,137 @@
+"""WindowDamage coalescing, mask throttling and idle behaviour."""
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QRect  # noqa: E402
+
+from src.ui import damage as damage_module  # noqa: E402
+from src.ui.damage import MASK_INTERVAL, WindowDamage  # noqa: E402
+
+
+class _Task:
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+
+    def isActive(self):
+        return self.deadline is not None
+
+
+class _Clock:
+    """Just enough of FrameClock: call_later() and a run() driven by the test."""
+
+    def __init__(self):
+        self.time = 0
+        self.tasks = []
+
+    def now(self):
+        return self.time
+
+    def call_later(self, delay, callback):
+        task = _Task(self.time + delay, callback)
+        self.tasks.append(task)
+        return task
+
+    def run(self, time=None):
+        if time is not None:
+            self.time = time
+        for task in [t for t in self.tasks if t.isActive() and t.deadline <= self.time]:
+            task.deadline = None
+            task.callback()
+
+
+class _Window:
+    def __init__(self):
+        self.masks = []
+
+    def setMask(self, region):
+        self.masks.append(region)
+
+    def clearMask(self):
+        self.masks.append(None)
+
+
+class _Surface:
+    def __init__(self):
+        self.updates = []
+
+    def x(self):
+        return 0
+
+    def y(self):
+        return 0
+
+    def update(self, region):
+        self.updates.append(region)
+
+
+def _tracker(mask):
+    clock, window = _Clock(), _Window()
+    return WindowDamage(window, clock=clock, mask=mask), clock, window
+
+
+def test_no_mask_and_no_surface_schedules_nothing():
+    damage, clock, window = _tracker(mask=False)
+    for x in range(0, 200, 10):
+        damage.set_bounds("pet", QRect(x, 0, 100, 100))
+    assert clock.tasks == []
+    assert damage.region().boundingRect() == QRect(190, 0, 100, 100)
+
+
+def test_changes_before_a_flush_share_one_set_mask():
+    damage, clock, window = _tracker(mask=True)
+    damage.set_bounds("a", QRect(0, 0, 100, 100))
+    damage.set_bounds("b", QRect(500, 500, 50, 50))
+    assert len(clock.tasks) == 1
+    clock.run()
+    assert len(window.masks) == 1
+    assert window.masks[0].contains(QRect(0, 0, 100, 100))
+    assert window.masks[0].contains(QRect(500, 500, 50, 50))
+
+
+def test_mask_updates_are_throttled():
+    damage, clock, window = _tracker(mask=True)
+    damage.set_bounds("pet", QRect(0, 0, 100, 100))
+    clock.run()
+    damage.set_bounds("pet", QRect(400, 0, 100, 100))
+    clock.run(MASK_INTERVAL // 2)
+    assert len(window.masks) == 1  # too soon after the last setMask
+    clock.run(MASK_INTERVAL)
+    assert len(window.masks) == 2
+    assert window.masks[-1].contains(QRect(400, 0, 100, 100))
+
+
+def test_small_moves_inside_the_mask_keep_it():
+    damage, clock, window = _tracker(mask=True)
+    damage.set_bounds("pet", QRect(0, 0, 100, 100))
+    clock.run()
+    damage.set_bounds("pet", QRect(2, 2, 96, 96))
+    clock.run(MASK_INTERVAL * 2)
+    assert len(window.masks) == 1
+
+
+def test_large_shrink_updates_the_mask(monkeypatch):
+    monkeypatch.setattr(damage_module, "MASK_SHRINK_SLACK", 0)
+    damage, clock, window = _tracker(mask=True)
+    damage.set_bounds("a", QRect(0, 0, 100, 100))
+    damage.set_bounds("b", QRect(500, 0, 100, 100))
+    clock.run()
+    damage.remove("b")
+    clock.run(MASK_INTERVAL)
+    assert len(window.masks) == 2
+    assert not window.masks[-1].contains(QRect(500, 0, 100, 100))
+
+
+def test_surface_damage_is_flushed_as_one_update():
+    damage, clock, window = _tracker(mask=False)
+    damage.surface = _Surface()
+    damage.set_bounds("pet", QRect(0, 0, 50, 50))
+    damage.set_bounds("pet", QRect(10, 0, 50, 50))
+    damage.damage(QRect(300, 300, 10, 10))
+    assert len(clock.tasks) == 1
+    clock.run()
+    (region,) = damage.surface.updates
+    assert region.contains(QRect(0, 0, 60, 50))
+    assert region.contains(QRect(300, 300, 10, 10))
+    assert window.masks == []
@@ -0,0 +1,74 @@
+"""FrameCache budget accounting, eviction and prefetch marking."""
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from src.assets import frame_cache  # noqa: E402
+from src.assets.frame_cache import FrameCache  # noqa: E402
+
+
+class _Frames:
+    """Stands in for AnimationFrames: a cost that grows once it is painted."""
+
+    mapped = False
+
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+        self.pixmap_nbytes = 0
+        self.on_pixmaps = None
+
+    def cost(self):
+        return self.nbytes + self.pixmap_nbytes
+
+    def paint(self):
+        self.pixmap_nbytes = self.nbytes
+        if self.on_pixmaps is not None:
+            self.on_pixmaps(self)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    sizes = {"a": 40, "b": 40, "c": 40, "big": 500}
+    monkeypatch.setattr(frame_cache, "decode_animation",
+                        lambda path, size=None, lod=0, palette=True: _Frames(sizes[path]))
+    return FrameCache(max_bytes=100)
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    a = cache.get("a")
+    cache.get("b")
+    assert cache.get("a") is a  # hit, now most recent
+    cache.get("c")
+    assert cache.contains("a") and cache.contains("c")
+    assert not cache.contains("b")
+    assert cache.stats()["bytes"] == 80
+
+
+def test_newest_entry_is_kept_over_budget(cache):
+    cache.get("a")
+    cache.get("big")
+    assert cache.contains("big") and not cache.contains("a")
+    assert cache.stats()["bytes"] == 500
+
+
+def test_painted_pixmaps_count_against_the_budget(cache):
+    a = cache.get("a")
+    b = cache.get("b")
+    a.paint()
+    # a grew to 80 bytes, so the older b had to go
+    assert cache.stats()["bytes"] == 80
+    assert not cache.contains("b")
+    b.paint()  # no longer cached: nothing to re-count
+    assert cache.stats()["bytes"] == 80
+
+
+def test_prefetched_entries_are_trimmed_until_claimed(cache):
+    cache.get("a", prefetch=True)
+    cache.get("b", prefetch=True)
+    assert cache.prefetched_bytes() == 80
+    cache.claim("a")
+    assert cache.prefetched_bytes() == 40
+    cache.trim_prefetched(0)
+    assert cache.contains("a") and not cache.contains("b")
+    assert cache.prefetched_bytes() == 0
+    assert cache.stats()["bytes"] == 40
@@ -0,0 +1,75 @@
+"""FrameClock ordering on a virtual clock."""
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from src.utils.frame_clock import FrameClock  # noqa: E402
+
+
+def _clock(start=0):
+    now = [start]
+    return FrameClock(now=lambda: now[0]), now
+
+
+def test_tasks_run_in_deadline_order(qapp):
+    clock, now = _clock()
+    fired = []
+    clock.call_later(30, lambda: fired.append("late"))
+    clock.call_later(10, lambda: fired.append("early"))
+    clock.call_later(10, lambda: fired.append("early, second"))
+    now[0] = 5
+    clock.run_due()
+    assert fired == []
+    now[0] = 30
+    clock.run_due()
+    assert fired == ["early", "early, second", "late"]
+    assert clock.pending() == 0
+
+
+def test_repeating_tasks_share_aligned_wakeups(qapp):
+    clock, now = _clock(5)
+    fired = []
+    clock.every(20, lambda: fired.append(("a", now[0])))
+    now[0] = 13
+    clock.every(20, lambda: fired.append(("b", now[0])))
+    for now[0] in (20, 39, 40):
+        clock.run_due()
+    assert fired == [("a", 20), ("b", 20), ("a", 40), ("b", 40)]
+    assert clock.pending() == 2
+
+
+def test_stopped_and_restarted_tasks_skip_stale_deadlines(qapp):
+    clock, now = _clock()
+    fired = []
+    stopped = clock.call_later(10, lambda: fired.append("stopped"))
+    moved = clock.call_later(10, lambda: fired.append("moved"))
+    stopped.stop()
+    moved.start(50)
+    now[0] = 10
+    clock.run_due()
+    assert fired == []
+    assert not stopped.isActive() and moved.isActive()
+    now[0] = 50
+    clock.run_due()
+    assert fired == ["moved"]
+
+
+def test_callback_can_stop_a_task_due_in_the_same_wakeup(qapp):
+    clock, now = _clock()
+    fired = []
+    tasks = []
+    tasks.append(clock.call_later(10, lambda: tasks[1].stop()))
+    tasks.append(clock.call_later(10, lambda: fired.append("second")))
+    now[0] = 10
+    clock.run_due()
+    assert fired == []
+
+
+def test_raising_callback_does_not_stop_the_others(qapp):
+    clock, now = _clock()
+    fired = []
+    clock.call_later(10, lambda: 1 / 0)
+    clock.call_later(10, lambda: fired.append("ok"))
+    now[0] = 10
+    clock.run_due()
+    assert fired == ["ok"]
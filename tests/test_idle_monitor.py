@@ -0,0 +1,66 @@
+"""The idle monitor filters app input only when it needs to."""
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from src.utils import idle_monitor  # noqa: E402
+from src.utils.idle_monitor import IdleMonitor  # noqa: E402
+
+
+class _Task:
+    def __init__(self):
+        self.delay = None
+
+    def start(self, delay=None):
+        self.delay = delay
+
+    def stop(self):
+        self.delay = None
+
+
+class _Clock:
+    def now(self):
+        return 0
+
+    def timer(self, callback, interval=0, single_shot=False):
+        return _Task()
+
+
+@pytest.fixture
+def monitor(qapp, monkeypatch):
+    installed = []
+    monkeypatch.setattr(type(qapp), "installEventFilter", lambda app, obj: installed.append(obj))
+    monkeypatch.setattr(type(qapp), "removeEventFilter", lambda app, obj: installed.remove(obj))
+    monitor = IdleMonitor(clock=_Clock())
+    monitor.installed = installed
+    monitor.timeout = 60
+    return monitor
+
+
+def test_system_idle_source_filters_only_while_idle(monitor, monkeypatch):
+    idle_for = [0]
+    monkeypatch.setattr(idle_monitor, "_system_idle_seconds", lambda: idle_for[0])
+
+    monitor.set_enabled(True)
+    assert monitor.installed == []
+
+    idle_for[0] = 120
+    monitor._check()
+    assert monitor.idle
+    assert monitor.installed == [monitor]
+
+    idle_for[0] = 0
+    monitor._check()
+    assert not monitor.idle
+    assert monitor.installed == []
+
+
+def test_cursor_fallback_keeps_the_filter(monitor, monkeypatch):
+    monkeypatch.setattr(idle_monitor, "_system_idle_seconds", lambda: None)
+    monkeypatch.setattr(monitor, "_cursor_idle_seconds", lambda: 0)
+
+    monitor.set_enabled(True)
+    assert monitor.installed == [monitor]
+
+    monitor.set_enabled(False)
+    assert monitor.installed == []
@@ -0,0 +1,59 @@
+"""LifecycleScope and LifecycleRegistry live counts."""
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from src.utils.frame_clock import FrameClock  # noqa: E402
+from src.utils.lifecycle import KINDS, LifecycleRegistry, LifecycleScope  # noqa: E402
+
+IDLE = dict.fromkeys(KINDS, 0)
+
+
+class _Owner:
+    pass
+
+
+def test_scope_counts_only_running_objects(qapp):
+    scope = LifecycleScope("Mochi")
+    repeating = scope.timer(lambda: None)
+    repeating.start(1000)
+    scope.timer(lambda: None)  # created but never started
+    scope.single_shot(1000, lambda: None)
+    assert scope.counts() == dict(IDLE, timers=2)
+
+    scope.close()
+    assert scope.counts() == IDLE
+    assert not repeating.isActive()
+
+
+def test_scope_stops_clock_tasks(qapp):
+    clock = FrameClock(now=lambda: 0)
+    scope = LifecycleScope("Mochi")
+    task = scope.add(clock.every(100, lambda: None))
+    scope.add(task)  # added twice, tracked once
+    assert scope.counts() == dict(IDLE, timers=1)
+
+    scope.discard(task)
+    assert scope.counts() == IDLE
+    scope.add(task, "subscriptions")
+    scope.close()
+    assert not task.isActive()
+    assert clock.pending() == 0
+
+
+def test_registry_begin_closes_the_previous_scope(qapp):
+    registry = LifecycleRegistry()
+    owner = _Owner()
+    walking = registry.begin(owner, "walking", label="Mochi")
+    timer = walking.timer(lambda: None)
+    timer.start(1000)
+    assert registry.total_counts() == dict(IDLE, timers=1)
+
+    sitting = registry.begin(owner, "sitting")
+    assert not timer.isActive()
+    assert sitting.label == "Mochi"
+    assert registry.scope(owner) is sitting
+    assert registry.live_counts() == {"Mochi": IDLE}
+
+    registry.end(owner)
+    assert registry.live_counts() == {}
@@ -0,0 +1,93 @@
+"""MotionEngine stepping on a virtual FrameClock."""
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QPoint  # noqa: E402
+
+from src.utils.frame_clock import FrameClock  # noqa: E402
+from src.utils.motion_engine import MotionEngine, MotionHandle  # noqa: E402
+
+
+class _Widget:
+    def __init__(self, x=0, y=0):
+        self._pos = QPoint(x, y)
+        self.moves = []
+
+    def pos(self):
+        return QPoint(self._pos)
+
+    def move(self, x, y):
+        self._pos = QPoint(x, y)
+        self.moves.append((x, y))
+
+
+def _engine():
+    now = [0]
+    clock = FrameClock(now=lambda: now[0])
+    return MotionEngine(clock=clock), clock, now
+
+
+def _step(clock, now, t):
+    now[0] = t
+    clock.run_due()
+
+
+def test_moves_interpolate_and_finish_once(qapp):
+    engine, clock, now = _engine()
+    widget = _Widget()
+    finished = []
+    handle = engine.move(widget, 100, 50, 1000, lambda: finished.append(True))
+    assert handle.state() == MotionHandle.Running
+
+    _step(clock, now, 500)
+    assert widget.moves == [(50, 25)]
+    _step(clock, now, 1000)
+    _step(clock, now, 1100)
+    assert widget.moves == [(50, 25), (100, 50)]
+    assert finished == [True]
+    assert handle.state() == MotionHandle.Stopped
+    assert len(engine) == 0
+    assert clock.pending() == 0
+
+
+def test_unchanged_positions_are_not_moved(qapp):
+    engine, clock, now = _engine()
+    still = _Widget(10, 10)
+    walking = _Widget()
+    engine.move(still, 10, 10, 1000)
+    engine.move(walking, 1000, 0, 1000)
+
+    for t in (100, 200, 300):
+        _step(clock, now, t)
+    assert still.moves == []
+    assert walking.moves == [(100, 0), (200, 0), (300, 0)]
+
+
+def test_new_move_replaces_the_running_one(qapp):
+    engine, clock, now = _engine()
+    widget = _Widget()
+    finished = []
+    first = engine.move(widget, 100, 0, 1000, lambda: finished.append("first"))
+    _step(clock, now, 500)
+    second = engine.move(widget, 50, 100, 500, lambda: finished.append("second"))
+
+    assert first.state() == MotionHandle.Stopped
+    assert len(engine) == 1
+    _step(clock, now, 1000)
+    assert widget.pos() == QPoint(50, 100)
+    assert finished == ["second"]
+    assert second.state() == MotionHandle.Stopped
+
+
+def test_capacity_grows_past_the_initial_slots(qapp):
+    engine, clock, now = _engine()
+    widgets = [_Widget() for _ in range(20)]
+    for i, widget in enumerate(widgets):
+        engine.move(widget, i, i, 100)
+    assert len(engine) == 20
+
+    _step(clock, now, 100)
+    assert [widget.pos() for widget in widgets] == [QPoint(i, i) for i in range(20)]
+    assert len(engine) == 0
@@ -0,0 +1,86 @@
+"""PetAssetRegistry reloads its files only when they change, on its check schedule."""
+import json
+import os
+
+from src.pet_data_loader import PetAssetRegistry
+
+
+def _write(path, data, mtime):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def _manifest(action_path):
+    return {"Cat": {"Black": {"lock_flag": False, "walk_left": action_path}}}
+
+
+def _registry(tmp_path, check_interval=0):
+    _write(tmp_path / "pets_info.json", _manifest("gifs/walk.gif"), 1000)
+    _write(tmp_path / "current_pet.json",
+           {"Current_Pet_Kind": "Cat", "Current_Pet_Color": "Black"}, 1000)
+    return PetAssetRegistry(
+        manifest_path=str(tmp_path / "pets_info.json"),
+        current_pet_path=str(tmp_path / "current_pet.json"),
+        atlas_manifest_path=str(tmp_path / "pets_atlas.json"),
+        check_interval=check_interval)
+
+
+def test_changed_manifest_is_reloaded(tmp_path):
+    registry = _registry(tmp_path)
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk.gif"
+    assert registry.current_pet() == ("Cat", "Black")
+
+    _write(tmp_path / "pets_info.json", _manifest("gifs/walk2.gif"), 2000)
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk2.gif"
+    assert registry.kinds_and_colors() == {"Cat": {"Black": False}}
+
+
+def test_checks_are_throttled_until_invalidated(tmp_path):
+    registry = _registry(tmp_path, check_interval=3600)
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk.gif"
+
+    _write(tmp_path / "pets_info.json", _manifest("gifs/walk2.gif"), 2000)
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk.gif"
+
+    registry.invalidate()
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk2.gif"
+
+
+def test_broken_manifest_reports_once_and_recovers(tmp_path, capsys):
+    registry = _registry(tmp_path)
+    (tmp_path / "pets_info.json").write_text("{", encoding="utf-8")
+    os.utime(tmp_path / "pets_info.json", (2000, 2000))
+
+    assert registry.kinds_and_colors() == {}
+    assert registry.kinds_and_colors() == {}
+    assert capsys.readouterr().out.count("Error decoding JSON") == 1
+
+    _write(tmp_path / "pets_info.json", _manifest("gifs/walk.gif"), 3000)
+    assert registry.resolve("Cat", "Black", "walk_left") == "src/gifs/walk.gif"
+
+
+def test_update_pet_is_kept_without_rereading(tmp_path):
+    registry = _registry(tmp_path, check_interval=3600)
+    registry.update_pet("Cat", "White")
+    assert registry.current_pet() == ("Cat", "White")
+    assert json.loads((tmp_path / "current_pet.json").read_text())["Current_Pet_Color"] == "White"
+
+
+def test_compiled_animation_is_checked_on_the_refresh_schedule(tmp_path):
+    gif = tmp_path / "walk.gif"
+    gif.write_bytes(b"GIF89a")
+    os.utime(gif, (1000, 1000))
+    _write(tmp_path / "pets_atlas.json", {"animations": {
+        "walk.gif": {"atlas": "walk.atlas", "source_mtime": 1000},
+    }}, 1000)
+    registry = _registry(tmp_path, check_interval=3600)
+
+    entry = registry.compiled_animation(str(gif))
+    assert entry["atlas_path"] == os.path.join(str(tmp_path), "walk.atlas")
+
+    # A GIF edited after compiling is noticed at the next check, not on every lookup.
+    os.utime(gif, (2000, 2000))
+    assert registry.compiled_animation(str(gif)) is entry
+    registry.invalidate()
+    assert registry.compiled_animation(str(gif)) is None
+    assert registry.compiled_animation(str(tmp_path / "other.gif")) is None
@@ -0,0 +1,53 @@
+"""Point, rect and k-nearest queries on the pet spatial index."""
+from src.utils.spatial_index import SpatialGrid
+
+
+def _grid():
+    grid = SpatialGrid(cell_size=100)
+    grid.update("a", (0, 0, 50, 50))
+    grid.update("b", (300, 0, 50, 50))
+    grid.update("c", (90, 90, 40, 40), item="pet-c")  # straddles four cells
+    return grid
+
+
+def test_query_point():
+    grid = _grid()
+    assert grid.query_point(10, 10) == ["a"]
+    assert grid.query_point(110, 110) == ["pet-c"]
+    assert grid.query_point(50, 50) == []  # right/bottom edges are exclusive
+
+
+def test_query_rect():
+    grid = _grid()
+    assert sorted(grid.query_rect((40, 40, 60, 60))) == ["a", "pet-c"]
+    assert grid.query_rect((200, 200, 10, 10)) == []
+
+
+def test_update_moves_and_remove_forgets():
+    grid = _grid()
+    grid.update("a", (500, 500, 10, 10))
+    assert grid.query_point(10, 10) == []
+    assert grid.query_point(505, 505) == ["a"]
+    grid.remove("a")
+    assert "a" not in grid
+    assert len(grid) == 2
+    assert grid.query_point(505, 505) == []
+
+
+def test_nearest_orders_by_edge_distance():
+    grid = _grid()
+    assert grid.nearest(0, 0, k=3) == ["a", "pet-c", "b"]
+    assert grid.nearest(400, 0, k=1) == ["b"]
+
+
+def test_nearest_exclude_and_max_distance():
+    grid = _grid()
+    assert grid.nearest(25, 25, k=1, exclude="a") == ["pet-c"]
+    assert grid.nearest(25, 25, k=3, max_distance=100) == ["a", "pet-c"]
+    assert SpatialGrid().nearest(0, 0) == []
+
+
+def test_nearest_searches_beyond_empty_rings():
+    grid = SpatialGrid(cell_size=10)
+    grid.update("far", (1000, 1000, 5, 5))
+    assert grid.nearest(0, 0) == ["far"]
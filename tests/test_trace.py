@@ -0,0 +1,218 @@
+"""Seeded behavior traces record and replay identically.
+
+Sessions are recorded through the real BehaviorManager, PetBehavior and
+actions. Timers, the frame clock, the cursor service and the motion engine
+are replaced by one queue that runs callbacks in order, so the pets step
+through their states headless and as fast as the queue drains.
+"""
+import copy
+import importlib
+import json
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QPoint  # noqa: E402
+
+from behavior import trace  # noqa: E402
+from behavior import manager as manager_module  # noqa: E402
+from behavior.adapter import LegacyBehaviorAdapter  # noqa: E402
+from behavior.config import DEFAULT_CONFIG  # noqa: E402
+from behavior.pet_actions import PetBehavior  # noqa: E402
+from behavior.transitions import get_transition_table, set_transition_table, state_name  # noqa: E402
+from src.utils.lifecycle import LifecycleScope  # noqa: E402
+
+SCREEN = (1200, 700)
+PETS = ("Mochi", "Tofu")
+
+
+class _Task:
+    """A single-shot timer that fires from the loop's queue unless stopped."""
+
+    def __init__(self, loop, callback):
+        self._loop = loop
+        self.callback = callback
+        self.active = False
+
+    def start(self, msec=None):
+        self.active = True
+        self._loop.queue.append(self)
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+
+class _Loop:
+    def __init__(self):
+        self.queue = deque()
+
+    def call(self, callback):
+        task = _Task(self, callback)
+        task.start()
+        return task
+
+    def run(self, steps):
+        while self.queue and steps > 0:
+            task = self.queue.popleft()
+            if task.active:
+                task.active = False
+                task.callback()
+                steps -= 1
+
+
+class _Label:
+    def __init__(self):
+        self._pos = QPoint(0, 0)
+        self._size = (120, 80)
+
+    def width(self):
+        return self._size[0]
+
+    def height(self):
+        return self._size[1]
+
+    def pos(self):
+        return QPoint(self._pos)
+
+    def move(self, x, y):
+        self._pos = QPoint(x, y)
+
+    def resize_for_window(self, width, height, ratio):
+        side = max(40, int(min(width, height) * ratio))
+        self._size = (side, side * 2 // 3)
+
+    def set_movie(self, path, loop=True, state=None):
+        return None
+
+    def clear(self):
+        pass
+
+    def isVisible(self):
+        return True
+
+
+class _Parent:
+    pet_size_ratio = 0.12
+    # pet_code then only waits instead of opening the chat dialog
+    is_chat_dialog_open = True
+
+    def width(self):
+        return SCREEN[0]
+
+    def height(self):
+        return SCREEN[1]
+
+
+def _config(seed, path):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["state_durations"] = {"sleeping": [20000, 40000], "sitting": [3000, 6000]}
+    config["behavior_seed"] = seed
+    config["behavior_trace_path"] = path
+    return config
+
+
+@pytest.fixture
+def session(qapp, monkeypatch):
+    """Return record(path, seed, steps) -> {pet: [states performed]}."""
+    table = get_transition_table()
+    monkeypatch.delenv("VCAT_BEHAVIOR_TRACE", raising=False)
+    loop = _Loop()
+    clock = SimpleNamespace(timer=lambda callback, interval=0, single_shot=False: _Task(loop, callback))
+    cursor = SimpleNamespace(subscribe=lambda *args, **kwargs: _Task(loop, None))
+
+    def move(label, x, y, duration, callback):
+        label.move(x, y)
+        return loop.call(callback)
+
+    monkeypatch.setattr(manager_module, "QTimer", SimpleNamespace(singleShot=lambda msec, callback: loop.call(callback)))
+    monkeypatch.setattr(manager_module.BehaviorManager, "prefetch_next", lambda self, behavior: None)
+    monkeypatch.setattr(LifecycleScope, "single_shot",
+                        lambda scope, msec, callback, parent=None: scope.add(loop.call(callback)))
+    for name in ("pet_sit", "pet_play"):
+        module = importlib.import_module(f"behavior.actions.{name}")
+        monkeypatch.setattr(module, "get_frame_clock", lambda: clock)
+        monkeypatch.setattr(module, "get_cursor_service", lambda: cursor)
+    walk = importlib.import_module("behavior.actions.pet_random_walk")
+    monkeypatch.setattr(walk, "get_motion_engine", lambda: SimpleNamespace(move=move))
+
+    performed = {}
+    perform_action = PetBehavior.perform_action
+
+    def record_action(self, parent, callback, ID=None):
+        performed.setdefault(self.pet_name, []).append(state_name(self.current_state))
+        return perform_action(self, parent, callback, ID)
+
+    monkeypatch.setattr(PetBehavior, "perform_action", record_action)
+
+    def record(path, seed, steps=300):
+        performed.clear()
+        loop.queue.clear()
+        config = _config(seed, path)
+        monkeypatch.setattr(manager_module, "load_behavior_config", lambda: config)
+        parent = _Parent()
+        manager = manager_module.BehaviorManager(parent)
+        try:
+            for pet in PETS:
+                behavior = LegacyBehaviorAdapter(_Label(), "DEV_CAT", "Black", lambda path: path)
+                manager.register_pet(pet, behavior, behavior.pet_label)
+            loop.run(steps)
+        finally:
+            trace.stop_trace()
+        return {pet: list(states) for pet, states in performed.items()}
+
+    yield record
+    set_transition_table(table)
+
+
+def test_replay_reproduces_the_recorded_session(session, tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    performed = session(path, seed=1234)
+
+    replayer = trace.TraceReplayer(path)
+    assert replayer.seed == 1234
+    assert replayer.pets() == sorted(PETS)
+    assert replayer.states() == performed
+    assert all(len(set(states)) > 2 for states in performed.values())
+    assert replayer.verify() == []
+    assert set(replayer.time_in_state()) == set(PETS)
+
+
+def test_same_seed_replays_the_same_states(session, tmp_path):
+    first = session(str(tmp_path / "first.jsonl"), seed=99)
+    second = session(str(tmp_path / "second.jsonl"), seed=99)
+    other = session(str(tmp_path / "other.jsonl"), seed=100)
+
+    assert first == second
+    assert first != other
+
+
+def test_tampered_trace_reports_mismatch(session, tmp_path):
+    path = tmp_path / "tampered.jsonl"
+    session(str(path), seed=7)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    for i, line in enumerate(lines[1:], start=1):
+        event = json.loads(line)
+        if event[2] == "w":
+            event[3] += 1
+            lines[i] = json.dumps(event)
+            break
+    else:
+        pytest.fail("the session never walked")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    mismatches = trace.TraceReplayer(str(path)).verify()
+    assert len(mismatches) == 1
+    assert mismatches[0]["kind"] == "w"
+
+
+def test_pet_seed_is_stable_per_name():
+    assert trace.pet_seed(42, "Mochi") == trace.pet_seed(42, "Mochi")
+    assert trace.pet_seed(42, "Mochi") != trace.pet_seed(42, "Tofu")
+    assert trace.pet_seed(42, "Mochi") != trace.pet_seed(43, "Mochi")
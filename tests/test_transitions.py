@@ -0,0 +1,108 @@
+"""Config validation and the compiled transition tables."""
+import copy
+import random
+
+import pytest
+
+from behavior.config import DEFAULT_CONFIG, validate_config
+from behavior.transitions import (TransitionTable, compile_transitions, default_transitions,
+                                  get_transition_table, set_transition_table)
+
+
+def _config(**sections):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config.update(sections)
+    return config
+
+
+def test_default_config_is_valid():
+    assert validate_config(copy.deepcopy(DEFAULT_CONFIG)) == (True, "")
+
+
+@pytest.mark.parametrize("duration", [500, 0, [100, 200], [300, 300]])
+def test_valid_durations(duration):
+    ok, message = validate_config(_config(state_durations={"sitting": duration}))
+    assert ok, message
+
+
+@pytest.mark.parametrize("duration", [[500], [], [1, 2, 3], [200, 100], [-1, 5], -10, "500", True, [True, 5]])
+def test_invalid_durations(duration):
+    ok, message = validate_config(_config(state_durations={"sitting": duration}))
+    assert not ok
+    assert "sitting" in message
+
+
+def test_negative_transition_weight_is_rejected():
+    ok, _ = validate_config(_config(transitions={"walking": {"sitting": -0.5}}))
+    assert not ok
+
+
+def test_table_tolerates_single_value_durations():
+    table = TransitionTable({}, {"sitting": [500], "walking": 250, "empty": []})
+    assert table.duration_bounds("sitting") == (500.0, 500.0)
+    assert table.duration("sitting") == 500
+    assert table.duration("walking") == 250
+    assert table.duration("empty") == 0
+    assert table.duration("sleeping", default=42) == 42
+
+
+def test_ranged_duration_stays_in_bounds():
+    table = TransitionTable({}, {"sleeping": [1000, 2000]})
+    rng = random.Random(3)
+    assert all(1000 <= table.duration("sleeping", rng=rng) <= 2000 for _ in range(200))
+
+
+def test_sitting_row_is_sequential():
+    # Like the original if/elif: coding first, sleeping gets what is left.
+    rows = default_transitions(
+        {"walking_to_sitting": 0.5, "sitting_to_coding": 0.7, "sitting_to_sleeping": 0.6})
+    assert rows["sitting"]["coding"] == pytest.approx(0.7)
+    assert rows["sitting"]["sleeping"] == pytest.approx(0.3)
+    assert rows["sitting"]["walking"] == 0.0
+
+
+def test_compiled_probabilities_match_config():
+    table = compile_transitions(_config())
+    probabilities = table.probabilities("sitting")
+    assert probabilities["coding"] == pytest.approx(0.01)
+    assert probabilities["sleeping"] == pytest.approx(0.3)
+    assert probabilities["walking"] == pytest.approx(0.69)
+    assert table.sample("reachedportal") is None
+
+
+def test_custom_rows_override_defaults():
+    table = compile_transitions(_config(
+        transitions={"walking": {"napping": 1}, "napping": {"sitting": 1}},
+        state_actions={"napping": "pet_sleep"}))
+    assert table.sample("walking", random.Random(0)) == "napping"
+    assert table.action("napping") == "pet_sleep"
+    assert "napping" in table.states()
+
+
+def test_alias_sampling_follows_weights():
+    table = TransitionTable({"a": {"x": 1, "y": 3}})
+    rng = random.Random(11)
+    draws = [table.sample("a", rng) for _ in range(20000)]
+    assert draws.count("y") / len(draws) == pytest.approx(0.75, abs=0.02)
+
+
+def test_compiling_does_not_switch_the_active_table():
+    active = get_transition_table()
+    table = compile_transitions(_config(transitions={"walking": {"napping": 1}}))
+    assert get_transition_table() is active
+    set_transition_table(table)
+    try:
+        assert get_transition_table() is table
+    finally:
+        set_transition_table(active)
+
+
+def test_shipped_example_rows_match_the_defaults():
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    example = compile_transitions(config)
+    config.update(transitions={}, state_durations={}, state_actions={})
+    plain = compile_transitions(config)
+    for state in plain.states():
+        assert example.probabilities(state) == plain.probabilities(state)
+        assert example.action(state) == plain.action(state)
+    assert example.duration("startdefault") == 500